@@ -0,0 +1,143 @@
+# BatchDFAEngine.py
+# Pertenencia en lote para gramáticas regulares (Tipo 3): el AFD mínimo de RegularAutomaton se
+# convierte en una tabla sobre bytes UTF-8 y todas las cadenas de un corpus avanzan a la vez,
+# un símbolo por paso, con indexación de NumPy (un paso = una operación sobre todo el lote).
+# El corpus se lee con mmap desde un archivo con una cadena por línea, sin decodificarlo.
+# Cada carácter es un token (como list(cadena) en validate_string): los terminales de más de
+# un carácter no pueden aparecer en una cadena tokenizada así y no se incluyen en la tabla.
+
+import mmap
+
+import numpy as np
+
+BLOCK_BYTES = 64 * 1024 * 1024 # Bytes del corpus procesados por bloque (memoria acotada)
+SCALAR_TAIL = 32               # Con tan pocas cadenas activas se termina cada una en Python
+
+
+class BatchDFARunner:
+    """ Tabla de transiciones por byte de un RegularAutomaton y ejecución vectorizada """
+
+    def __init__(self, automaton):
+        n_states = automaton.state_count
+        self.dead = n_states # Sumidero explícito: las transiciones inexistentes van aquí
+        rows = [[self.dead] * 256 for _ in range(n_states + 1)]
+
+        # Los caracteres de varios bytes pasan por estados intermedios (UTF-8 no tiene prefijos
+        # comunes entre caracteres completos, así que el resultado sigue siendo determinista)
+        for sym, col in automaton.symbols.items():
+            if len(sym) != 1:
+                continue
+            encoded = sym.encode('utf-8')
+            for q, row in enumerate(automaton.transitions):
+                target = row[col]
+                if target == -1:
+                    continue
+                node = q
+                for byte in encoded[:-1]:
+                    if rows[node][byte] == self.dead:
+                        rows[node][byte] = len(rows)
+                        rows.append([self.dead] * 256)
+                    node = rows[node][byte]
+                rows[node][encoded[-1]] = target
+
+        self.table = np.array(rows, dtype=np.int32)
+        # Tabla plana con destinos premultiplicados por 256: el estado se guarda como el desplazamiento
+        # de su fila y cada paso es un solo índice 1D (offset + byte)
+        self._flat = (self.table * 256).ravel()
+        self.accepting = np.zeros(len(rows), dtype=bool)
+        self.accepting[:n_states] = automaton.accepting
+        self.start = automaton.start
+        self._rows = None # Tabla como listas para terminar las cadenas largas (se crea al usarla)
+
+    def run_file(self, path, suffix=""):
+        """ Pertenencia de cada línea de path (una cadena por línea, como cli.read_lines).
+            suffix se añade al final de cada cadena (ej. EPSILON, como GrammarApp).
+            Devuelve un arreglo bool con una posición por línea.
+        """
+        with open(path, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                return np.zeros(0, dtype=bool)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = np.frombuffer(mm, dtype=np.uint8)
+                try:
+                    return self._run_blocks(mm, data, suffix.encode('utf-8'))
+                finally:
+                    del data # El mmap no se puede cerrar con vistas abiertas
+
+    def run_bytes(self, data, suffix=""):
+        """ Como run_file sobre un buffer en memoria (bytes con una cadena por línea) """
+        data = np.frombuffer(data, dtype=np.uint8)
+        if not len(data):
+            return np.zeros(0, dtype=bool)
+        return self._run_block(data, suffix.encode('utf-8'))
+
+    def _run_blocks(self, mm, data, suffix):
+        size = len(data)
+        results = []
+        pos = 0
+        while pos < size:
+            end = min(pos + BLOCK_BYTES, size)
+            if end < size: # Cortar en el último salto de línea del bloque
+                cut = mm.rfind(b'\n', pos, end)
+                if cut == -1: # Una sola línea más larga que el bloque
+                    cut = mm.find(b'\n', end)
+                end = size if cut == -1 else cut + 1
+            results.append(self._run_block(data[pos:end], suffix))
+            pos = end
+        return np.concatenate(results)
+
+    def _run_block(self, chunk, suffix):
+        """ Recorre todas las líneas de chunk. Los saltos de línea son '\\n', '\\r\\n' o '\\r'
+            (como al leer un archivo de texto en Python) y no forman parte de la cadena.
+        """
+        is_nl = chunk == 10
+        is_cr = chunk == 13
+        cr_before_nl = np.zeros(len(chunk), dtype=bool) # '\r' de un '\r\n'
+        cr_before_nl[:-1] = is_cr[:-1] & is_nl[1:]
+        breaks = np.flatnonzero(is_nl | (is_cr & ~cr_before_nl)) # Último byte de cada salto
+        ends = breaks - cr_before_nl[np.maximum(breaks - 1, 0)] * (breaks > 0) # '\r\n' ocupa dos bytes
+        starts = np.concatenate(([0], breaks + 1))
+        if len(breaks) and breaks[-1] == len(chunk) - 1:
+            starts = starts[:-1]
+        else:
+            ends = np.concatenate((ends, [len(chunk)]))
+        lengths = ends - starts
+
+        # Ordenar por longitud decreciente: en el paso t las cadenas activas son un prefijo
+        # (con claves de 16 bits NumPy ordena por radix, en tiempo lineal)
+        max_length = int(lengths.max())
+        key = max_length - lengths
+        order = np.argsort(key.astype(np.uint16) if max_length < 1 << 16 else key, kind='stable')
+        starts = starts[order]
+        lengths = lengths[order]
+        key = key[order]
+        flat = self._flat
+        states = np.full(len(starts), self.start * 256, dtype=np.int32)
+        positions = starts.copy() # Byte que lee cada cadena activa en el paso actual
+        for t in range(max_length):
+            active = int(np.searchsorted(key, max_length - t, side='left')) # Cadenas con longitud > t
+            if active <= SCALAR_TAIL:
+                self._finish_scalar(chunk, positions, starts + lengths, states, active)
+                break
+            states[:active] = flat[states[:active] + chunk[positions[:active]]]
+            positions[:active] += 1
+        for byte in suffix:
+            states = flat[states + byte]
+
+        accepted = np.empty(len(starts), dtype=bool)
+        accepted[order] = self.accepting[states >> 8]
+        return accepted
+
+    def _finish_scalar(self, chunk, positions, ends, states, active):
+        """ Termina en Python las pocas cadenas largas que quedan (evita un paso NumPy por byte) """
+        if self._rows is None:
+            self._rows = self.table.tolist()
+        rows = self._rows
+        dead = self.dead
+        for i in range(active):
+            state = int(states[i]) >> 8
+            for byte in chunk[positions[i]:ends[i]].tobytes():
+                state = rows[state][byte]
+                if state == dead:
+                    break
+            states[i] = state * 256
@@ -0,0 +1,148 @@
+# CYKEngine.py
+# Conversión a Forma Normal de Chomsky y reconocedor CYK vectorizado con NumPy.
+# Cada celda del chart es una máscara booleana sobre los no terminales.
+
+from collections import defaultdict
+
+import numpy as np
+
+from GrammarAnalysis import nullable_symbols
+
+
+def to_cnf(start_symbol, productions):
+    """ Convierte una gramática a Forma Normal de Chomsky.
+
+        Las producciones son pares (lhs, rhs) con la convención de NLTK (terminales = str).
+        Los no terminales nuevos son tuplas ('START'|'TERM'|'BIN', ...) para no chocar
+        con los del usuario. Devuelve (nuevo_inicial, producciones, acepta_vacia), donde
+        cada producción es A -> a o A -> B C.
+    """
+    new_start = ('START', start_symbol)
+    prods = [(new_start, (start_symbol,))]
+    prods.extend((lhs, tuple(rhs)) for lhs, rhs in productions)
+
+    # TERM: terminales dentro de lados derechos largos pasan a no terminales propios
+    term_rules = {}
+    replaced = []
+    for lhs, rhs in prods:
+        if len(rhs) >= 2:
+            new_rhs = []
+            for sym in rhs:
+                if isinstance(sym, str):
+                    if sym not in term_rules:
+                        term_rules[sym] = ('TERM', sym)
+                    sym = term_rules[sym]
+                new_rhs.append(sym)
+            rhs = tuple(new_rhs)
+        replaced.append((lhs, rhs))
+    replaced.extend((nt, (sym,)) for sym, nt in term_rules.items())
+
+    # BIN: lados derechos de longitud > 2 se parten en cadenas binarias
+    binary = []
+    for idx, (lhs, rhs) in enumerate(replaced):
+        current = lhs
+        k = 0
+        while len(rhs) > 2:
+            helper = ('BIN', idx, k)
+            binary.append((current, (rhs[0], helper)))
+            current, rhs, k = helper, rhs[1:], k + 1
+        binary.append((current, rhs))
+
+    # DEL: eliminar producciones vacías (solo el inicial puede derivar ε)
+    nullable = nullable_symbols(binary)
+    no_eps = set()
+    for lhs, rhs in binary:
+        if len(rhs) == 2:
+            no_eps.add((lhs, rhs))
+            if rhs[0] in nullable:
+                no_eps.add((lhs, (rhs[1],)))
+            if rhs[1] in nullable:
+                no_eps.add((lhs, (rhs[0],)))
+        elif len(rhs) == 1:
+            no_eps.add((lhs, rhs))
+
+    # UNIT: sustituir A -> B por las producciones no unitarias de B
+    units = defaultdict(set)
+    by_lhs = defaultdict(list)
+    for lhs, rhs in no_eps:
+        if len(rhs) == 1 and not isinstance(rhs[0], str):
+            units[lhs].add(rhs[0])
+        else:
+            by_lhs[lhs].append(rhs)
+
+    cnf = set()
+    for lhs in set(units) | set(by_lhs):
+        reachable = {lhs}
+        pending = [lhs]
+        while pending:
+            for target in units.get(pending.pop(), ()):
+                if target not in reachable:
+                    reachable.add(target)
+                    pending.append(target)
+        for target in reachable:
+            for rhs in by_lhs.get(target, ()):
+                cnf.add((lhs, rhs))
+
+    return new_start, sorted(cnf, key=repr), new_start in nullable
+
+
+class CYKRecognizer:
+    """ Reconocedor CYK sobre la FNC de una gramática, vectorizado por longitud de tramo """
+
+    def __init__(self, start_symbol, productions):
+        start, cnf, self.accepts_empty = to_cnf(start_symbol, productions)
+
+        # Se descartan reglas con no terminales sin producciones (nunca se disparan)
+        defined = {lhs for lhs, _ in cnf}
+        cnf = [(lhs, rhs) for lhs, rhs in cnf
+               if len(rhs) == 1 or (rhs[0] in defined and rhs[1] in defined)]
+
+        non_terminals = sorted(defined | {start}, key=repr)
+        self.nt_index = {nt: i for i, nt in enumerate(non_terminals)}
+        self.start_index = self.nt_index[start]
+        n_nt = len(non_terminals)
+
+        # Máscaras de A -> a por terminal
+        self.terminal_masks = {}
+        binary = []
+        for lhs, rhs in cnf:
+            if len(rhs) == 1:
+                mask = self.terminal_masks.setdefault(rhs[0], np.zeros(n_nt, dtype=bool))
+                mask[self.nt_index[lhs]] = True
+            else:
+                binary.append((self.nt_index[lhs], self.nt_index[rhs[0]], self.nt_index[rhs[1]]))
+
+        # Reglas binarias como arreglos paralelos A -> B C + matriz regla -> lhs
+        self.rule_left = np.array([b for _, b, _ in binary], dtype=np.intp)
+        self.rule_right = np.array([c for _, _, c in binary], dtype=np.intp)
+        self.rule_lhs = np.zeros((len(binary), n_nt), dtype=bool)
+        for r, (a, _, _) in enumerate(binary):
+            self.rule_lhs[r, a] = True
+        self.n_nt = n_nt
+
+    def recognize(self, tokens):
+        """ True si la cadena de tokens pertenece al lenguaje """
+        n = len(tokens)
+        if n == 0:
+            return self.accepts_empty
+
+        # chart[l, i] = máscara de no terminales que derivan tokens[i:i+l]
+        chart = np.zeros((n + 1, n, self.n_nt), dtype=bool)
+        for i, tok in enumerate(tokens):
+            mask = self.terminal_masks.get(tok)
+            if mask is None:
+                return False
+            chart[1, i] = mask
+
+        if len(self.rule_lhs) == 0:
+            return n == 1 and bool(chart[1, 0, self.start_index])
+
+        for length in range(2, n + 1):
+            starts = np.arange(n - length + 1)
+            splits = np.arange(1, length)[:, None] # Longitud de la parte izquierda
+            left = chart[splits, starts[None, :]]                 # (splits, starts, NT)
+            right = chart[length - splits, starts[None, :] + splits]
+            fired = (left[:, :, self.rule_left] & right[:, :, self.rule_right]).any(axis=0)
+            chart[length, :len(starts)] = fired @ self.rule_lhs
+
+        return bool(chart[n, 0, self.start_index])
@@ -0,0 +1,13 @@
+# Cancellation.py
+# Cancelación cooperativa de operaciones largas (parseo, generación) lanzadas desde
+# otro hilo: quien llama pasa un threading.Event y los bucles lo consultan entre pasos.
+
+
+class OperationCancelled(Exception):
+    """ La operación se detuvo porque se activó su evento de cancelación """
+
+
+def check_cancelled(cancel):
+    """ Lanza OperationCancelled si cancel (threading.Event o None) está activado """
+    if cancel is not None and cancel.is_set():
+        raise OperationCancelled("Operación cancelada por el usuario.")
@@ -1,2 +1,23 @@
+import os
+
 MAX_GENERATED_STRINGS = 10
-EPSILON = 'ε' # Símbolo interno para epsilon
\ No newline at end of file
+EPSILON = 'ε' # Símbolo interno para epsilon
+
+# Caché en disco de gramáticas compiladas (ver GrammarCache.py)
+GRAMMAR_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "GramaticsGenerator")
+GRAMMAR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Caché en memoria de resultados de validate_string (ver GrammarCache.ValidationResultCache)
+VALIDATION_CACHE_MAX_ENTRIES = 1024
+VALIDATION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Servidor local de validación (ver server.py y GrammarRegistry.py)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MEMORY_BUDGET = 512 * 1024 * 1024 # Bytes estimados para todas las gramáticas en memoria
+SERVER_MAX_REQUEST_BYTES = 64 * 1024 * 1024
+SERVER_MAX_INPUTS = 100000            # Cadenas por petición a /validate
+SERVER_MAX_GENERATED_STRINGS = 100000 # Cadenas por petición a /generate (n se recorta a este valor)
+SERVER_MAX_GENERATION_LENGTH = 100    # max_length de /generate con sample (tablas polinómicas en la longitud)
+SERVER_MAX_ENUMERATION_LENGTH = 12    # max_length de /generate con enumerate (materializa cada longitud entera)
+SERVER_MAX_DEPTH = 25                 # depth de /generate con random (recursión de NLTK)
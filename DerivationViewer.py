@@ -0,0 +1,112 @@
+# DerivationViewer.py
+# Ventana de árboles de derivación sobre un ParseForest:
+#  - cada derivación se pide con forest.lazy_tree: un nodo decodifica sus hijos del bosque
+#    solo cuando se muestra (con la gramática simplificada se construye el árbol entero)
+#  - los nodos del ttk.Treeview se crean al abrirlos (un árbol enorme no se vuelca entero)
+#  - las derivaciones alternativas se recorren de una en una por su índice, sin construir
+#    la lista de todos los árboles.
+
+import tkinter as tk
+from tkinter import ttk
+
+_PLACEHOLDER = "…" # Hijo ficticio para que el Treeview muestre el indicador de expansión
+
+
+class DerivationViewer:
+    """ Toplevel que muestra la derivación número index del bosque, expandiendo bajo demanda """
+
+    def __init__(self, master, input_string, forest, tree_count=None):
+        self.forest = forest
+        self.tree_count = tree_count if tree_count is not None else forest.count()
+        self.index = 0
+        self._pending = {}      # item del Treeview -> subárbol aún no expandido
+
+        self.window = tk.Toplevel(master)
+        title = f"Árbol de Derivación para: '{input_string}'"
+        if self.tree_count > 1:
+            title += f" ({self.tree_count} encontrados - Gramática Ambigua)"
+        self.window.title(title)
+        self.window.geometry("560x420")
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(expand=True, fill=tk.BOTH)
+
+        ttk.Label(frame, text=f"Árbol de Derivación para '{input_string}':",
+                  font=('Helvetica', 11, 'bold')).pack(pady=(0, 5))
+
+        tree_frame = ttk.Frame(frame)
+        tree_frame.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+        self.tree_view = ttk.Treeview(tree_frame, show="tree", selectmode="browse")
+        y_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree_view.yview)
+        x_scroll = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree_view.xview)
+        self.tree_view.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        self.tree_view.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        self.tree_view.bind("<<TreeviewOpen>>", self._on_open)
+
+        nav_frame = ttk.Frame(frame)
+        nav_frame.pack(fill=tk.X, pady=(5, 0))
+        self.prev_button = ttk.Button(nav_frame, text="◀ Anterior", command=self.show_previous)
+        self.prev_button.pack(side=tk.LEFT)
+        self.page_label = ttk.Label(nav_frame, text="")
+        self.page_label.pack(side=tk.LEFT, expand=True)
+        self.next_button = ttk.Button(nav_frame, text="Siguiente ▶", command=self.show_next)
+        self.next_button.pack(side=tk.RIGHT)
+
+        ttk.Button(frame, text="Cerrar", command=self.window.destroy).pack(pady=(10, 0))
+        self.window.transient(master)
+
+        self._show(0, forest.lazy_tree(0) if self.tree_count else None)
+
+    # --- Navegación entre derivaciones ---
+
+    def show_next(self):
+        if self.index + 1 >= self.tree_count:
+            return
+        self._show(self.index + 1, self.forest.lazy_tree(self.index + 1))
+
+    def show_previous(self):
+        if self.index == 0:
+            return
+        self._show(self.index - 1, self.forest.lazy_tree(self.index - 1))
+
+    def _show(self, index, tree):
+        self.index = index
+        self.tree_view.delete(*self.tree_view.get_children())
+        self._pending.clear()
+        if tree is not None:
+            root = self._insert("", tree)
+            self._expand(root)
+            self.tree_view.item(root, open=True)
+        self.page_label.config(text=f"Derivación {index + 1} de {self.tree_count}")
+        self.prev_button.config(state=tk.NORMAL if index > 0 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if index + 1 < self.tree_count else tk.DISABLED)
+
+    # --- Expansión perezosa ---
+
+    def _insert(self, parent, node):
+        """ Inserta un nodo (ForestNode o nltk.Tree); si tiene hijos, deja un marcador y los
+            guarda para después. Los terminales son str.
+        """
+        if isinstance(node, str):
+            return self.tree_view.insert(parent, "end", text=f"'{node}'")
+        rhs = " ".join(f"'{child}'" if isinstance(child, str) else child.label() for child in node)
+        item = self.tree_view.insert(parent, "end", text=f"{node.label()} → {rhs or 'ε'}")
+        if len(node):
+            self.tree_view.insert(item, "end", text=_PLACEHOLDER)
+            self._pending[item] = node
+        return item
+
+    def _expand(self, item):
+        node = self._pending.pop(item, None)
+        if node is None:
+            return
+        self.tree_view.delete(*self.tree_view.get_children(item))
+        for child in node:
+            self._insert(item, child)
+
+    def _on_open(self, event):
+        self._expand(self.tree_view.focus())
@@ -0,0 +1,459 @@
+# EarleyEngine.py
+# Reconocedor/parser Earley propio con la gramática internada a enteros.
+# Los anulables se tratan con la técnica de Aycock-Horspool (avanzar el punto al predecir)
+# y los charts se guardan en arreglos compactos (array) en lugar de objetos arista.
+# Solo se predicen producciones productivas: todo ítem del chart puede completarse, así que
+# una columna no vacía equivale a un prefijo viable (lo aprovecha EarleySession).
+# updated() aplica cambios por producción sin recalcular toda la tabla de predicción.
+
+import copy
+from array import array
+
+from Cancellation import check_cancelled
+from ParseForest import ParseForest
+
+COMPLETE = -1 # Valor de item_next para los ítems con el punto al final
+
+
+class EarleySet:
+    """ Columna j del chart: ítems (regla con punto) y sus orígenes en arreglos paralelos """
+    __slots__ = ('items', 'origins', 'waiting', 'completed')
+
+    def __init__(self):
+        self.items = array('i')
+        self.origins = array('i')
+        self.waiting = {}   # no terminal -> posiciones de ítems que esperan ese símbolo
+        self.completed = {} # no terminal -> set de orígenes de ítems completos
+
+
+class EarleyEngine:
+    """ Tablas precalculadas una vez por gramática y parseo sobre enteros.
+
+        Las producciones se reciben como pares (lhs, rhs) con la convención de NLTK
+        (terminales = str, no terminales = Nonterminal).
+    """
+
+    def __init__(self, start_symbol, productions):
+        productions = [(lhs, tuple(rhs)) for lhs, rhs in productions]
+
+        # 1. Internar símbolos: no terminales 0..N-1, terminales N..
+        self.symbols = []
+        self.nt_ids = {}
+        for lhs, _ in productions:
+            self._intern_nt(lhs)
+        self._intern_nt(start_symbol)
+        for _, rhs in productions:
+            for sym in rhs:
+                if not isinstance(sym, str):
+                    self._intern_nt(sym)
+        self.n_nt = len(self.symbols)
+        self.t_ids = {}
+        for _, rhs in productions:
+            for sym in rhs:
+                if isinstance(sym, str) and sym not in self.t_ids:
+                    self.t_ids[sym] = len(self.symbols)
+                    self.symbols.append(sym)
+        self.start = self.nt_ids[start_symbol]
+
+        # 2. Reglas con punto numeradas de forma contigua: avanzar el punto es item + 1
+        self.item_next = array('i')   # símbolo tras el punto (o COMPLETE)
+        self.item_lhs = array('i')
+        self.item_dot = array('i')
+        self.prod_lhs = array('i')
+        self.prod_rhs = []
+        self.prod_first_item = array('i')
+        self.prods_by_lhs = [[] for _ in range(self.n_nt)]
+        self.dead = 0 # Producciones quitadas por updated() (sus ítems siguen numerados)
+        for lhs, rhs in productions:
+            self.prods_by_lhs[self.nt_ids[lhs]].append(self._append_production(self.nt_ids[lhs], self._encode_rhs(rhs)))
+
+        # 3. Anulables (punto fijo)
+        self.nullable = bytearray(self.n_nt)
+        changed = True
+        while changed:
+            changed = False
+            for p, rhs in enumerate(self.prod_rhs):
+                lhs = self.prod_lhs[p]
+                if not self.nullable[lhs] and all(s < self.n_nt and self.nullable[s] for s in rhs):
+                    self.nullable[lhs] = 1
+                    changed = True
+
+        # 4. Productivos (derivan alguna cadena de terminales), punto fijo
+        self.productive = productive = bytearray(self.n_nt)
+        changed = True
+        while changed:
+            changed = False
+            for p, rhs in enumerate(self.prod_rhs):
+                lhs = self.prod_lhs[p]
+                if not productive[lhs] and all(s >= self.n_nt or productive[s] for s in rhs):
+                    productive[lhs] = 1
+                    changed = True
+        self.live = bytearray(self._is_live(p) for p in range(len(self.prod_rhs)))
+
+        # 5. Tabla de predicción cerrada: predecir A añade de una vez todas las reglas
+        #    iniciales (productivas) de los no terminales alcanzables por la izquierda
+        #    (saltando anulables)
+        left_of = [self._left_of(a) for a in range(self.n_nt)]
+        self.predict = []
+        self.predict_nts = []
+        for a in range(self.n_nt):
+            reach = self._reach(a, left_of.__getitem__)
+            self.predict_nts.append(tuple(sorted(reach)))
+            self.predict.append(self._predict_row(reach))
+
+    def _intern_nt(self, sym):
+        if sym not in self.nt_ids:
+            self.nt_ids[sym] = len(self.symbols)
+            self.symbols.append(sym)
+
+    def _encode_rhs(self, rhs):
+        return tuple(self.t_ids[s] if isinstance(s, str) else self.nt_ids[s] for s in rhs)
+
+    def _append_production(self, lhs_id, rhs_ids):
+        """ Numera la producción y sus ítems a continuación de los existentes """
+        self.prod_lhs.append(lhs_id)
+        self.prod_rhs.append(rhs_ids)
+        self.prod_first_item.append(len(self.item_next))
+        for dot in range(len(rhs_ids) + 1):
+            self.item_next.append(rhs_ids[dot] if dot < len(rhs_ids) else COMPLETE)
+            self.item_lhs.append(lhs_id)
+            self.item_dot.append(dot)
+        return len(self.prod_rhs) - 1
+
+    def _is_live(self, p):
+        return all(s >= self.n_nt or self.productive[s] for s in self.prod_rhs[p])
+
+    def _left_of(self, a):
+        """ No terminales con los que puede empezar una producción de a (saltando anulables) """
+        result = set()
+        for p in self.prods_by_lhs[a]:
+            for s in self.prod_rhs[p]:
+                if s >= self.n_nt:
+                    break
+                result.add(s)
+                if not self.nullable[s]:
+                    break
+        return result
+
+    @staticmethod
+    def _reach(a, left_of):
+        """ a y los no terminales alcanzables desde a por la izquierda (left_of: función) """
+        reach = {a}
+        pending = [a]
+        while pending:
+            for b in left_of(pending.pop()):
+                if b not in reach:
+                    reach.add(b)
+                    pending.append(b)
+        return reach
+
+    def _predict_row(self, reach):
+        first_item, by_lhs, live = self.prod_first_item, self.prods_by_lhs, self.live
+        return array('i', (first_item[p] for b in sorted(reach) for p in by_lhs[b] if live[p]))
+
+    # --- Cambios por producción ---
+
+    def updated(self, added, removed, nullable_changes=(), productive_changes=()):
+        """ Motor para la gramática con las producciones added añadidas y removed quitadas
+            (pares (lhs, rhs) como en el constructor; las quitadas deben existir).
+            nullable_changes/productive_changes: no terminales que entran o salen de los
+            anulables/productivos con el cambio (los da GrammarAnalysis.ProductionIndex).
+            Solo se rehacen las filas de predicción de los no terminales que alcanzan por la
+            izquierda a un lado izquierdo afectado. Este motor no cambia (puede haber sesiones
+            y bosques usándolo). Devuelve None si conviene reconstruirlo: aparece un no terminal
+            nuevo (sus ids van antes que los terminales) o las reglas muertas superan a las vivas.
+        """
+        nt_ids = self.nt_ids
+        if any(not isinstance(sym, str) and sym not in nt_ids
+               for lhs, rhs in (*added, *removed) for sym in (lhs, *rhs)):
+            return None
+        if 2 * (self.dead + len(removed)) > len(self.prod_rhs) + len(added):
+            return None
+
+        engine = copy.copy(self) # Se copian los contenedores que cambian; el resto se comparte
+        for name in ('symbols', 'prod_rhs', 'prods_by_lhs', 'predict', 'predict_nts'):
+            setattr(engine, name, list(getattr(self, name)))
+        for name in ('item_next', 'item_lhs', 'item_dot', 'prod_lhs', 'prod_first_item'):
+            setattr(engine, name, array('i', getattr(self, name)))
+        engine.t_ids = dict(self.t_ids)
+        engine.nullable = bytearray(self.nullable)
+        engine.productive = bytearray(self.productive)
+        engine.live = bytearray(self.live)
+
+        for _, rhs in added: # Los terminales nuevos se numeran al final
+            for sym in rhs:
+                if isinstance(sym, str) and sym not in engine.t_ids:
+                    engine.t_ids[sym] = len(engine.symbols)
+                    engine.symbols.append(sym)
+
+        edited = set()
+        for lhs, rhs in removed:
+            lhs_id, rhs_ids = nt_ids[lhs], engine._encode_rhs(rhs)
+            group = engine.prods_by_lhs[lhs_id]
+            engine.prods_by_lhs[lhs_id] = [p for p in group if engine.prod_rhs[p] != rhs_ids]
+            engine.dead += len(group) - len(engine.prods_by_lhs[lhs_id])
+            edited.add(lhs_id)
+        for lhs, rhs in added:
+            lhs_id = nt_ids[lhs]
+            engine.prods_by_lhs[lhs_id] = engine.prods_by_lhs[lhs_id] + [engine._append_production(lhs_id, engine._encode_rhs(rhs))]
+            engine.live.append(0)
+            edited.add(lhs_id)
+
+        flipped_nullable = {nt_ids[sym] for sym in nullable_changes if sym in nt_ids}
+        for a in flipped_nullable:
+            engine.nullable[a] ^= 1
+        for sym in productive_changes:
+            if sym in nt_ids:
+                engine.productive[nt_ids[sym]] ^= 1
+
+        # Producciones cuya vitalidad puede cambiar: las nuevas y las que usan un no terminal
+        # que cambió de productivo (recorrido lineal, solo si hubo cambios)
+        candidates = range(len(self.prod_rhs), len(engine.prod_rhs))
+        if productive_changes:
+            candidates = range(len(engine.prod_rhs))
+        for p in candidates:
+            live = engine._is_live(p)
+            if live != engine.live[p]:
+                engine.live[p] = live
+                edited.add(engine.prod_lhs[p])
+
+        # No terminales cuyo conjunto left_of cambió: los editados o, si cambiaron anulables, cualquiera
+        maybe_left = range(self.n_nt) if flipped_nullable else edited
+        new_left = {a: engine._left_of(a) for a in maybe_left}
+        changed_left = {a for a, left in new_left.items() if left != self._left_of(a)}
+
+        touched = edited | changed_left
+        for a in range(self.n_nt):
+            reach = self.predict_nts[a]
+            if touched.isdisjoint(reach):
+                continue
+            if not changed_left.isdisjoint(reach):
+                reach = self._reach(a, lambda b: new_left[b] if b in new_left else new_left.setdefault(b, engine._left_of(b)))
+                engine.predict_nts[a] = tuple(sorted(reach))
+            engine.predict[a] = engine._predict_row(reach)
+        return engine
+
+    # --- Reconocimiento ---
+
+    def encode(self, tokens):
+        """ Tokens -> ids de terminal; None si hay un token fuera del alfabeto """
+        t_ids = self.t_ids
+        encoded = array('i')
+        for tok in tokens:
+            tid = t_ids.get(tok)
+            if tid is None:
+                return None
+            encoded.append(tid)
+        return encoded
+
+    def build_chart(self, tokens, cancel=None, stats=None):
+        """ Construye el chart completo. Devuelve la lista de columnas (o None si hay
+            un token desconocido); se detiene antes si una columna queda vacía.
+            cancel (threading.Event) se consulta antes de cada columna.
+            stats (Instrumentation) recibe el contador 'chart_items' si está activo.
+        """
+        encoded = self.encode(tokens)
+        if encoded is None:
+            return None
+
+        chart = [EarleySet()]
+        seen = [set()]
+        self._add_predictions(chart[0], seen[0], self.start, 0)
+        for j in range(len(encoded) + 1):
+            check_cancelled(cancel)
+            if j < len(encoded):
+                chart.append(EarleySet())
+                seen.append(set())
+            if j < len(encoded):
+                self._process_set(chart, j, seen[j], seen[j + 1], encoded[j])
+            else:
+                self._process_set(chart, j, seen[j])
+            seen[j] = None # Ya no se añaden ítems a la columna j
+            if j < len(encoded) and not chart[j + 1].items:
+                break
+        if stats is not None and stats.enabled:
+            stats.count('chart_items', sum(len(column.items) for column in chart))
+        return chart
+
+    def _add(self, column, seen, item, origin):
+        key = origin * len(self.item_next) + item
+        if key not in seen:
+            seen.add(key)
+            pos = len(column.items)
+            column.items.append(item)
+            column.origins.append(origin)
+            nxt = self.item_next[item]
+            if nxt >= 0 and nxt < self.n_nt:
+                column.waiting.setdefault(nxt, []).append(pos)
+
+    def _add_predictions(self, column, seen, nt, j):
+        for item in self.predict[nt]:
+            self._add(column, seen, item, j)
+
+    def _process_set(self, chart, j, col_seen, next_seen=None, next_token=None):
+        """ Cierra la columna j (predecir/completar) y escanea next_token hacia j + 1
+            (sin next_token no se escanea)
+        """
+        column = chart[j]
+        item_next = self.item_next
+        n_nt = self.n_nt
+        nullable = self.nullable
+        predicted = bytearray(n_nt)
+
+        i = 0
+        while i < len(column.items):
+            item = column.items[i]
+            origin = column.origins[i]
+            nxt = item_next[item]
+
+            if nxt == COMPLETE: # Completar
+                lhs = self.item_lhs[item]
+                origins = column.completed.setdefault(lhs, set())
+                if origin not in origins:
+                    origins.add(origin)
+                    source = chart[origin]
+                    for pos in list(source.waiting.get(lhs, ())):
+                        self._add(column, col_seen, source.items[pos] + 1, source.origins[pos])
+            elif nxt < n_nt: # Predecir (+ avance inmediato si es anulable)
+                if not predicted[nxt]:
+                    for b in self.predict_nts[nxt]:
+                        predicted[b] = 1
+                    self._add_predictions(column, col_seen, nxt, j)
+                if nullable[nxt]:
+                    self._add(column, col_seen, item + 1, origin)
+            elif nxt == next_token: # Escanear
+                self._add(chart[j + 1], next_seen, item + 1, origin)
+            i += 1
+
+    def session(self, stats=None):
+        """ Sesión de parseo incremental por prefijos (ver EarleySession) """
+        return EarleySession(self, stats)
+
+    def recognize(self, tokens, cancel=None, stats=None):
+        """ True si la cadena pertenece al lenguaje """
+        chart = self.build_chart(tokens, cancel, stats)
+        if chart is None or len(chart) != len(tokens) + 1:
+            return False
+        return 0 in chart[-1].completed.get(self.start, ())
+
+    # --- Bosque de parseo ---
+
+    def parse(self, tokens, cancel=None, stats=None):
+        """ Devuelve un ParseForest (vacío si la cadena no pertenece) """
+        chart = self.build_chart(tokens, cancel, stats)
+        n = len(tokens)
+        if chart is None or len(chart) != n + 1 or 0 not in chart[-1].completed.get(self.start, ()):
+            return ParseForest(None, None)
+
+        encoded = self.encode(tokens)
+        symbols = self.symbols
+        n_nt = self.n_nt
+
+        def families(node):
+            """ Descompone cada producción de A sobre [i, j] de derecha a izquierda """
+            lhs, i, j = node
+            result = {} # Producciones repetidas darían familias idénticas
+            for p in self.prods_by_lhs[self.nt_ids[lhs]]:
+                rhs = self.prod_rhs[p]
+                # Pila de (posición en rhs, límite derecho, hijos acumulados al revés)
+                stack = [(len(rhs), j, ())]
+                while stack:
+                    t, end, children = stack.pop()
+                    if t == 0:
+                        if end == i:
+                            result[children[::-1]] = None
+                        continue
+                    sym = rhs[t - 1]
+                    if sym >= n_nt:
+                        if end > i and encoded[end - 1] == sym:
+                            stack.append((t - 1, end - 1, children + (tokens[end - 1],)))
+                    else:
+                        for start in chart[end].completed.get(sym, ()):
+                            if start >= i:
+                                stack.append((t - 1, start, children + ((symbols[sym], start, end),)))
+            return list(result)
+
+        forest = ParseForest((symbols[self.start], 0, n), families)
+        forest.size_hint = 350 * sum(len(column.items) for column in chart) # Medido con tracemalloc
+        return forest
+
+
+class EarleySession:
+    """ Chart reanudable para validar mientras se escribe: feed() añade una columna
+        escaneando un token sobre la última, pop() descarta solo la última columna.
+        Las columnas cerradas no cambian al añadir tokens, así que se conservan tal cual.
+    """
+
+    def __init__(self, engine, stats=None):
+        self.engine = engine
+        self.stats = stats
+        self.tokens = []
+        self.dead_at = None # Posición del primer token que dejó el prefijo sin continuación
+        column = EarleySet()
+        seen = set()
+        engine._add_predictions(column, seen, engine.start, 0)
+        self.chart = [column]
+        engine._process_set(self.chart, 0, seen)
+
+    def feed(self, token):
+        """ Añade un token. Devuelve True si el texto sigue siendo un prefijo viable """
+        engine = self.engine
+        last = self.chart[-1]
+        column = EarleySet()
+        self.chart.append(column)
+        self.tokens.append(token)
+        tid = engine.t_ids.get(token)
+        if tid is not None and last.items:
+            seen = set()
+            item_next = engine.item_next
+            for item, origin in zip(last.items, last.origins):
+                if item_next[item] == tid:
+                    engine._add(column, seen, item + 1, origin)
+            engine._process_set(self.chart, len(self.chart) - 1, seen)
+        if not column.items and self.dead_at is None:
+            self.dead_at = len(self.tokens) - 1
+        if self.stats is not None and self.stats.enabled:
+            self.stats.count('chart_items', len(column.items))
+        return bool(column.items)
+
+    def pop(self):
+        """ Quita el último token (retroceso) """
+        if not self.tokens:
+            return
+        self.chart.pop()
+        self.tokens.pop()
+        if self.dead_at is not None and self.dead_at >= len(self.tokens):
+            self.dead_at = None
+
+    def sync(self, tokens):
+        """ Lleva la sesión a tokens reutilizando el prefijo común con el texto actual.
+            Devuelve viable.
+        """
+        common = len(self.tokens)
+        if tokens[:common] != self.tokens: # Caso habitual (se escribió al final): sin recorrer en Python
+            common = 0
+            limit = min(len(tokens), len(self.tokens))
+            while common < limit and tokens[common] == self.tokens[common]:
+                common += 1
+        while len(self.tokens) > common:
+            self.pop()
+        for token in tokens[common:]:
+            self.feed(token)
+        return self.viable
+
+    @property
+    def viable(self):
+        """ True si el texto actual es prefijo de alguna cadena del lenguaje """
+        return bool(self.chart[-1].items)
+
+    @property
+    def accepts(self):
+        """ True si el texto actual pertenece al lenguaje """
+        return 0 in self.chart[-1].completed.get(self.engine.start, ())
+
+    def expected(self):
+        """ Terminales que pueden seguir al texto actual (ordenados) """
+        engine = self.engine
+        item_next = engine.item_next
+        ids = {item_next[item] for item in self.chart[-1].items}
+        return sorted(engine.symbols[i] for i in ids if i >= engine.n_nt)
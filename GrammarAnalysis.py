@@ -0,0 +1,204 @@
+# GrammarAnalysis.py
+# Análisis de gramáticas independientes del motor de parseo.
+# Las producciones son pares (lhs, rhs) con la convención de NLTK:
+# terminales = str, no terminales = cualquier otro objeto (Nonterminal, tuplas...).
+
+
+def closure_symbols(productions, terminals_ok):
+    """ Menor conjunto de no terminales X tales que alguna producción X -> α tiene todos
+        sus símbolos en el conjunto (los terminales cuentan como válidos si terminals_ok).
+        Con terminals_ok=False son los anulables; con True, los productivos.
+        Algoritmo lineal: cada producción lleva la cuenta de símbolos aún no satisfechos.
+    """
+    pending = []
+    uses = {}
+    result = set()
+    work = []
+    for idx, (lhs, rhs) in enumerate(productions):
+        if not terminals_ok and any(isinstance(sym, str) for sym in rhs):
+            pending.append(-1) # Nunca se satisface
+            continue
+        needed = [sym for sym in rhs if not isinstance(sym, str)]
+        pending.append(len(needed))
+        for sym in needed:
+            uses.setdefault(sym, []).append(idx)
+        if not needed and lhs not in result:
+            result.add(lhs)
+            work.append(lhs)
+
+    while work:
+        sym = work.pop()
+        for idx in uses.get(sym, ()):
+            pending[idx] -= 1
+            if pending[idx] == 0:
+                lhs = productions[idx][0]
+                if lhs not in result:
+                    result.add(lhs)
+                    work.append(lhs)
+    return result
+
+
+def nullable_symbols(productions):
+    """ No terminales que derivan la cadena vacía """
+    return closure_symbols(productions, terminals_ok=False)
+
+
+def productive_symbols(productions):
+    """ No terminales que derivan al menos una cadena de terminales """
+    return closure_symbols(productions, terminals_ok=True)
+
+
+def _satisfied(symbols, closed, terminals_ok):
+    return all(terminals_ok if isinstance(sym, str) else sym in closed for sym in symbols)
+
+
+class ProductionIndex:
+    """ Producciones agrupadas por lado izquierdo, usos de cada no terminal y conjuntos de
+        anulables y productivos, actualizados por producción (add/remove) sin recorrer la
+        gramática. Añadir solo puede agrandar los conjuntos: se propaga desde la producción
+        nueva. Quitar una solo obliga a recalcularlos si era la que sostenía a su lado izquierdo.
+    """
+
+    def __init__(self, productions):
+        self.by_lhs = {} # lhs -> {rhs: None} (dict: orden de inserción y borrado en O(1))
+        self.uses = {}   # no terminal -> {(lhs, rhs): None} con el no terminal en rhs
+        for lhs, rhs in productions:
+            self._link(lhs, tuple(rhs))
+        pairs = self.pairs()
+        self.nullable = nullable_symbols(pairs)
+        self.productive = productive_symbols(pairs)
+
+    def pairs(self):
+        return [(lhs, rhs) for lhs, group in self.by_lhs.items() for rhs in group]
+
+    def _link(self, lhs, rhs):
+        self.by_lhs.setdefault(lhs, {})[rhs] = None
+        for sym in rhs:
+            if not isinstance(sym, str):
+                self.uses.setdefault(sym, {})[(lhs, rhs)] = None
+
+    def _unlink(self, lhs, rhs):
+        del self.by_lhs[lhs][rhs]
+        for sym in rhs:
+            if not isinstance(sym, str):
+                self.uses[sym].pop((lhs, rhs), None)
+
+    def add(self, lhs, rhs):
+        """ Añade lhs -> rhs (que no estaba). Devuelve (anulables nuevos, productivos nuevos) """
+        rhs = tuple(rhs)
+        self._link(lhs, rhs)
+        return (self._extend(self.nullable, lhs, rhs, terminals_ok=False),
+                self._extend(self.productive, lhs, rhs, terminals_ok=True))
+
+    def remove(self, lhs, rhs):
+        """ Quita lhs -> rhs (que estaba). Devuelve (anulables perdidos, productivos perdidos) """
+        rhs = tuple(rhs)
+        self._unlink(lhs, rhs)
+        lost_nullable = self._shrink('nullable', lhs, rhs, terminals_ok=False)
+        return lost_nullable, self._shrink('productive', lhs, rhs, terminals_ok=True)
+
+    def _extend(self, closed, lhs, rhs, terminals_ok):
+        if lhs in closed or not _satisfied(rhs, closed, terminals_ok):
+            return set()
+        added = {lhs}
+        closed.add(lhs)
+        work = [lhs]
+        while work:
+            sym = work.pop()
+            for other_lhs, other_rhs in self.uses.get(sym, ()):
+                if other_lhs not in closed and _satisfied(other_rhs, closed, terminals_ok):
+                    closed.add(other_lhs)
+                    added.add(other_lhs)
+                    work.append(other_lhs)
+        return added
+
+    def _shrink(self, name, lhs, rhs, terminals_ok):
+        closed = getattr(self, name)
+        if lhs not in closed or not _satisfied(rhs, closed, terminals_ok):
+            return set() # La producción no sostenía a nadie
+        # Otra producción de lhs sin no terminales lo sostiene sin depender de ningún ciclo
+        if any(all(isinstance(sym, str) for sym in other) and (terminals_ok or not other)
+               for other in self.by_lhs.get(lhs, ())):
+            return set()
+        recomputed = closure_symbols(self.pairs(), terminals_ok)
+        setattr(self, name, recomputed)
+        return closed - recomputed
+
+
+END_MARKER = None # Fin de la entrada en FOLLOW y en las tablas predictivas
+
+
+def _propagate(sets, includes):
+    """ Cierra en sitio sets bajo las inclusiones sets[a] ⊇ sets[b] para b en includes[a]
+        (lista de trabajo: cada símbolo se reprocesa solo cuando crece uno de sus orígenes)
+    """
+    dependents = {}
+    for a, sources in includes.items():
+        for b in sources:
+            dependents.setdefault(b, set()).add(a)
+    work = list(sets)
+    while work:
+        b = work.pop()
+        for a in dependents.get(b, ()):
+            before = len(sets[a])
+            sets[a] |= sets[b]
+            if len(sets[a]) != before:
+                work.append(a)
+    return sets
+
+
+def first_sets(productions, nullable=None):
+    """ FIRST(A) para cada no terminal: terminales con los que puede empezar lo que deriva """
+    if nullable is None:
+        nullable = nullable_symbols(productions)
+    first = {}
+    includes = {}
+    for lhs, rhs in productions:
+        first.setdefault(lhs, set())
+        for sym in rhs:
+            if isinstance(sym, str):
+                first[lhs].add(sym)
+                break
+            first.setdefault(sym, set())
+            includes.setdefault(lhs, set()).add(sym)
+            if sym not in nullable:
+                break
+    return _propagate(first, includes)
+
+
+def first_of_sequence(symbols, first, nullable):
+    """ (FIRST de la secuencia, True si toda la secuencia es anulable) """
+    result = set()
+    for sym in symbols:
+        if isinstance(sym, str):
+            result.add(sym)
+            return result, False
+        result |= first.get(sym, set())
+        if sym not in nullable:
+            return result, False
+    return result, True
+
+
+def follow_sets(start_symbol, productions, first, nullable):
+    """ FOLLOW(A): terminales (o END_MARKER) que pueden aparecer justo después de A """
+    follow = {start_symbol: {END_MARKER}}
+    includes = {}
+    for lhs, rhs in productions:
+        follow.setdefault(lhs, set())
+        # Recorrido de derecha a izquierda con FIRST del resto de la producción ya acumulado
+        rest_first = set()
+        rest_nullable = True
+        for sym in reversed(rhs):
+            if isinstance(sym, str):
+                rest_first = {sym}
+                rest_nullable = False
+                continue
+            follow.setdefault(sym, set()).update(rest_first)
+            if rest_nullable and sym != lhs:
+                includes.setdefault(sym, set()).add(lhs)
+            if sym in nullable:
+                rest_first = rest_first | first.get(sym, set())
+            else:
+                rest_first = first.get(sym, set())
+                rest_nullable = False
+    return _propagate(follow, includes)
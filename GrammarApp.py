@@ -1,8 +1,21 @@
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox, scrolledtext
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import queue
+import threading
+import time
+import traceback
 from GrammarLogic import GrammarLogicNLTK
-from Constants import MAX_GENERATED_STRINGS, EPSILON
-from nltk import CFG, Tree
+from GrammarIO import load_grammar_file
+from ProductionEditor import ProductionEditor
+from DerivationViewer import DerivationViewer
+from Cancellation import OperationCancelled, check_cancelled
+from GrammarCache import CompiledGrammarCache
+from Constants import MAX_GENERATED_STRINGS, EPSILON, GRAMMAR_CACHE_DIR, GRAMMAR_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__) # Sin configurar, los errores salen por stderr (nunca por stdout)
 
 class GrammarApp:
     def __init__(self, master):
@@ -10,9 +23,16 @@ class GrammarApp:
         master.title("Generador de Gramáticas") # Título actualizado
         master.geometry("800x700")
 
-        # Usar la nueva clase lógica
-        self.logic = GrammarLogicNLTK()
-        self.production_rows_widgets = []
+        # Usar la nueva clase lógica (con caché en disco de gramáticas compiladas)
+        self.logic = GrammarLogicNLTK(cache=CompiledGrammarCache(GRAMMAR_CACHE_DIR, GRAMMAR_CACHE_MAX_BYTES))
+        self._synced_grammar = None # ((S, T, NT), producciones) tal como se cargaron en la lógica
+        self._prefix_session = None # Sesión Earley incremental para validar mientras se escribe
+
+        # Trabajo pesado (parseo, generación) en un hilo aparte; los resultados vuelven por una cola
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._job_queue = queue.Queue()
+        self._job = None            # (tipo, evento de cancelación, instante de inicio) del trabajo en curso
+        master.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # --- Estilos (sin cambios) ---
         style = ttk.Style()
@@ -59,21 +79,9 @@ class GrammarApp:
         self.load_grammar_button.pack(side=tk.RIGHT, padx=(0, 5))
 
 
-        # Canvas y Frame para producciones (igual que antes)
-        self.productions_canvas = tk.Canvas(grammar_frame, borderwidth=0, height=150)
-        self.productions_frame = ttk.Frame(self.productions_canvas)
-        self.productions_scrollbar = ttk.Scrollbar(grammar_frame, orient="vertical", command=self.productions_canvas.yview)
-        self.productions_canvas.configure(yscrollcommand=self.productions_scrollbar.set)
-        self.productions_canvas.grid(row=4, column=0, columnspan=4, sticky="nsew", pady=5)
-        self.productions_scrollbar.grid(row=4, column=4, sticky="ns")
-        self.productions_canvas_window = self.productions_canvas.create_window((0, 0), window=self.productions_frame, anchor="nw")
-        # ... (binds para el canvas igual que antes) ...
-        def _configure_canvas(event):
-             canvas_width = event.width
-             self.productions_canvas.itemconfig(self.productions_canvas_window, width=canvas_width)
-             self.productions_canvas.configure(scrollregion=self.productions_canvas.bbox("all"))
-        self.productions_frame.bind("<Configure>", lambda e: self.productions_canvas.configure(scrollregion=self.productions_canvas.bbox("all")))
-        self.productions_canvas.bind('<Configure>', _configure_canvas)
+        # Editor de producciones virtualizado (solo crea widgets para las filas visibles)
+        self.production_editor = ProductionEditor(grammar_frame, height=150)
+        self.production_editor.grid(row=4, column=0, columnspan=5, sticky="nsew", pady=5)
         grammar_frame.grid_rowconfigure(4, weight=1)
         grammar_frame.grid_columnconfigure(1, weight=1)
         self.add_production_row() # Fila inicial
@@ -85,6 +93,10 @@ class GrammarApp:
         self.validate_type_button.pack(side=tk.LEFT, padx=5)
         self.grammar_type_label = ttk.Label(type_frame, text="Tipo: (Presione validar)", style="Result.TLabel")
         self.grammar_type_label.pack(side=tk.LEFT, padx=5)
+        self.simplify_var = tk.BooleanVar(value=False) # Simplificar la gramática antes de parsear
+        self.simplify_check = ttk.Checkbutton(type_frame, text="Simplificar", variable=self.simplify_var,
+                                              command=lambda: self.logic.set_simplify(self.simplify_var.get()))
+        self.simplify_check.pack(side=tk.RIGHT, padx=5)
 
         # --- Sección Validación Cadena --- (igual que antes)
         validation_frame = ttk.LabelFrame(main_frame, text="3. Validación de Cadena", padding="10")
@@ -95,8 +107,14 @@ class GrammarApp:
         self.string_to_validate_entry.pack(side=tk.LEFT, padx=5)
         self.validate_string_button = ttk.Button(validation_frame, text="Validar Cadena", command=self.validate_string_action)
         self.validate_string_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_validation_button = ttk.Button(validation_frame, text="Cancelar", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_validation_button.pack(side=tk.LEFT, padx=5)
         self.validation_result_label = ttk.Label(validation_frame, text="Resultado: (Ingrese cadena y valide)", style="Result.TLabel")
         self.validation_result_label.pack(side=tk.LEFT, padx=(10,0))
+        # Validación en vivo: prefijo viable y terminales esperados en cada pulsación
+        self.prefix_status_label = ttk.Label(main_frame, text="", style="Result.TLabel")
+        self.prefix_status_label.pack(anchor=tk.W, padx=15)
+        self.string_to_validate_var.trace_add('write', self._update_prefix_status)
 
         # --- Sección Generación Cadenas --- (igual que antes)
         generation_frame = ttk.LabelFrame(main_frame, text="4. Generación de Cadenas", padding="10")
@@ -108,13 +126,15 @@ class GrammarApp:
         self.generation_n_var = tk.StringVar(value=str(MAX_GENERATED_STRINGS))
         self.generation_n_entry = ttk.Entry(gen_options_frame, textvariable=self.generation_n_var, width=5, font=('Helvetica', 10))
         self.generation_n_entry.pack(side=tk.LEFT, padx=5)
-        ttk.Label(gen_options_frame, text="Max Profundidad:").pack(side=tk.LEFT, padx=5)
-        self.generation_depth_var = tk.StringVar(value="7") # Añadir control profundidad NLTK
-        self.generation_depth_entry = ttk.Entry(gen_options_frame, textvariable=self.generation_depth_var, width=5, font=('Helvetica', 10))
-        self.generation_depth_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(gen_options_frame, text="Max Longitud:").pack(side=tk.LEFT, padx=5)
+        self.generation_length_var = tk.StringVar(value="7") # Longitud máxima de las cadenas (en terminales)
+        self.generation_length_entry = ttk.Entry(gen_options_frame, textvariable=self.generation_length_var, width=5, font=('Helvetica', 10))
+        self.generation_length_entry.pack(side=tk.LEFT, padx=5)
 
         self.generate_strings_button = ttk.Button(gen_options_frame, text="Generar Cadenas", command=self.generate_strings_action)
         self.generate_strings_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_generation_button = ttk.Button(gen_options_frame, text="Cancelar", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_generation_button.pack(side=tk.LEFT, padx=5)
         self.generation_count_label = ttk.Label(generation_frame, text="Cadenas generadas: 0", style="Result.TLabel")
         self.generation_count_label.pack(anchor=tk.W, padx=5, pady=(5,0))
         self.generated_strings_text = scrolledtext.ScrolledText(generation_frame, height=6, width=70, wrap=tk.WORD, state=tk.DISABLED, font=('Courier New', 10))
@@ -124,65 +144,56 @@ class GrammarApp:
     # --- Métodos de la App ---
 
     def add_production_row(self):
-        # (Sin cambios)
-        row_frame = ttk.Frame(self.productions_frame)
-        row_frame.pack(fill=tk.X, pady=1) # pady añade espacio entre filas
-
-        lhs_entry = ttk.Entry(row_frame, width=10, font=('Helvetica', 10)) # LHS editable
-        lhs_entry.pack(side=tk.LEFT, padx=(0, 0))
-
-        ttk.Label(row_frame, text=" ->").pack(side=tk.LEFT, padx=(0, 5))
-
-        rhs_entry = ttk.Entry(row_frame, font=('Helvetica', 10))
-        rhs_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0,5))
-
-        remove_button = ttk.Button(row_frame, text="X", width=2, style="Toolbutton",
-                                  command=lambda rf=row_frame: self.remove_production_row(rf))
-        remove_button.pack(side=tk.RIGHT)
-
-        row_data = {'frame': row_frame, 'lhs': lhs_entry, 'rhs': rhs_entry}
-        self.production_rows_widgets.append(row_data)
-
-        self.productions_frame.update_idletasks()
-        self.productions_canvas.configure(scrollregion=self.productions_canvas.bbox("all"))
-        self.productions_canvas.yview_moveto(1)
-
-
-    def remove_production_row(self, row_frame_to_remove):
-        # (Sin cambios)
-        index_to_remove = -1
-        for i, row_data in enumerate(self.production_rows_widgets):
-            if row_data['frame'] == row_frame_to_remove:
-                index_to_remove = i
-                break
-        if index_to_remove != -1:
-            self.production_rows_widgets[index_to_remove]['frame'].destroy()
-            del self.production_rows_widgets[index_to_remove]
-            self.productions_frame.update_idletasks()
-            self.productions_canvas.configure(scrollregion=self.productions_canvas.bbox("all"))
+        """ Añade una fila vacía al final del editor """
+        self.production_editor.add_row()
 
     def clear_production_rows(self):
-         # (Sin cambios respecto a la versión anterior con Cargar/Guardar)
-         for i in range(len(self.production_rows_widgets) - 1, -1, -1):
-            row_data = self.production_rows_widgets[i]
-            row_data['frame'].destroy()
-            del self.production_rows_widgets[i]
-         self.productions_frame.update_idletasks()
-         if self.productions_frame.winfo_exists():
-             self.productions_canvas.configure(scrollregion=self.productions_canvas.bbox("all"))
-
+        self.production_editor.clear()
 
     def _collect_productions(self):
-        # (Sin cambios)
         productions_list = []
-        for row_data in self.production_rows_widgets:
-            lhs_val = row_data['lhs'].get()
-            rhs_val = row_data['rhs'].get()
+        for lhs_val, rhs_val in self.production_editor.get_rows():
             # Añadir incluso si RHS está vacío (para epsilon)
             if lhs_val.strip():
                  productions_list.append((lhs_val, rhs_val))
         return productions_list
 
+    def _sync_production_deltas(self, header, productions_list):
+        """ Si solo cambiaron producciones desde la última carga, aplica los cambios
+            (quitar/añadir) sobre la gramática ya compilada. Devuelve False si hace
+            falta recompilar todo con set_grammar.
+        """
+        if not self._synced_grammar or not self.logic.has_grammar() or not productions_list:
+            return False
+        synced_header, synced_rows = self._synced_grammar
+        if synced_header != header:
+            return False
+
+        def row_key(row): return (row[0].strip(), row[1].strip())
+        old_rows = Counter(row_key(row) for row in synced_rows)
+        new_rows = Counter(row_key(row) for row in productions_list)
+        removed = old_rows - new_rows
+        added = new_rows - old_rows
+
+        # Ante cualquier error o advertencia se recompila todo para que set_grammar lo reporte
+        for (lhs, rhs), count in removed.items():
+            for _ in range(count):
+                if self.logic.remove_production(lhs, rhs):
+                    return False
+        for (lhs, rhs), count in added.items():
+            for _ in range(count):
+                if self.logic.add_production(lhs, rhs):
+                    return False
+        self.logic.stats.count('incremental_deltas', sum(removed.values()) + sum(added.values()))
+        self._synced_grammar = (header, list(productions_list))
+        return True
+
+    def _compiled_cleanly(self, errors):
+        """ True si la gramática quedó cargada sin errores: solo entonces los deltas pueden
+            partir de ella (si no, el siguiente intento debe recompilar y volver a reportarlos)
+        """
+        return self.logic.has_grammar() and not any("Error" in e for e in errors)
+
     def _process_grammar_input(self):
         """ Recoge input de la UI y llama a logic.set_grammar """
         start_symbol = self.start_symbol_var.get()
@@ -190,12 +201,21 @@ class GrammarApp:
         non_terminals_str = self.non_terminals_var.get()
         productions_list = self._collect_productions()
 
+        # Cambios solo en producciones: aplicarlos sin volver a procesar todas las filas
+        # (los motores se reconstruyen al usarse)
+        header = (start_symbol.strip(), terminals_str.strip(), non_terminals_str.strip())
+        if self._sync_production_deltas(header, productions_list):
+            self._update_prefix_status()
+            return True
+
         # Limpiar resultados anteriores
         self.grammar_type_label.config(text="Tipo: Validando...", style="Result.TLabel")
         self.validation_result_label.config(text="Resultado: ...", style="Result.TLabel")
         self.master.update_idletasks()
 
         errors = self.logic.set_grammar(start_symbol, terminals_str, non_terminals_str, productions_list)
+        self._synced_grammar = (header, list(productions_list)) if self._compiled_cleanly(errors) else None
+        self._update_prefix_status()
 
         if errors:
             error_str = "\n".join(errors)
@@ -230,155 +250,294 @@ class GrammarApp:
             error_msg = grammar_type_result if grammar_type_result else "Error desconocido"
             self.grammar_type_label.config(text=f"Tipo: {error_msg}", style="Error.TLabel")
         else:
-            self.grammar_type_label.config(text=f"Tipo: {grammar_type_result}", style="Result.TLabel")
-
+            # LL(1), LALR(1) y simplificación en el hilo de trabajo: las tablas LALR pueden tardar
+            self.grammar_type_label.config(text=f"Tipo: {grammar_type_result} · Analizando...", style="Result.TLabel")
+            logic = self.logic
+
+            def job(cancel, report):
+                type_text = f"Tipo: {grammar_type_result}"
+                ll1 = logic.ll1
+                if ll1 is not None: # LL(1): se valida con el parser predictivo
+                     type_text += " · LL(1)" if ll1.is_ll1 else f" · No LL(1) ({len(ll1.conflicts)} conflictos)"
+                     if not ll1.is_ll1: # LALR(1): parser desplazamiento-reducción
+                          check_cancelled(cancel)
+                          lalr = logic.lalr
+                          type_text += " · LALR(1)" if lalr.is_lalr1 else f" · No LALR(1) ({len(lalr.conflicts)} conflictos)"
+                check_cancelled(cancel)
+                simplified = logic.simplification
+                if simplified is not None: # Resumen de lo que eliminó la simplificación
+                     summary = simplified.report
+                     type_text += (f"  (simplificada: -{summary['productions_removed']} producciones,"
+                                   f" -{summary['nonterminals_removed']} no terminales)")
+                return type_text
+
+            self._start_job('classify', job)
+
+    def _on_classification_done(self, type_text):
+        self.grammar_type_label.config(text=type_text, style="Result.TLabel")
+
+    def _on_classification_error(self, e, trace):
+        self.grammar_type_label.config(text=f"Tipo: {self.logic.grammar_type} · Error al analizar", style="Error.TLabel")
+        logger.error("Error inesperado al analizar la gramática:\n%s", trace)
+        messagebox.showerror("Error Inesperado", f"Ocurrió un error al analizar la gramática:\n{e}", parent=self.master)
+
+
+    def _update_prefix_status(self, *_):
+        """ Validación en vivo con la gramática ya compilada: la sesión Earley reutiliza las
+            columnas del texto anterior (escribir añade una, borrar quita solo la última)
+        """
+        if not self.logic.has_grammar():
+            self._prefix_session = None
+            self.prefix_status_label.config(text="", style="Result.TLabel")
+            return
+        parser = self.logic.parser
+        if self._prefix_session is None or self._prefix_session.engine is not parser:
+            self._prefix_session = self.logic.prefix_session() # La gramática cambió
+
+        session = self._prefix_session
+        text = self.string_to_validate_var.get()
+        if not session.sync(list(text)):
+            position = session.dead_at
+            if position is None: # Ni siquiera la cadena vacía tiene continuación
+                message = "En vivo: el lenguaje de la gramática es vacío"
+            else:
+                message = f"En vivo: no es prefijo válido (desde la posición {position + 1}, '{text[position]}')"
+            self.prefix_status_label.config(text=message, style="Error.TLabel")
+            return
+
+        # Como validate_string_action, la cadena completa lleva EPSILON al final
+        session.feed(EPSILON)
+        complete = session.accepts
+        session.pop()
+        expected = [t for t in session.expected() if t != EPSILON]
+        status = "En vivo: prefijo válido"
+        if complete:
+            status += " · la cadena PERTENECE"
+        if expected:
+            status += " · puede seguir: " + ", ".join(expected)
+        self.prefix_status_label.config(text=status, style="Success.TLabel" if complete else "Result.TLabel")
 
     def validate_string_action(self):
-        """ Acción botón Validar Cadena usando NLTK """
-        # 1. Asegurarse que la gramática esté procesada
-        if not self.logic.cfg or not self.logic.parser:
-            # Intentar procesarla ahora
-            if not self._process_grammar_input():
-                self.validation_result_label.config(text="Resultado: Corrija la gramática", style="Error.TLabel")
-                return
-            # Si _process_grammar_input fue OK, pero aún no hay parser (error NLTK interno)
-            if not self.logic.cfg or not self.logic.parser:
-                 self.validation_result_label.config(text="Resultado: Error interno procesando gramática", style="Error.TLabel")
-                 return
-
-        # 2. Validar la cadena
+        """ Acción botón Validar Cadena usando el parser Earley """
+        # 1. Asegurarse que la gramática esté procesada (y al día con las filas editadas)
+        if not self._process_grammar_input():
+            self.validation_result_label.config(text="Resultado: Corrija la gramática", style="Error.TLabel")
+            return
+        # Si _process_grammar_input fue OK, pero aún no hay parser (error NLTK interno)
+        if not self.logic.parser: # No construye el CFG de NLTK (es perezoso)
+             self.validation_result_label.config(text="Resultado: Error interno procesando gramática", style="Error.TLabel")
+             return
+
+        # 2. Validar la cadena en el hilo de trabajo
         input_string = self.string_to_validate_var.get()
         self.validation_result_label.config(text="Resultado: Validando...", style="Result.TLabel")
-        self.master.update_idletasks()
-
-        try:
-            belongs, parse_trees = self.logic.validate_string(input_string+EPSILON)
-            print(belongs)
-
-            if belongs:
-                self.validation_result_label.config(text=f"Resultado: Cadena '{input_string}' PERTENECE", style="Success.TLabel")
-                # Mostrar el primer árbol de derivación encontrado
-                if parse_trees:
-                     # Usar el método de formato de la lógica
-                     tree_output = self.logic.get_derivation_tree_string(parse_trees[0])
-                     # Mostrar en la ventana (adaptada)
-                     self.show_derivation_tree_window(input_string, tree_output, len(parse_trees))
-                else:
-                     # Esto no debería pasar si belongs es True, pero por si acaso
-                     messagebox.showwarning("Derivación", "La cadena pertenece, pero no se obtuvo árbol de parseo.", parent=self.master)
 
+        def job(cancel, report):
+            belongs, forest = self.logic.validate_string(input_string+EPSILON, cancel=cancel)
+            if not belongs or not forest:
+                return input_string, belongs, None, 0
+            # Contar también aquí: con entradas largas puede tardar (los árboles se
+            # construyen después, de uno en uno, en el visor)
+            return input_string, belongs, forest, forest.count(cancel)
+
+        self._start_job('validate', job)
+
+    def _on_validation_done(self, result):
+        input_string, belongs, forest, tree_count = result
+        if belongs:
+            self.validation_result_label.config(text=f"Resultado: Cadena '{input_string}' PERTENECE", style="Success.TLabel")
+            # Mostrar las derivaciones (el visor las construye bajo demanda)
+            if forest:
+                 self.show_derivation_tree_window(input_string, forest, tree_count)
             else:
-                 self.validation_result_label.config(text=f"Resultado: Cadena '{input_string}' NO PERTENECE", style="Error.TLabel")
+                 # Esto no debería pasar si belongs es True, pero por si acaso
+                 messagebox.showwarning("Derivación", "La cadena pertenece, pero no se obtuvo árbol de parseo.", parent=self.master)
+        else:
+             self.validation_result_label.config(text=f"Resultado: Cadena '{input_string}' NO PERTENECE", style="Error.TLabel")
 
-        except ValueError as e: # Errores de tokenización, etc.
+    def _on_validation_error(self, e, trace):
+        if isinstance(e, ValueError): # Errores de tokenización, etc.
              self.validation_result_label.config(text=f"Error validación: {e}", style="Error.TLabel")
-        except RuntimeError as e: # Errores inesperados del parser
-             self.validation_result_label.config(text=f"Error NLTK: {e}", style="Error.TLabel")
-             messagebox.showerror("Error NLTK", f"Ocurrió un error en el parser NLTK:\n{e}", parent=self.master)
-        except Exception as e:
+        elif isinstance(e, RuntimeError): # Errores inesperados del parser
+             self.validation_result_label.config(text=f"Error del parser: {e}", style="Error.TLabel")
+             messagebox.showerror("Error del Parser", f"Ocurrió un error en el parser Earley:\n{e}", parent=self.master)
+        else:
              self.validation_result_label.config(text=f"Error inesperado: {e}", style="Error.TLabel")
-             import traceback
-             traceback.print_exc()
+             logger.error("Error inesperado al validar:\n%s", trace)
              messagebox.showerror("Error Inesperado", f"Ocurrió un error:\n{e}", parent=self.master)
 
 
-    def show_derivation_tree_window(self, input_string, tree_output, tree_count):
-        """ Muestra el árbol de derivación (parse tree) de NLTK en texto. 
-            Ejemplo de formato (aaa): [Tree('S', ['a', Tree('S', ['a', Tree('S', ['a', Tree('S', ['ε'])])])])]
+    def show_derivation_tree_window(self, input_string, forest, tree_count):
+        """ Abre el visor de derivaciones: nodos expandibles bajo demanda y paginación
+            entre derivaciones alternativas (gramáticas ambiguas)
         """
-        deriv_win = tk.Toplevel(self.master)
-        title = f"Árbol de Derivación para: '{input_string}'"
-
-        if tree_count > 1:
-            title += f" (1 de {tree_count} encontrados - Gramática Ambigua)"
-        deriv_win.title(title)
-        deriv_win.geometry("500x350") # Ajustar tamaño si es necesario
-
-        frame = ttk.Frame(deriv_win, padding="10")
-        frame.pack(expand=True, fill=tk.BOTH)
-
-        lbl = ttk.Label(frame, text=f"Árbol de Derivación para '{input_string}':", font=('Helvetica', 11, 'bold'))
-        lbl.pack(pady=(0, 5))
-
-        text_area = scrolledtext.ScrolledText(frame, wrap=tk.NONE, font=('Courier New', 10), height=15) # wrap=NONE para árboles
-        text_area.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
-
-        text_area.insert(tk.END, tree_output)
-        text_area.config(state=tk.DISABLED)
-
-        close_button = ttk.Button(frame, text="Cerrar", command=deriv_win.destroy)
-        close_button.pack(pady=(10, 0))
-
-        deriv_win.grab_set()
-        deriv_win.transient(self.master)
-        self.master.wait_window(deriv_win)
+        return DerivationViewer(self.master, input_string, forest, tree_count)
 
 
     def generate_strings_action(self):
         """ Acción botón Generar Cadenas usando NLTK """
-        # 1. Asegurarse que la gramática esté procesada
-        if not self.logic.cfg:
-            if not self._process_grammar_input():
-                self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
-                self.generated_strings_text.insert(tk.END, "Corrija la gramática primero."); self.generated_strings_text.config(state=tk.DISABLED)
-                self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
-                return
-            if not self.logic.cfg:
-                 self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
-                 self.generated_strings_text.insert(tk.END, "Error interno procesando gramática."); self.generated_strings_text.config(state=tk.DISABLED)
-                 self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
-                 return
-
-        # 2. Obtener parámetros N y Profundidad
+        # 1. Asegurarse que la gramática esté procesada (y al día con las filas editadas)
+        if not self._process_grammar_input():
+            self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
+            self.generated_strings_text.insert(tk.END, "Corrija la gramática primero."); self.generated_strings_text.config(state=tk.DISABLED)
+            self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
+            return
+        if not self.logic.has_grammar():
+             self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
+             self.generated_strings_text.insert(tk.END, "Error interno procesando gramática."); self.generated_strings_text.config(state=tk.DISABLED)
+             self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
+             return
+
+        # 2. Obtener parámetros N y Longitud
         try:
             n_str = self.generation_n_var.get()
             n = int(n_str)
-            depth_str = self.generation_depth_var.get()
-            depth = int(depth_str)
-            if n <= 0 or depth <= 0: raise ValueError("N y Profundidad deben ser > 0.")
+            length_str = self.generation_length_var.get()
+            max_length = int(length_str)
+            if n <= 0 or max_length < 0: raise ValueError("N debe ser > 0 y Longitud >= 0.")
         except ValueError:
-             messagebox.showerror("Error Parámetros", "Max Cadenas (N) y Max Profundidad deben ser enteros positivos.", parent=self.master)
+             messagebox.showerror("Error Parámetros", "Max Cadenas (N) debe ser un entero positivo y Max Longitud un entero no negativo.", parent=self.master)
              return
 
-        # 3. Generar
+        # 3. Generar en el hilo de trabajo; las cadenas llegan por lotes a medida que salen
         self.generated_strings_text.config(state=tk.NORMAL)
         self.generated_strings_text.delete(1.0, tk.END)
-        self.generated_strings_text.insert(tk.END, "Generando...")
         self.generated_strings_text.config(state=tk.DISABLED)
         self.generation_count_label.config(text="Generadas: Calculando...", style="Result.TLabel")
-        self.master.update_idletasks()
+        self._generated_count = 0
 
-        try:
-             # Actualizar MAX_GENERATED_STRINGS si se cambió en la UI
-             # (Nota: NLTK generate() tiene su propio parámetro 'n' para límite de *intentos*)
-             global MAX_GENERATED_STRINGS
-             MAX_GENERATED_STRINGS = n # Usar valor de la UI
-
-             generated = self.logic.generate_random_strings(n=n, max_depth=depth)
-
-             self.generated_strings_text.config(state=tk.NORMAL)
-             self.generated_strings_text.delete(1.0, tk.END)
-             if generated:
-                 self.generated_strings_text.insert(tk.END, "\n".join(generated))
-                 self.generation_count_label.config(text=f"Generadas: {len(generated)}", style="Result.TLabel")
-             else:
-                  self.generated_strings_text.insert(tk.END, "(Ninguna encontrada con los límites dados)")
-                  self.generation_count_label.config(text="Generadas: 0", style="Result.TLabel")
-             self.generated_strings_text.config(state=tk.DISABLED)
-
-        except ValueError as e: # Error en lógica de generación
-             self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
+        def job(cancel, report):
+            batch = []
+            last_report = time.monotonic()
+            try:
+                # Las n primeras cadenas en orden de longitud (la vacía se muestra como ε)
+                for index, string in enumerate(self.logic.iter_strings(max_length=max_length, cancel=cancel)):
+                    if index >= n:
+                        break
+                    check_cancelled(cancel)
+                    batch.append(string or EPSILON)
+                    if time.monotonic() - last_report > 0.1: # Enviar lo generado ~10 veces por segundo
+                        report(batch)
+                        batch = []
+                        last_report = time.monotonic()
+            finally:
+                report(batch) # También lo generado antes de cancelar
+
+        self._start_job('generate', job)
+
+    def _on_generation_progress(self, batch):
+        if not batch:
+            return
+        self.generated_strings_text.config(state=tk.NORMAL)
+        if self._generated_count:
+            self.generated_strings_text.insert(tk.END, "\n")
+        self.generated_strings_text.insert(tk.END, "\n".join(batch))
+        self.generated_strings_text.config(state=tk.DISABLED)
+        self._generated_count += len(batch)
+
+    def _on_generation_done(self, result):
+        if self._generated_count:
+            self.generation_count_label.config(text=f"Generadas: {self._generated_count}", style="Result.TLabel")
+        else:
+            self.generated_strings_text.config(state=tk.NORMAL)
+            self.generated_strings_text.insert(tk.END, "(Ninguna encontrada con los límites dados)")
+            self.generated_strings_text.config(state=tk.DISABLED)
+            self.generation_count_label.config(text="Generadas: 0", style="Result.TLabel")
+
+    def _on_generation_error(self, e, trace):
+        self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
+        self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
+        if isinstance(e, ValueError): # Error en lógica de generación
              self.generated_strings_text.insert(tk.END, f"Error: {e}"); self.generated_strings_text.config(state=tk.DISABLED)
-             self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
-        except Exception as e:
-             self.generated_strings_text.config(state=tk.NORMAL); self.generated_strings_text.delete(1.0, tk.END)
+        else:
              self.generated_strings_text.insert(tk.END, f"Error inesperado: {e}"); self.generated_strings_text.config(state=tk.DISABLED)
-             self.generation_count_label.config(text="Generadas: Error", style="Error.TLabel")
-             import traceback
-             traceback.print_exc()
+             logger.error("Error inesperado al generar:\n%s", trace)
              messagebox.showerror("Error de Generación", f"Ocurrió un error inesperado:\n{e}", parent=self.master)
 
 
+    # --- Trabajo en segundo plano (un solo trabajo a la vez) ---
+
+    def _start_job(self, kind, job):
+        """ Ejecuta job(cancel, report) en el hilo de trabajo. report(datos) envía progreso
+            al hilo de Tk; el resultado o la excepción llegan por la misma cola.
+        """
+        cancel = threading.Event()
+        self._job = (kind, cancel, time.monotonic())
+        self._set_job_controls(running=True)
+
+        def run():
+            report = lambda data: self._job_queue.put(('progress', kind, data))
+            try:
+                self._job_queue.put(('done', kind, job(cancel, report)))
+            except OperationCancelled:
+                self._job_queue.put(('cancelled', kind, None))
+            except Exception as e:
+                self._job_queue.put(('error', kind, (e, traceback.format_exc())))
+
+        self._executor.submit(run)
+        self.master.after(50, self._poll_job_queue)
+
+    def _poll_job_queue(self):
+        """ Procesa los mensajes del hilo de trabajo (se reprograma con after mientras haya trabajo) """
+        while True:
+            try:
+                event, kind, data = self._job_queue.get_nowait()
+            except queue.Empty:
+                break
+            if event == 'progress':
+                if kind == 'generate':
+                    self._on_generation_progress(data)
+                continue
+            self._job = None
+            self._set_job_controls(running=False)
+            handlers = {'validate': (self._on_validation_done, self._on_validation_error),
+                        'generate': (self._on_generation_done, self._on_generation_error),
+                        'classify': (self._on_classification_done, self._on_classification_error)}
+            if event == 'done':
+                handlers[kind][0](data)
+            elif event == 'cancelled':
+                if kind == 'validate':
+                    self.validation_result_label.config(text="Resultado: Validación cancelada", style="Error.TLabel")
+                elif kind == 'generate':
+                    self.generation_count_label.config(text=f"Generadas: {self._generated_count} (cancelado)", style="Error.TLabel")
+                else:
+                    self.grammar_type_label.config(text=f"Tipo: {self.logic.grammar_type} · Análisis cancelado", style="Error.TLabel")
+            else:
+                handlers[kind][1](*data)
+
+        if self._job is not None:
+            kind, cancel, started = self._job
+            elapsed = time.monotonic() - started
+            state = "Cancelando" if cancel.is_set() else "Calculando"
+            if kind == 'validate':
+                self.validation_result_label.config(text=f"Resultado: Validando... ({elapsed:.1f} s)", style="Result.TLabel")
+            elif kind == 'generate':
+                self.generation_count_label.config(text=f"Generadas: {self._generated_count} ({state}... {elapsed:.1f} s)", style="Result.TLabel")
+            else:
+                self.grammar_type_label.config(text=f"Tipo: {self.logic.grammar_type} · Analizando... ({elapsed:.1f} s)", style="Result.TLabel")
+            self.master.after(100, self._poll_job_queue)
+
+    def _set_job_controls(self, running):
+        """ Mientras hay un trabajo solo se puede cancelar (la lógica no es segura entre hilos) """
+        action_state = tk.DISABLED if running else tk.NORMAL
+        for button in (self.validate_type_button, self.validate_string_button, self.generate_strings_button,
+                       self.load_grammar_button, self.save_grammar_button, self.simplify_check):
+            button.config(state=action_state)
+        cancel_state = tk.NORMAL if running else tk.DISABLED
+        self.cancel_validation_button.config(state=cancel_state)
+        self.cancel_generation_button.config(state=cancel_state)
+
+    def cancel_job(self):
+        """ Acción botón Cancelar: el trabajo se detiene en su siguiente punto de control """
+        if self._job is not None:
+            self._job[1].set()
+
+    def _on_close(self):
+        self.cancel_job()
+        self._executor.shutdown(wait=False)
+        self.master.destroy()
+
+
     def save_grammar_action(self):
         """ Guarda la gramática en formato string compatible con NLTK CFG. """
         # Re-procesar la gramática actual para asegurar que logic.grammar_str esté actualizado
@@ -423,87 +582,23 @@ class GrammarApp:
         if not file_path: return
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Extraer S, T, NT de comentarios (si existen) y producciones
-            start_symbol = ""
-            terminals = ""
-            non_terminals = ""
-            production_lines = []
-
-            for line in lines:
-                line = line.strip()
-                if not line: continue
-
-                if line.startswith("# Start Symbol:"):
-                    start_symbol = line.split(":", 1)[1].strip()
-                elif line.startswith("# Terminals:"):
-                    terminals = line.split(":", 1)[1].strip()
-                elif line.startswith("# NonTerminals:"):
-                     non_terminals = line.split(":", 1)[1].strip()
-                elif line == "# --- Productions ---":
-                     in_productions = True
-                elif line.startswith("#"):
-                     continue # Ignorar otros comentarios
-                elif '->' in line: # Asumir que es una línea de producción
-                     production_lines.append(line)
-                # Si no empieza con # y no tiene ->, podría ser un error o parte de una gramática multilínea simple
-                # Para simplificar, solo cargamos líneas con -> como producciones ahora
-
-            if not production_lines:
-                 raise ValueError("No se encontraron líneas de producción (con '->') en el archivo.")
-
-            # Intentar parsear con NLTK para obtener S, T, NT si no estaban en comentarios
-            temp_cfg_str = "\n".join(production_lines)
-            try:
-                 temp_cfg = CFG.fromstring(temp_cfg_str)
-                 # Si S, T, NT no se leyeron de comentarios, inferirlos de NLTK
-                 if not start_symbol: start_symbol = str(temp_cfg.start())
-                 # Inferir T y NT puede ser menos preciso que leerlos del comentario
-                 # Pero es mejor que nada si los comentarios no están
-                 if not terminals:
-                      # Obtener todos los símbolos RHS que son strings
-                      inferred_terminals = set()
-                      for p in temp_cfg.productions():
-                           for sym in p.rhs():
-                                if isinstance(sym, str): inferred_terminals.add(sym)
-                      terminals = ",".join(sorted(list(inferred_terminals)))
-                 if not non_terminals:
-                       inferred_non_terminals = {str(nt) for nt in temp_cfg.nonterminals()}
-                       non_terminals = ",".join(sorted(list(inferred_non_terminals)))
-
-            except Exception as parse_error:
-                 raise ValueError(f"Error al pre-parsear producciones con NLTK: {parse_error}")
-
-
-            # Actualizar UI
+            # Lectura en una pasada: S, T, NT de los comentarios (o inferidos) y producciones ya tokenizadas
+            parsed = load_grammar_file(file_path)
+            start_symbol, terminals, non_terminals, productions = parsed.spec()
+
+            # Actualizar UI (el editor se rellena de una vez y se dibuja una sola vez)
             self.start_symbol_var.set(start_symbol)
             self.terminals_var.set(terminals)
             self.non_terminals_var.set(non_terminals)
+            self.production_editor.set_rows(productions or [("", "")])
 
-            self.clear_production_rows()
-
-            # Añadir producciones a la UI (parseando desde las líneas cargadas)
-            if not production_lines:
-                 self.add_production_row()
-            else:
-                 for prod_line in production_lines:
-                      parts = prod_line.split("->")
-                      if len(parts) == 2:
-                           lhs = parts[0].strip()
-                           rhs_str_nltk = parts[1].strip()
-                           # Convertir de formato NLTK (ej 'a' B 'c') a formato UI (ej aBc)
-                           rhs_ui = rhs_str_nltk.replace("'", "") # Quitar comillas de terminales
-                           rhs_ui = rhs_ui.replace(" ", "") # Quitar espacios entre símbolos
-                           
-                           self.add_production_row()
-                           new_row = self.production_rows_widgets[-1]
-                           new_row['lhs'].insert(0, lhs)
-                           new_row['rhs'].insert(0, rhs_ui)
-                      else:
-                           print(f"WARN: Ignorando línea de producción mal formada: {prod_line}")
-
+            # Compilar directamente desde lo leído; validar después no vuelve a compilar
+            errors = self.logic.load_parsed_grammar(parsed)
+            header = (start_symbol.strip(), terminals.strip(), non_terminals.strip())
+            self._synced_grammar = (header, productions) if self._compiled_cleanly(errors) else None
+            self._update_prefix_status()
+            if errors:
+                messagebox.showwarning("Cargar Gramática", "\n".join(errors), parent=self.master)
 
             # Limpiar resultados
             self.grammar_type_label.config(text="Tipo: (Presione validar)", style="Result.TLabel")
@@ -518,7 +613,6 @@ class GrammarApp:
         except ValueError as e:
              messagebox.showerror("Error al Cargar", f"Error en el formato del archivo:\n{e}", parent=self.master)
         except Exception as e:
+            logger.exception("Error inesperado al cargar %s", file_path)
             messagebox.showerror("Error Inesperado", f"Ocurrió un error al cargar:\n{e}", parent=self.master)
-            import traceback
-            traceback.print_exc()
 
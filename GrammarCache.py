@@ -0,0 +1,214 @@
+# GrammarCache.py
+# Caché en disco de gramáticas compiladas, indexada por un hash del contenido.
+# Cada entrada es un pickle con el estado de GrammarLogicNLTK tras set_grammar
+# (CFG, parser Earley, AFD, tipo...). El tamaño total está acotado y se expulsan
+# primero las entradas usadas hace más tiempo (LRU según la fecha de modificación).
+# Las entradas "-rows" son alias: la huella de las filas de set_grammar sin tokenizar
+# (rows_fingerprint) -> la huella de la gramática tokenizada (grammar_fingerprint).
+# Nota: los pickles se cargan tal cual, así que el directorio debe ser del propio usuario.
+# ValidationResultCache es la caché en memoria de resultados de validación (LRU acotada).
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+CACHE_FORMAT_VERSION = 7 # Subir si cambia el estado compilado (invalida entradas viejas)
+
+
+def grammar_fingerprint(start_symbol, terminals, non_terminals, productions):
+    """ Hash estable de la gramática tokenizada: S, conjuntos T/NT (nombres) y producciones
+        (lhs, rhs) con la convención de NLTK. Cada símbolo del lado derecho se guarda por
+        separado y con su clase, así 'S -> A B' y 'S -> AB' no comparten huella.
+        No depende del orden de las producciones (ver combine_fingerprint).
+    """
+    production_sum = sum(production_digest(lhs, rhs) for lhs, rhs in productions)
+    return combine_fingerprint(start_symbol, terminals, non_terminals, production_sum)
+
+
+def production_digest(lhs, rhs):
+    """ Hash de una producción tokenizada como entero de 256 bits """
+    data = json.dumps([lhs.symbol(), [["t", sym] if isinstance(sym, str) else ["n", sym.symbol()] for sym in rhs]],
+                      ensure_ascii=False, separators=(',', ':'))
+    return int.from_bytes(hashlib.sha256(data.encode('utf-8')).digest(), 'big')
+
+
+def combine_fingerprint(start_symbol, terminals, non_terminals, production_sum):
+    """ Huella a partir de la suma de production_digest de las producciones (con repeticiones).
+        Como la suma no depende del orden, un delta la actualiza sumando o restando el hash
+        de la producción que cambia, sin recorrer las demás.
+    """
+    normalized = {
+        "version": CACHE_FORMAT_VERSION,
+        "start": start_symbol,
+        "terminals": sorted(set(terminals)),
+        "non_terminals": sorted(set(non_terminals)),
+        "productions": format(production_sum % (1 << 256), '064x'),
+    }
+    data = json.dumps(normalized, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def rows_fingerprint(start_symbol, terminals, non_terminals, rows):
+    """ Hash de la entrada de set_grammar sin tokenizar: S, conjuntos T/NT y filas (lhs, rhs)
+        de texto tal como se segmentarían (sin espacios alrededor, sin filas vacías). Las
+        mismas filas con los mismos T/NT dan siempre la misma gramática tokenizada, así que
+        sirve de alias de su grammar_fingerprint para la carga en caliente.
+    """
+    normalized = {
+        "version": CACHE_FORMAT_VERSION,
+        "kind": "rows",
+        "start": start_symbol.strip(),
+        "terminals": sorted({t.strip() for t in terminals if t.strip()}),
+        "non_terminals": sorted({nt.strip() for nt in non_terminals if nt.strip()}),
+        "rows": [[lhs.strip(), rhs.strip()] for lhs, rhs in rows if lhs.strip() or rhs.strip()],
+    }
+    data = json.dumps(normalized, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class CompiledGrammarCache:
+    """ Almacén en disco de tamaño acotado con expulsión LRU """
+
+    SUFFIX = ".grammar.pkl"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0      # Entradas ilegibles descartadas
+        self.write_errors = 0   # Escrituras fallidas (la caché sigue funcionando sin ellas)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """ Devuelve el estado guardado o None. Un acierto renueva su posición LRU """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            os.utime(path) # Marcar como usada recientemente
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # Entrada corrupta o de una versión incompatible: se descarta
+            self._remove(path)
+            self.discarded += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return state
+
+    def put(self, key, state):
+        """ Guarda el estado (escritura atómica) y aplica el límite de tamaño """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            self.write_errors += 1
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries): # Más antiguas primero
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ValidationResultCache:
+    """ Resultados de validación en memoria, indexados por (huella de la gramática, cadena).
+        Acotada en entradas y en bytes (estimados): se expulsan primero las menos usadas.
+        max_entries = 0 la desactiva. Es segura entre hilos (un lock protege cada operación).
+    """
+
+    ENTRY_OVERHEAD = 200 # Bytes aproximados de la entrada (clave, tupla, nodo del OrderedDict)
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # clave -> (valor, bytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """ Devuelve el valor guardado o None. Un acierto lo marca como el más reciente """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        """ Guarda value (size = bytes estimados) y expulsa las entradas más antiguas
+            hasta volver a los límites. Lo que no cabe ni solo no se guarda.
+        """
+        size += self.ENTRY_OVERHEAD
+        if not self.max_entries or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self):
+        """ Vacía la caché (la gramática cambió) """
+        with self._lock:
+            if self._entries:
+                self._entries.clear()
+                self.bytes = 0
+                self.invalidations += 1
+
+    def snapshot(self):
+        """ Estado y contadores como dict serializable (para dimensionarla) """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._entries), "bytes": self.bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions, "invalidations": self.invalidations}
@@ -0,0 +1,134 @@
+# GrammarIO.py
+# Lectura de gramáticas en el formato .cfg que escribe GrammarApp.save_grammar_action:
+#   # Start Symbol: S
+#   # Terminals: a,b
+#   # NonTerminals: S,A
+#   # --- Productions ---
+#   S -> 'a' A
+#   A ->
+# No depende de tkinter (se usa también desde la línea de comandos).
+# El archivo se lee en una sola pasada, línea a línea: cada producción se tokeniza una vez
+# (terminales entre comillas, no terminales sin ellas) y los símbolos quedan clasificados,
+# así que GrammarLogicNLTK.load_parsed_grammar no necesita volver a segmentar ni a parsear texto.
+
+import re
+
+from nltk import Nonterminal
+
+from GrammarCache import grammar_fingerprint
+
+# Terminal entre comillas simples o dobles, separador de alternativas o símbolo sin comillas
+_TOKEN = re.compile(r"'([^']*)'|\"([^\"]*)\"|(\|)|([^\s'\"|]+)")
+
+
+class ParsedGrammar:
+    """ Gramática leída de un archivo: símbolos declarados (o inferidos) y producciones
+        como pares (lhs, rhs) con la convención de NLTK (terminales = str, no terminales =
+        Nonterminal). Los no terminales se internan: un solo objeto por nombre.
+    """
+
+    def __init__(self, start_symbol, terminals, non_terminals, productions, used_terminals=(), used_non_terminals=()):
+        self.start_symbol = start_symbol    # str
+        self.terminals = terminals          # [str] declarados (o inferidos)
+        self.non_terminals = non_terminals  # [str] declarados (o inferidos)
+        self.productions = productions      # [(Nonterminal, (símbolo, ...))]
+        self.used_terminals = set(used_terminals)          # Los que aparecen en las producciones
+        self.used_non_terminals = set(used_non_terminals)
+
+    def rows(self):
+        """ Producciones en el formato de la UI: (lhs, rhs concatenado), ej. ('S', 'aSb') """
+        return [(lhs.symbol(), "".join(sym if isinstance(sym, str) else sym.symbol() for sym in rhs))
+                for lhs, rhs in self.productions]
+
+    def fingerprint(self):
+        """ Huella de la gramática tokenizada (clave de las cachés y del registro del servidor) """
+        return grammar_fingerprint(self.start_symbol, self.terminals, self.non_terminals, self.productions)
+
+    def spec(self):
+        """ Argumentos de GrammarLogicNLTK.set_grammar (S, T, NT, filas de la UI) """
+        return self.start_symbol, ",".join(self.terminals), ",".join(self.non_terminals), self.rows()
+
+
+def read_grammar_stream(lines):
+    """ Lee el formato .cfg en una pasada. Devuelve un ParsedGrammar.
+        Si faltan S, T o NT en los comentarios se infieren al vuelo: S es el lado izquierdo
+        de la primera producción, T los símbolos entre comillas y NT los demás.
+        Admite alternativas con '|' en una misma línea.
+    """
+    start_symbol = terminals = non_terminals = None
+    seen_terminals = {}     # dict como conjunto ordenado
+    seen_non_terminals = {}
+    interned = {}           # nombre -> Nonterminal
+    productions = []
+
+    def nonterminal(name):
+        nt = interned.get(name)
+        if nt is None:
+            nt = interned[name] = Nonterminal(name)
+            seen_non_terminals[name] = None
+        return nt
+
+    for line in lines:
+        line = line.strip()
+        if not line: continue
+
+        if line.startswith("#"):
+            if line.startswith("# Start Symbol:"):
+                start_symbol = line.split(":", 1)[1].strip()
+            elif line.startswith("# Terminals:"):
+                terminals = [t.strip() for t in line.split(":", 1)[1].split(',') if t.strip()]
+            elif line.startswith("# NonTerminals:"):
+                non_terminals = [nt.strip() for nt in line.split(":", 1)[1].split(',') if nt.strip()]
+            continue # Ignorar otros comentarios
+        if '->' not in line:
+            continue
+
+        lhs_text, _, rhs_text = line.partition("->")
+        lhs_text = lhs_text.strip()
+        if not lhs_text or '->' in rhs_text or ' ' in lhs_text:
+            raise ValueError(f"Línea de producción mal formada: {line}")
+        lhs = nonterminal(lhs_text)
+
+        rhs = []
+        for quoted, double_quoted, bar, bare in _TOKEN.findall(rhs_text):
+            if bar:
+                productions.append((lhs, tuple(rhs)))
+                rhs = []
+            elif bare:
+                rhs.append(nonterminal(bare))
+            else:
+                terminal = quoted or double_quoted
+                seen_terminals[terminal] = None
+                rhs.append(terminal)
+        productions.append((lhs, tuple(rhs)))
+
+    if not productions:
+        raise ValueError("No se encontraron líneas de producción (con '->') en el archivo.")
+
+    if not start_symbol:
+        start_symbol = productions[0][0].symbol()
+    if terminals is None:
+        terminals = sorted(seen_terminals)
+    if non_terminals is None:
+        non_terminals = sorted(seen_non_terminals)
+    return ParsedGrammar(start_symbol, terminals, non_terminals, productions, seen_terminals, seen_non_terminals)
+
+
+def parse_grammar_lines(lines):
+    """ Devuelve (símbolo inicial, terminales, no terminales, producciones) en el formato
+        que espera GrammarLogicNLTK.set_grammar: strings separados por comas y una lista
+        de pares (lhs, rhs) con el RHS escrito como en la UI (ej. 'a' B 'c' -> aBc).
+    """
+    return read_grammar_stream(lines).spec()
+
+
+def read_grammar_file(file_path):
+    """ Lee un archivo .cfg/.txt y devuelve lo mismo que parse_grammar_lines """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return parse_grammar_lines(f)
+
+
+def load_grammar_file(file_path):
+    """ Lee un archivo .cfg/.txt y devuelve un ParsedGrammar (para load_parsed_grammar) """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return read_grammar_stream(f)
@@ -1,35 +1,259 @@
 # GrammarLogic.py (Reescrito con NLTK)
 
 from nltk import CFG, Nonterminal, Production
-from nltk.parse import EarleyChartParser # Parser robusto para CFG
 from nltk.parse.generate import generate # Para generar cadenas
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
 import random
-import io # Para capturar la salida de pretty_print
+import sys
+import warnings
+
+from RegularEngine import RegularAutomaton # AFD mínimo para gramáticas Tipo 3
+from EarleyEngine import EarleyEngine # Parser Earley propio sobre enteros (reemplaza al de NLTK)
+from GrammarAnalysis import ProductionIndex # Anulables y productivos que se actualizan por delta
+from GrammarCache import grammar_fingerprint, rows_fingerprint, production_digest, combine_fingerprint, ValidationResultCache # Hashes de la gramática y caché de resultados
+from GrammarIO import ParsedGrammar # Gramática ya tokenizada (archivos, registro del servidor, workers)
+from SymbolTrie import SymbolTrie # Segmentación del lado derecho en símbolos definidos
+from Cancellation import OperationCancelled
+from Instrumentation import Instrumentation # Temporizadores por fase y contadores
 
 # Mantener la constante EPSILON si se usa en otros lugares,
 # pero NLTK usará '' internamente para producciones vacías.
-from Constants import EPSILON, MAX_GENERATED_STRINGS
+from Constants import EPSILON, MAX_GENERATED_STRINGS, VALIDATION_CACHE_MAX_ENTRIES, VALIDATION_CACHE_MAX_BYTES
+
+REGULAR_TYPE = "Regular (Tipo 3)"
+CONTEXT_FREE_TYPE = "Libre de Contexto (Tipo 2)"
 
 class GrammarLogicNLTK:
-    def __init__(self):
+    # Atributos que forman la gramática compilada (lo que se guarda en la caché en disco)
+    _COMPILED_STATE = ('grammar_str', 'cfg', 'terminals', 'non_terminals', 'start_symbol',
+                       'grammar_type', 'parser', 'dfa', '_productions_parsed',
+                       '_productions', '_non_regular_count', 'simplification', 'll1')
+
+    def __init__(self, cache=None, simplify=False, stats=None,
+                 result_cache_entries=VALIDATION_CACHE_MAX_ENTRIES, result_cache_bytes=VALIDATION_CACHE_MAX_BYTES):
+        self.stats = stats or Instrumentation() # Métricas (desactivadas por defecto: coste nulo)
+        # Resultados de validate_string por (huella, cadena); se vacía al cambiar la gramática
+        self.result_cache = ValidationResultCache(result_cache_entries, result_cache_bytes)
+        self._derived = {}          # cfg, grammar_str, parser, dfa, batch_dfa, simplification, ll1, lalr (y lalr_cached): se reconstruyen bajo demanda
+        self.simplify = simplify    # Simplificar la gramática antes de construir el parser
+        self.cache = cache          # CompiledGrammarCache opcional (None = sin caché)
+        self.fingerprint = None     # Hash de la gramática actual (clave de caché)
         self.grammar_str = None     # String de definición de la gramática para NLTK
         self.cfg = None             # Objeto CFG de NLTK
         self.terminals = set()      # Set de terminales definidos
         self.non_terminals = set()  # Set de no terminales definidos
         self.start_symbol = None    # Símbolo inicial (como objeto Nonterminal de NLTK)
         self.grammar_type = None    # 'Type 3', 'Type 2', 'Error', None
-        self.parser = None          # Instancia del parser de NLTK
+        self.parser = None          # Instancia del parser Earley (EarleyEngine)
+        self.dfa = None             # AFD mínimo (solo si la gramática es Tipo 3)
+        self.ll1 = None             # Tabla LL(1) y parser predictivo (LL1Parser, haya o no conflictos)
+        # self.lalr: tablas LALR(1) (LALR1Parser); propiedad perezosa que usa la caché en disco
+        self.cyk = None             # Reconocedor CYK sobre la FNC (se construye al usarlo)
+        self.sampler = None         # Muestreador uniforme por longitud (se construye al usarlo)
+        self.enumerator = None      # Enumerador por longitud con memoización (se construye al usarlo)
+        self._symbol_trie = None    # Trie de T ∪ NT para segmentar lados derechos
+        self._clear_indexes()
 
     def clear(self):
         """ Limpia la gramática actual """
-        self.grammar_str = None
-        self.cfg = None
+        self._derived = {} # cfg, grammar_str, parser, dfa, ll1...: None mientras no haya producciones
+        self.result_cache.invalidate()
+        self._clear_indexes()
         self.terminals = set()
         self.non_terminals = set()
         self.start_symbol = None
         self.grammar_type = None
-        self.parser = None
+        self.cyk = None
+        self.sampler = None
+        self.enumerator = None
+        self._symbol_trie = None
+        self.fingerprint = None
+
+    # --- Estructuras derivadas de las producciones (un delta las descarta, salvo el parser Earley) ---
+
+    def _get_derived(self, name, builder):
+        if name not in self._derived:
+            self._derived[name] = builder() if self._productions is not None else None
+        return self._derived[name]
+
+    @property
+    def cfg(self):
+        """ Objeto CFG de NLTK """
+        return self._get_derived('cfg', lambda: CFG(self.start_symbol, list(self._productions)))
+
+    @cfg.setter
+    def cfg(self, value):
+        self._derived['cfg'] = value
+
+    @property
+    def grammar_str(self):
+        """ String de definición de la gramática para NLTK """
+        return self._get_derived('grammar_str', lambda: "\n".join(self._production_line(p) for p in self._productions))
+
+    @grammar_str.setter
+    def grammar_str(self, value):
+        self._derived['grammar_str'] = value
+
+    @property
+    def parser(self):
+        """ Instancia del parser Earley (EarleyEngine) """
+        return self._get_derived('parser', self._build_parser)
+
+    @parser.setter
+    def parser(self, value):
+        self._derived['parser'] = value
+
+    @property
+    def simplification(self):
+        """ SimplifiedGrammar usada por el parser (None si simplify está desactivado) """
+        return self._get_derived('simplification', self._build_simplification)
+
+    @simplification.setter
+    def simplification(self, value):
+        self._derived['simplification'] = value
+
+    def _build_simplification(self):
+        if not self.simplify:
+            return None
+        from GrammarSimplifier import simplify
+        with self.stats.phase('simplify'):
+            return simplify(self.start_symbol, [(p.lhs(), p.rhs()) for p in self._productions])
+
+    def _build_parser(self):
+        """ Parser Earley sobre la gramática (simplificada si simplify está activo) """
+        simplified = self.simplification
+        with self.stats.phase('parser_build'):
+            if simplified is not None:
+                return EarleyEngine(simplified.start, simplified.productions)
+            return EarleyEngine(self.start_symbol, [(p.lhs(), p.rhs()) for p in self._productions])
+
+    @property
+    def dfa(self):
+        """ AFD mínimo (solo si la gramática es Tipo 3) """
+        return self._get_derived('dfa', self._build_regular_engine)
+
+    @dfa.setter
+    def dfa(self, value):
+        self._derived['dfa'] = value
+
+    @property
+    def batch_dfa(self):
+        """ BatchDFARunner: el AFD como tabla NumPy por bytes (solo Tipo 3, se construye al usarlo) """
+        return self._get_derived('batch_dfa', self._build_batch_dfa)
+
+    def _build_batch_dfa(self):
+        if self.dfa is None:
+            return None
+        from BatchDFAEngine import BatchDFARunner # NumPy solo se necesita para este motor
+        with self.stats.phase('batch_dfa_build'):
+            return BatchDFARunner(self.dfa)
+
+    @property
+    def ll1(self):
+        """ LL1Parser sobre la gramática que usa el parser (FIRST/FOLLOW, tabla y conflictos) """
+        return self._get_derived('ll1', self._build_ll1_parser)
+
+    @ll1.setter
+    def ll1(self, value):
+        self._derived['ll1'] = value
+
+    def _build_ll1_parser(self):
+        from LLParser import LL1Parser
+        simplified = self.simplification
+        with self.stats.phase('ll1_build'):
+            if simplified is not None:
+                return LL1Parser(simplified.start, simplified.productions)
+            return LL1Parser(self.start_symbol, [(p.lhs(), p.rhs()) for p in self._productions])
+
+    def is_ll1(self):
+        """ True si la gramática (la que se parsea) es LL(1) """
+        return self.ll1 is not None and self.ll1.is_ll1
+
+    @property
+    def lalr(self):
+        """ LALR1Parser sobre la gramática que usa el parser (tablas acción/goto y conflictos) """
+        return self._get_derived('lalr', self._build_lalr_parser)
+
+    @lalr.setter
+    def lalr(self, value):
+        self._derived['lalr'] = value
+
+    def _build_lalr_parser(self):
+        """ Construye las tablas LALR(1), o las recupera de la caché en disco si ya se
+            construyeron para esta gramática en otra ejecución
+        """
+        cached = self._get_derived('lalr_cached', self._cached_lalr_parser)
+        if cached is not None:
+            return cached
+
+        from LALRParser import LALR1Parser
+        simplified = self.simplification
+        with self.stats.phase('lalr_build'):
+            if simplified is not None:
+                lalr = LALR1Parser(simplified.start, simplified.productions)
+            else:
+                lalr = LALR1Parser(self.start_symbol, [(p.lhs(), p.rhs()) for p in self._productions])
+        if self.cache is not None and self.fingerprint is not None:
+            self.cache.put(self._cache_key(self.fingerprint) + "-lalr", lalr)
+        return lalr
+
+    def _cached_lalr_parser(self):
+        """ Tablas LALR(1) de esta gramática en la caché en disco, o None (sin construirlas) """
+        if self.cache is None or self.fingerprint is None:
+            return None
+        cached = self.cache.get(self._cache_key(self.fingerprint) + "-lalr")
+        if cached is not None:
+            self.stats.count('lalr_cache_hits')
+        return cached
+
+    def _ready_lalr_parser(self):
+        """ LALR1Parser si ya está en memoria o en la caché en disco (que se consulta una
+            vez por gramática); None si habría que construirlo
+        """
+        if 'lalr' in self._derived:
+            return self._derived['lalr']
+        return self._get_derived('lalr_cached', self._cached_lalr_parser)
+
+    def is_lalr1(self):
+        """ True si la gramática (la que se parsea) es LALR(1) """
+        return self.lalr is not None and self.lalr.is_lalr1
+
+    def _tree_parser(self):
+        """ Parser para construir derivaciones: uno determinista y lineal si la gramática es
+            LL(1), o LALR(1) con las tablas ya construidas; si no, el Earley general.
+            Las tablas LALR cuestan mucho más que parsear unas cadenas con Earley: aquí no se
+            construyen, solo al pedirlas (lalr, is_lalr1, analysis_report)
+        """
+        if self.is_ll1():
+            return self.ll1
+        lalr = self._ready_lalr_parser()
+        if lalr is not None and lalr.is_lalr1:
+            return lalr
+        return self.parser
+
+    def prefix_session(self):
+        """ Sesión Earley incremental (EarleyEngine.EarleySession) para validar mientras se
+            escribe: informa si el texto es prefijo viable y qué terminales pueden seguir.
+            Queda ligada al parser actual; tras cambiar la gramática hay que pedir otra.
+        """
+        if not self.parser:
+             raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+        return self.parser.session(self.stats)
+
+    def set_simplify(self, simplify):
+        """ Activa/desactiva la simplificación; el parser se reconstruye al usarse """
+        if simplify != self.simplify:
+            self.simplify = simplify
+            for name in ('parser', 'simplification', 'll1', 'lalr', 'lalr_cached'):
+                self._derived.pop(name, None)
+            self.result_cache.invalidate() # Los bosques cuentan sobre la gramática simplificada
+
+    def has_grammar(self):
+        """ True si hay una gramática válida cargada """
+        return self._productions is not None
 
     def set_grammar(self, start_symbol_str, terminals_str, non_terminals_str, productions_list):
         """ Parsea la entrada, construye la gramática NLTK y valida """
@@ -37,8 +261,205 @@ class GrammarLogicNLTK:
         error_messages = []
         self.grammar_type = None # Resetear tipo
 
+        # Carga en caliente: las filas sin tokenizar apuntan a la huella de la gramática
+        # compilada (alias en la caché), así que no se segmenta ninguna fila
+        rows_key = None
+        if self.cache is not None:
+             rows_key = self._cache_key(rows_fingerprint(start_symbol_str, terminals_str.split(','),
+                                                         non_terminals_str.split(','), productions_list)) + "-rows"
+             cached_messages = self._restore_cached(self.cache.get(rows_key))
+             if cached_messages is not None:
+                  return cached_messages
+
         # 1. Validar y almacenar S, T, NT
         s_symbol_str = start_symbol_str.strip()
+        error_messages.extend(self._set_symbols(start_symbol_str, terminals_str, non_terminals_str))
+
+        if not productions_list and not any("Error:" in e for e in error_messages):
+             error_messages.append("Error: No se han definido producciones.")
+
+        # 2. Tokenizar las filas con los símbolos definidos
+        productions, messages = self._parse_rows(productions_list)
+        error_messages.extend(messages)
+
+        # Si la gramática ya se compiló por otra vía (archivo, otras filas equivalentes),
+        # restaurarla sin recalcular nada (solo sin errores: la caché guarda gramáticas completas)
+        fingerprint = self._fingerprint(productions) if self.start_symbol is not None else None
+        if not any("Error" in e for e in error_messages):
+             cached_messages = self._restore_cached(fingerprint)
+             if cached_messages is not None:
+                  self.cache.put(rows_key, fingerprint)
+                  return cached_messages
+
+        # String de gramática para NLTK
+        grammar_lines = [self._production_line(production) for production in productions]
+        processed_productions = [{'lhs': production.lhs(), 'rhs': tuple(str(sym) for sym in production.rhs())}
+                                 for production in productions] # Para revalidación interna
+
+
+        # 3. Intentar crear el objeto CFG de NLTK si no hay errores fatales
+        if not any("Error:" in e for e in error_messages):
+            self.grammar_str = "\n".join(grammar_lines)
+            try:
+                # Asegurarse que el símbolo inicial se pase explícitamente
+                with self.stats.phase('cfg_build'):
+                     self.cfg = CFG.fromstring(self.grammar_str)
+                # Verificar si el start symbol de NLTK coincide con el nuestro
+                if self.cfg.start() != self.start_symbol:
+                     # Esto puede pasar si la primera producción en el string no es de S
+                     # Intentar recrear con el S correcto si S existe
+                     if self.start_symbol in self.cfg.productions():
+                           prods_for_cfg = [Production(Nonterminal(p['lhs']), p['rhs']) for p in processed_productions]
+                           self.cfg = CFG(self.start_symbol, prods_for_cfg)
+                     else:
+                          error_messages.append(f"Error: Símbolo inicial '{s_symbol_str}' no tiene producciones o NLTK no lo reconoce como inicial.")
+
+
+                # Lista de producciones y conteo de las que impiden Tipo 3
+                self._build_indexes(self.cfg.productions())
+
+                # Crear el parser una vez la gramática es válida (símbolos internados,
+                # anulables y tabla de predicción se calculan aquí, una sola vez)
+                self.parser = self._build_parser()
+                self.ll1 = self._build_ll1_parser() # Clasificación LL(1) junto al tipo
+
+            except Exception as e:
+                 error_messages.append(f"Error NLTK: No se pudo parsear la gramática. {e}")
+                 self._clear_indexes()
+                 self.cfg = None
+                 self.parser = None
+                 self.ll1 = None
+
+            # Guardar producciones procesadas si la gramática fue válida
+            if self.cfg:
+                 self._productions_parsed = processed_productions
+
+
+        # 4. Determinar tipo si no hubo errores NLTK
+        if self.cfg:
+             self._finish_grammar(fingerprint, error_messages, rows_key)
+
+        return error_messages
+
+
+    def load_parsed_grammar(self, grammar):
+        """ Carga un GrammarIO.ParsedGrammar (archivo leído en una pasada) sin la vuelta por
+            texto de set_grammar: los símbolos ya vienen clasificados, así que no se segmentan
+            los lados derechos ni se construye el CFG con CFG.fromstring (queda perezoso).
+            Devuelve la lista de errores/advertencias, como set_grammar.
+        """
+        self.clear()
+        self.grammar_type = None
+        spec = grammar.spec()
+        fingerprint = grammar.fingerprint()
+        cached_messages = self._restore_cached(fingerprint)
+        if cached_messages is not None:
+             return cached_messages
+
+        error_messages = self._set_symbols(*spec[:3])
+        if not grammar.productions and not any("Error:" in e for e in error_messages):
+             error_messages.append("Error: No se han definido producciones.")
+
+        # Validar que cada símbolo esté declarado: se comparan los símbolos distintos usados y
+        # solo si falta alguno se recorren las producciones para ubicar los errores
+        terminals, non_terminals = self.terminals, self.non_terminals
+        all_declared = (grammar.used_terminals <= terminals and
+                        all(Nonterminal(nt) in non_terminals for nt in grammar.used_non_terminals))
+        productions = [Production(lhs, rhs) for lhs, rhs in grammar.productions] if all_declared else []
+        for i, (lhs, rhs) in enumerate(() if all_declared else grammar.productions, start=1):
+            if lhs not in non_terminals:
+                 error_messages.append(f"Error en Producción {i}: Lado izquierdo '{lhs}' no es un No Terminal definido.")
+                 continue
+            undefined = next((sym for sym in rhs if (sym not in terminals if isinstance(sym, str)
+                                                     else sym not in non_terminals)), None)
+            if undefined is not None:
+                 error_messages.append(f"Error en Producción {i}: Símbolo '{undefined}' no está definido en T ni en NT.")
+                 continue
+            productions.append(Production(lhs, rhs))
+
+        if not any("Error:" in e for e in error_messages):
+             with self.stats.phase('index_build'):
+                  self._build_indexes(productions)
+             self.parser = self._build_parser()
+             self.ll1 = self._build_ll1_parser()
+             self._productions_parsed = None # Copia en dicts que solo arma set_grammar (nadie la lee)
+             self._finish_grammar(fingerprint, error_messages)
+        return error_messages
+
+
+    def parse_rows(self, start_symbol_str, terminals_str, non_terminals_str, productions_list):
+        """ Tokeniza la entrada de set_grammar (filas de la UI) con los símbolos declarados,
+            sin compilar nada. Devuelve (ParsedGrammar, mensajes); ParsedGrammar es None si hay errores.
+        """
+        self.clear()
+        error_messages = self._set_symbols(start_symbol_str, terminals_str, non_terminals_str)
+        if not productions_list and not any("Error:" in e for e in error_messages):
+             error_messages.append("Error: No se han definido producciones.")
+        productions, messages = self._parse_rows(productions_list)
+        error_messages.extend(messages)
+        if any("Error" in e for e in error_messages):
+             return None, error_messages
+        return self._as_parsed(productions), error_messages
+
+    def parsed_grammar(self):
+        """ La gramática actual como ParsedGrammar (se recompila sin volver a segmentar filas) """
+        if self._productions is None:
+            raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+        return self._as_parsed([p for p, count in self._productions.items() for _ in range(count)])
+
+    def _as_parsed(self, productions):
+        pairs = [(p.lhs(), p.rhs()) for p in productions]
+        used_terminals = {sym for _, rhs in pairs for sym in rhs if isinstance(sym, str)}
+        used_non_terminals = ({lhs.symbol() for lhs, _ in pairs} |
+                              {sym.symbol() for _, rhs in pairs for sym in rhs if not isinstance(sym, str)})
+        return ParsedGrammar(self.start_symbol.symbol(), sorted(self.terminals),
+                             sorted(nt.symbol() for nt in self.non_terminals), pairs,
+                             used_terminals, used_non_terminals)
+
+    def _parse_rows(self, productions_list):
+        """ Tokeniza las filas (lhs, rhs) de la UI. Devuelve (producciones válidas, mensajes) """
+        productions = []
+        messages = []
+        for i, (lhs_str, rhs_str) in enumerate(productions_list):
+            if not lhs_str.strip():
+                 if rhs_str.strip(): # Error si hay RHS pero no LHS
+                     messages.append(f"Error en Producción {i+1}: Falta el lado izquierdo (No Terminal).")
+                 continue # Ignorar líneas de producción vacías
+
+            production, found = self._parse_production(lhs_str, rhs_str, i + 1)
+            messages.extend(found)
+            if production is not None:
+                 productions.append(production)
+        return productions, messages
+
+    def _fingerprint(self, productions):
+        """ Huella de S, T, NT actuales y las producciones tokenizadas (GrammarCache.grammar_fingerprint) """
+        return grammar_fingerprint(self.start_symbol.symbol(), self.terminals,
+                                   [nt.symbol() for nt in self.non_terminals],
+                                   [(p.lhs(), p.rhs()) for p in productions])
+
+    def _cache_key(self, fingerprint):
+        return fingerprint + ("-simplified" if self.simplify else "") # El parser depende de simplify
+
+    def _restore_cached(self, fingerprint):
+        """ Si la gramática ya se compiló (caché en disco), restaura su estado y devuelve
+            sus mensajes; None si no está
+        """
+        if self.cache is None or fingerprint is None:
+            return None
+        cached = self.cache.get(self._cache_key(fingerprint))
+        if cached is None:
+            return None
+        for attr in self._COMPILED_STATE:
+            setattr(self, attr, cached[attr])
+        self.fingerprint = fingerprint
+        self.stats.count('cache_hits')
+        return list(cached['messages'])
+
+    def _set_symbols(self, start_symbol_str, terminals_str, non_terminals_str):
+        """ Valida y guarda S, T y NT. Devuelve los mensajes de error/advertencia """
+        error_messages = []
+        s_symbol_str = start_symbol_str.strip()
         if not s_symbol_str:
             error_messages.append("Error: El símbolo inicial no puede estar vacío.")
         else:
@@ -60,187 +481,446 @@ class GrammarLogicNLTK:
         # Validar S en NT
         if self.start_symbol and self.start_symbol not in self.non_terminals:
              error_messages.append(f"Error: Símbolo inicial '{s_symbol_str}' no encontrado en No Terminales.")
+        return error_messages
 
+    def _finish_grammar(self, fingerprint, error_messages, rows_key=None):
+        """ Último paso de la compilación: tipo, AFD, huella y caché (con el alias de las
+            filas sin tokenizar si se compiló desde set_grammar)
+        """
+        self.determine_grammar_type() # Llama al método de abajo
+        self.dfa = self._build_regular_engine()
+        self.fingerprint = fingerprint
+        if self.cache is not None and not any("Error" in e for e in error_messages):
+             state = self.compiled_state()
+             state['messages'] = list(error_messages)
+             self.cache.put(self._cache_key(fingerprint), state)
+             if rows_key is not None:
+                  self.cache.put(rows_key, fingerprint)
 
-        # 2. Construir string de gramática para NLTK y validar producciones
-        grammar_lines = []
-        all_symbols_defined = defined_terminals.union(defined_non_terminals)
-        processed_productions = [] # Para revalidación interna
 
-        if not productions_list and not any("Error:" in e for e in error_messages):
-             error_messages.append("Error: No se han definido producciones.")
+    def compiled_state(self):
+        """ Estado de la gramática compilada (lo que guarda la caché en disco) como dict """
+        return {attr: getattr(self, attr) for attr in self._COMPILED_STATE}
 
-        for i, (lhs_str, rhs_str) in enumerate(productions_list):
-            lhs = lhs_str.strip()
-            rhs = rhs_str.strip() # RHS vacío significa epsilon
+    def analysis_report(self):
+        """ Propiedades de la gramática como dict serializable: LL(1), LALR(1) (con sus
+            conflictos) y el resumen de la simplificación si está activa
+        """
+        report = {}
+        if self.ll1 is not None:
+            report["ll1"] = self.ll1.is_ll1
+            report["ll1_conflicts"] = self.ll1.conflict_messages()
+        if self.lalr is not None:
+            report["lalr"] = self.lalr.is_lalr1
+            report["lalr_states"] = self.lalr.state_count
+            report["lalr_conflicts"] = self.lalr.conflict_messages()
+        if self.simplification is not None:
+            report["simplification"] = self.simplification.report
+        return report
 
-            if not lhs:
-                 if rhs: # Error si hay RHS pero no LHS
-                     error_messages.append(f"Error en Producción {i+1}: Falta el lado izquierdo (No Terminal).")
-                 continue # Ignorar líneas de producción vacías
 
-            # Validar LHS es un NT definido
-            if Nonterminal(lhs) not in self.non_terminals:
-                error_messages.append(f"Error en Producción {i+1}: Lado izquierdo '{lhs}' no es un No Terminal definido.")
-                continue
+    def _build_regular_engine(self):
+        """ Si la gramática es Tipo 3, compila su AFD mínimo para validar en O(n) """
+        if self.grammar_type != REGULAR_TYPE:
+            return None
+        productions = [(p.lhs(), p.rhs()) for p in self._productions]
+        with self.stats.phase('dfa_build'):
+            return RegularAutomaton(self.start_symbol, productions)
 
-            # Parsear RHS en símbolos (T o NT)
-            # Necesitamos descomponer rhs_str en terminales/no terminales definidos
-            rhs_symbols = []
-            temp_rhs = rhs
-            possible_symbols = sorted(list(all_symbols_defined), key=len, reverse=True)
-
-            while temp_rhs:
-                found_sym = False
-                for sym in possible_symbols:
-                     # NLTK trata terminales como strings, NT como Nonterminal(str)
-                     is_terminal = sym in defined_terminals
-                     is_non_terminal = sym in defined_non_terminals
-
-                     if temp_rhs.startswith(sym):
-                         # NLTK espera strings para terminales, Nonterminal() para no terminales
-                         #rhs_symbols.append(f"'{sym}'" if is_terminal else sym) # Formato string NLTK
-                         rhs_symbols.append(sym) # Guardamos el símbolo puro por ahora
-                         temp_rhs = temp_rhs[len(sym):]
-                         found_sym = True
-                         break
-                if not found_sym:
-                     error_messages.append(f"Error en Producción {i+1}: Símbolo no reconocido en lado derecho cerca de '{temp_rhs[:5]}...' (símbolos válidos: {all_symbols_defined}).")
-                     rhs_symbols = None # Marcar como inválida
-                     break
 
-            if rhs_symbols is None: # Si hubo error parseando RHS
-                 continue
+    def _parse_production(self, lhs_str, rhs_str, index=None):
+        """ Valida una fila (LHS, RHS) de la UI y la convierte en una Production de NLTK.
+            Devuelve (producción, advertencias) o (None, [mensaje de error]).
+        """
+        where = f"Producción {index}" if index is not None else "Producción"
+        lhs = lhs_str.strip()
+        rhs = rhs_str.strip() # RHS vacío significa epsilon
 
-            # Construir la línea para NLTK CFG string (manejo especial de terminales con comillas)
-            rhs_nltk_parts = []
-            for sym in rhs_symbols:
-                 if sym in defined_terminals:
-                      rhs_nltk_parts.append(f"'{sym}'") # Terminales entre comillas
-                 elif sym in defined_non_terminals:
-                      rhs_nltk_parts.append(sym) # No terminales sin comillas
-                 # else: ya validado arriba
+        if not lhs:
+            return None, [f"Error en {where}: Falta el lado izquierdo (No Terminal)."]
 
-            production_line = f"{lhs} -> {' '.join(rhs_nltk_parts)}"
-            grammar_lines.append(production_line)
-            processed_productions.append({'lhs': Nonterminal(lhs), 'rhs': tuple(sym for sym in rhs_symbols if sym)}) # Guardar producción procesada
+        # Validar LHS es un NT definido
+        if Nonterminal(lhs) not in self.non_terminals:
+            return None, [f"Error en {where}: Lado izquierdo '{lhs}' no es un No Terminal definido."]
 
+        # Parsear RHS en símbolos (T o NT) con el trie de símbolos definidos
+        rhs_symbols, ambiguous = self._get_symbol_trie().segment(rhs)
+        if rhs_symbols is None:
+            all_symbols_defined = self.terminals.union(nt.symbol() for nt in self.non_terminals)
+            temp_rhs = rhs[ambiguous:] # Resto que no se pudo segmentar
+            return None, [f"Error en {where}: Símbolo no reconocido en lado derecho cerca de '{temp_rhs[:5]}...' (símbolos válidos: {all_symbols_defined})."]
 
-        # 3. Intentar crear el objeto CFG de NLTK si no hay errores fatales
-        if not any("Error:" in e for e in error_messages):
-            self.grammar_str = "\n".join(grammar_lines)
-            print(f"\n--- NLTK Grammar Definition ---\n{self.grammar_str}\n------------------------------")
-            try:
-                # Asegurarse que el símbolo inicial se pase explícitamente
-                self.cfg = CFG.fromstring(self.grammar_str)
-                # Verificar si el start symbol de NLTK coincide con el nuestro
-                if self.cfg.start() != self.start_symbol:
-                     # Esto puede pasar si la primera producción en el string no es de S
-                     # Intentar recrear con el S correcto si S existe
-                     if self.start_symbol in self.cfg.productions():
-                           prods_for_cfg = [Production(Nonterminal(p['lhs']), p['rhs']) for p in processed_productions]
-                           self.cfg = CFG(self.start_symbol, prods_for_cfg)
-                           print(f"DEBUG: Recreated CFG with start symbol {self.start_symbol}")
-                     else:
-                          error_messages.append(f"Error: Símbolo inicial '{s_symbol_str}' no tiene producciones o NLTK no lo reconoce como inicial.")
+        warnings = []
+        if ambiguous:
+            warnings.append(f"Advertencia en {where}: El lado derecho '{rhs}' admite varias segmentaciones; se usa '{' '.join(rhs_symbols)}'.")
 
+        # NLTK espera strings para terminales, Nonterminal() para no terminales
+        rhs_nltk = tuple(sym if sym in self.terminals else Nonterminal(sym) for sym in rhs_symbols)
+        return Production(Nonterminal(lhs), rhs_nltk), warnings
 
-                # Crear el parser una vez la gramática es válida
-                self.parser = EarleyChartParser(self.cfg)
 
-            except Exception as e:
-                 error_messages.append(f"Error NLTK: No se pudo parsear la gramática. {e}")
-                 self.cfg = None
-                 self.parser = None
+    def _get_symbol_trie(self):
+        """ Trie de T ∪ NT (se construye una vez por gramática, al primer uso) """
+        if self._symbol_trie is None:
+            self._symbol_trie = SymbolTrie(self.terminals | {nt.symbol() for nt in self.non_terminals})
+        return self._symbol_trie
 
-            # Guardar producciones procesadas si la gramática fue válida
-            if self.cfg:
-                 self._productions_parsed = processed_productions
 
+    @staticmethod
+    def _production_line(production):
+        """ Línea para el string CFG de NLTK (terminales entre comillas) """
+        rhs_nltk_parts = [f"'{sym}'" if isinstance(sym, str) else sym.symbol() for sym in production.rhs()]
+        return f"{production.lhs().symbol()} -> {' '.join(rhs_nltk_parts)}"
 
-        # 4. Determinar tipo si no hubo errores NLTK
-        if self.cfg:
-             self.determine_grammar_type() # Llama al método de abajo
 
-        return error_messages
+    # --- Producciones y cambios por producción ---
+    # _productions cuenta las apariciones de cada producción (dict ordenado: quitar una es
+    # O(1)). Un delta actualiza ese conteo, el de producciones no regulares (clasificación en
+    # O(1)) y la huella (GrammarCache.combine_fingerprint: se suma o resta el hash de la fila).
+    # Desde el primer delta se mantiene además un GrammarAnalysis.ProductionIndex (producciones
+    # por lado izquierdo, usos, anulables y productivos) con el que el parser Earley se
+    # actualiza sin recalcular su tabla de predicción entera (EarleyEngine.updated). Lo que depende de la gramática entera (AFD,
+    # FNC, LL(1), LALR, simplificación) se descarta y se reconstruye al usarse. Repetir una
+    # producción que ya estaba solo cambia la huella.
+
+    def _clear_indexes(self):
+        self._productions = None    # Production de NLTK -> apariciones (None = sin gramática válida)
+        self._non_regular_count = 0 # Producciones que impiden que la gramática sea Tipo 3
+        self._delta_index = None    # ProductionIndex (se construye con el primer delta)
+        self._fingerprint_sum = 0   # Suma de GrammarCache.production_digest (con el índice)
+
+    def _build_indexes(self, productions):
+        self._clear_indexes()
+        self._productions = {}
+        for production in productions:
+            self._index_production(production)
+
+    def _index_production(self, production):
+        """ Cuenta una aparición más; True si la producción no estaba """
+        count = self._productions.get(production, 0)
+        self._productions[production] = count + 1
+        if count:
+            return False
+        if not self._is_regular_production(production):
+            self._non_regular_count += 1
+        return True
+
+    def _unindex_production(self, production):
+        """ Descuenta una aparición; True si era la última """
+        count = self._productions[production]
+        if count > 1:
+            self._productions[production] = count - 1
+            return False
+        del self._productions[production]
+        if not self._is_regular_production(production):
+            self._non_regular_count -= 1
+        return True
+
+    def _apply_delta(self, production, added):
+        """ Añade (added=True) o quita una aparición de production y actualiza lo que depende de ella """
+        if self._delta_index is None:
+            with self.stats.phase('index_build'):
+                self._delta_index = ProductionIndex((p.lhs(), p.rhs()) for p in self._productions)
+                self._fingerprint_sum = sum(production_digest(p.lhs(), p.rhs()) * count
+                                            for p, count in self._productions.items())
+        pair = (production.lhs(), production.rhs())
+        digest = production_digest(*pair)
+        if added:
+            self._fingerprint_sum += digest
+            if self._index_production(production):
+                self._update_engines([pair], [], *self._delta_index.add(*pair))
+        else:
+            self._fingerprint_sum -= digest
+            if self._unindex_production(production):
+                self._update_engines([], [pair], *self._delta_index.remove(*pair))
+        self.fingerprint = combine_fingerprint(self.start_symbol.symbol(), self.terminals,
+                                               [nt.symbol() for nt in self.non_terminals], self._fingerprint_sum)
+
+    def _update_engines(self, added, removed, nullable_changes, productive_changes):
+        """ El conjunto de producciones cambió: reclasifica en O(1), actualiza el parser
+            Earley y descarta los motores que dependen de toda la gramática
+        """
+        self.grammar_type = REGULAR_TYPE if self._non_regular_count == 0 else CONTEXT_FREE_TYPE
+        parser = self._derived.get('parser')
+        if parser is not None and not self.simplify: # Con simplify el parser es de otra gramática
+            with self.stats.phase('parser_update'):
+                parser = parser.updated(added, removed, nullable_changes, productive_changes)
+        else:
+            parser = None
+        for name in ('cfg', 'grammar_str', 'parser', 'dfa', 'batch_dfa', 'simplification', 'll1', 'lalr', 'lalr_cached'):
+            self._derived.pop(name, None) # Se reconstruyen al usarse
+        if parser is not None:
+            self.parser = parser
+            self.stats.count('parser_updates')
+        self.cyk = None
+        self.sampler = None
+        self.enumerator = None
+        self.result_cache.invalidate()
+
+    def add_production(self, lhs_str, rhs_str):
+        """ Añade una producción sin volver a procesar las demás filas.
+            Devuelve lista de mensajes (si hay errores no se aplica nada).
+        """
+        if self._productions is None:
+            raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+        production, messages = self._parse_production(lhs_str, rhs_str)
+        if production is None:
+            return messages
+
+        self._apply_delta(production, added=True)
+        return messages
+
+    def remove_production(self, lhs_str, rhs_str):
+        """ Elimina una producción sin volver a procesar las demás filas.
+            Devuelve lista de mensajes (si hay errores no se aplica nada).
+        """
+        if self._productions is None:
+            raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+        production, messages = self._parse_production(lhs_str, rhs_str)
+        if production is None:
+            return messages
+        if production not in self._productions:
+            return [f"Error: La producción '{self._production_line(production)}' no existe."]
+
+        self._apply_delta(production, added=False)
+        return messages
+
+    def replace_production(self, old_production, new_production):
+        """ Sustituye la fila old_production=(lhs, rhs) por new_production=(lhs, rhs) """
+        production, messages = self._parse_production(*new_production)
+        if production is None:
+            return messages
+        messages = self.remove_production(*old_production)
+        if any(m.startswith("Error") for m in messages):
+            return messages
+        return self.add_production(*new_production)
 
 
     def determine_grammar_type(self):
         """ Determina si la gramática (ya parseada por NLTK) es Tipo 3 o Tipo 2 """
-        if not self.cfg:
+        if self._productions is None:
              self.grammar_type = "Error: Gramática no definida o inválida."
              return self.grammar_type
 
         # NLTK considera todo como CFG (Tipo 2) si lo parsea.
-        # Necesitamos verificar manualmente las restricciones de Tipo 3.
-        is_type3 = True
-        for prod in self.cfg.productions():
-            rhs = prod.rhs()
-            rhs_len = len(rhs)
-
-            # Regla A -> ε (representada como A -> '' o A -> () en NLTK)
-            if rhs_len == 0:
-                continue # Válido en T3 extendida (y T2)
-
-            # Regla A -> a
-            elif rhs_len == 1:
-                 symbol = rhs[0]
-                 # NLTK parsea terminales como strings
-                 if not isinstance(symbol, str) or symbol not in self.terminals:
-                      is_type3 = False
-                      break
-            # Regla A -> a B
-            elif rhs_len == 2:
-                 first, second = rhs[0], rhs[1]
-                 # first debe ser terminal (string), second debe ser no terminal (Nonterminal)
-                 if not (isinstance(first, str) and first in self.terminals and \
-                         isinstance(second, Nonterminal) and second in self.non_terminals):
-                      is_type3 = False
-                      break
-            # Cualquier otra forma no es Tipo 3
-            else:
-                 is_type3 = False
-                 break
-
-        if is_type3:
-            self.grammar_type = "Regular (Tipo 3)"
+        # Necesitamos verificar manualmente las restricciones de Tipo 3 (el conteo
+        # de producciones que las incumplen se mantiene con cada delta).
+        if self._non_regular_count == 0:
+            self.grammar_type = REGULAR_TYPE
         else:
             # Si NLTK la parseó, es al menos Tipo 2 (CFG)
-            self.grammar_type = "Libre de Contexto (Tipo 2)"
+            self.grammar_type = CONTEXT_FREE_TYPE
 
         return self.grammar_type
 
 
-    def validate_string(self, input_string):
-        """ Valida la cadena usando el parser NLTK """
+    def _is_regular_production(self, prod):
+        """ True si la producción tiene una forma admitida en Tipo 3 """
+        rhs = prod.rhs()
+        rhs_len = len(rhs)
+
+        # Regla A -> ε (representada como A -> '' o A -> () en NLTK)
+        if rhs_len == 0:
+            return True # Válido en T3 extendida (y T2)
+
+        # Regla A -> a
+        elif rhs_len == 1:
+             symbol = rhs[0]
+             # NLTK parsea terminales como strings
+             return isinstance(symbol, str) and symbol in self.terminals
+        # Regla A -> a B
+        elif rhs_len == 2:
+             first, second = rhs[0], rhs[1]
+             # first debe ser terminal (string), second debe ser no terminal (Nonterminal)
+             return isinstance(first, str) and first in self.terminals and \
+                    isinstance(second, Nonterminal) and second in self.non_terminals
+        # Cualquier otra forma no es Tipo 3
+        return False
+
+
+    def validate_string(self, input_string, with_trees=True, cancel=None):
+        """ Valida la cadena usando el parser Earley.
+            Devuelve (pertenece, bosque): el bosque (ParseForest) cuenta las derivaciones
+            y construye los árboles bajo demanda; es None si no pertenece o with_trees es False.
+            Si la gramática es Tipo 3 la pertenencia se decide con el AFD mínimo y los
+            árboles solo se reconstruyen (con el parser) cuando with_trees es True.
+            Si la gramática es LL(1) o LALR(1) se usa el parser predictivo o el de
+            desplazamiento-reducción (lineales, una sola derivación); si no, Earley.
+            cancel (threading.Event) detiene el parseo con OperationCancelled.
+            Los resultados se guardan en result_cache: repetir una cadena no vuelve a parsear
+            (el bosque se comparte entre llamadas, con sus conteos ya hechos; por eso no
+            guarda cancel: a forest.count se le pasa el de cada llamada).
+        """
         if not self.parser:
              raise ValueError("La gramática no ha sido definida o parseada correctamente.")
 
+        stats = self.stats
+        stats.count('validations')
+        key = (self.fingerprint, input_string, with_trees)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+             stats.count('result_cache_hits')
+             return cached
+        stats.count('result_cache_misses')
+
+        result = self._validate_uncached(input_string, with_trees, cancel)
+        forest = result[1]
+        self.result_cache.put(key, result, sys.getsizeof(input_string) + (forest.size_hint if forest else 0))
+        return result
+
+
+    def _validate_uncached(self, input_string, with_trees, cancel):
+        """ Cuerpo de validate_string (sin caché de resultados) """
+        stats = self.stats
         try:
-            tokens = list(input_string)
-            print(f"DEBUG: Input '{input_string}' tokenized to: {tokens}")
+            with stats.phase('tokenize'):
+                 tokens = list(input_string)
 
-            # El parser.parse() devuelve un iterador de árboles.
-            # Si el iterador tiene al menos un elemento, la cadena pertenece.
-            parse_trees = list(self.parser.parse(tokens))
+            if self.dfa is not None:
+                 with stats.phase('dfa_run'):
+                      belongs = self.dfa.accepts(tokens)
+                 stats.count('dfa_accepted' if belongs else 'dfa_rejected')
+                 if not belongs or not with_trees:
+                      return belongs, None
 
-            if parse_trees:
-                 print(f"DEBUG: Found {len(parse_trees)} parse trees.")
-                 return True, parse_trees # Retorna True y los árboles encontrados
-            else:
-                 print("DEBUG: No parse trees found.")
-                 return False, [] # Retorna False y lista vacía
+            if not with_trees:
+                 with stats.phase('parse'):
+                      return self._tree_parser().recognize(tokens, cancel, stats), None
+
+            # El bosque (SPPF) comparte los subárboles y no los expande.
+            # Si existe la raíz (S, 0, n), la cadena pertenece.
+            with stats.phase('parse'):
+                 forest = self._parse_forest(tokens, cancel)
 
-        except ValueError as e:
+            if forest:
+                 if stats.enabled: # El conteo recorre el bosque: solo si se mide
+                      with stats.phase('tree_extraction'):
+                           stats.count('trees_found', forest.count(cancel))
+                 return True, forest # Retorna True y el bosque de derivaciones
+            return False, None
+
+        except OperationCancelled:
+            raise
+        except ValueError:
             # Error durante tokenización (e.g., símbolos inválidos)
-            print(f"DEBUG: ValueError during validation: {e}")
             # Consideramos que no pertenece si no se puede tokenizar
-            return False, []
+            stats.count('tokenize_errors')
+            return False, None
         except Exception as e:
-            print(f"DEBUG: Unexpected error during NLTK parsing: {e}")
-            import traceback
-            traceback.print_exc()
-            raise RuntimeError(f"Error inesperado del parser NLTK: {e}")
+            raise RuntimeError(f"Error inesperado del parser Earley: {e}") from e
+
+
+    def _parse_forest(self, tokens, cancel=None):
+        """ Bosque del parser; si la gramática se simplificó, sus árboles se devuelven
+            en términos de la gramática original (las cuentas son las de la simplificada)
+        """
+        forest = self._tree_parser().parse(tokens, cancel, self.stats)
+        if self.simplification is not None:
+            forest.transform = self.simplification.expand_tree
+        return forest
+
+
+    def _validate_quiet(self, input_string, results):
+        """ Validación de lotes, sin manejo de errores por cadena. results: 'bool', 'count' o 'tree' """
+        tokens = list(input_string)
+        stats = self.stats
+        stats.count('validations')
+        if results == 'bool':
+            if self.dfa is not None:
+                with stats.phase('dfa_run'):
+                    return self.dfa.accepts(tokens)
+            with stats.phase('parse'):
+                return self._tree_parser().recognize(tokens, stats=stats)
+        with stats.phase('parse'):
+            forest = self._parse_forest(tokens)
+        with stats.phase('tree_extraction'):
+            if results == 'count':
+                return forest.count()
+            return forest.first_tree()
+
+
+    def validate_many(self, strings, workers=None, chunk_size=256, results='bool'):
+        """ Valida un iterable de cadenas y produce los resultados en el orden de entrada.
+            results: 'bool' (pertenece), 'count' (número de derivaciones) o 'tree' (primer
+            árbol o None). Con workers > 1 cada proceso compila la gramática una sola vez
+            y recibe bloques de chunk_size cadenas; la entrada se consume de forma perezosa.
+            Los argumentos se validan al llamar (antes de producir resultados), no al iterar.
+        """
+        if not self.parser:
+             raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+        if results not in ('bool', 'count', 'tree'):
+             raise ValueError(f"Tipo de resultado no soportado: '{results}'.")
+        if workers is None:
+             workers = os.cpu_count() or 1
+        if not isinstance(workers, int) or workers < 1:
+             raise ValueError(f"Error: workers debe ser un entero positivo (se recibió {workers!r}).")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+             raise ValueError(f"Error: chunk_size debe ser un entero positivo (se recibió {chunk_size!r}).")
+        return self._validate_many(strings, workers, chunk_size, results)
+
+    def _validate_many(self, strings, workers, chunk_size, results):
+        if workers == 1:
+             for input_string in strings:
+                  yield self._validate_quiet(input_string, results)
+             return
+
+        source = iter(strings)
+        # Las tablas LALR ya disponibles se envían a los workers (no se construyen para esto)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_validation_worker,
+                                 initargs=(self.parsed_grammar(), self.simplify, self._ready_lalr_parser())) as pool:
+             # Como mucho 2 bloques en vuelo por worker: memoria acotada con entradas enormes
+             pending = deque()
+             while True:
+                  while len(pending) < workers * 2:
+                       chunk = list(itertools.islice(source, chunk_size))
+                       if not chunk:
+                            break
+                       pending.append(pool.submit(_validate_chunk, chunk, results))
+                  if not pending:
+                       break
+                  yield from pending.popleft().result()
+
+
+    def validate_corpus(self, path, append_epsilon=False):
+        """ Pertenencia de cada línea de un archivo de una vez, con el AFD vectorizado (NumPy +
+            mmap). Solo para gramáticas Tipo 3 (determine_grammar_type). Con append_epsilon
+            se añade EPSILON al final de cada cadena, como hace la interfaz.
+            Devuelve (bitmap, n): bits empaquetados (bit i de la línea i, orden 'little' dentro
+            de cada byte, ver numpy.unpackbits) y el número de líneas.
+        """
+        if not self.parser:
+             raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+        runner = self.batch_dfa
+        if runner is None:
+             raise ValueError("Error: La validación por lotes con AFD requiere una gramática Tipo 3.")
+        import numpy as np
+        with self.stats.phase('dfa_batch_run'):
+             accepted = runner.run_file(path, EPSILON if append_epsilon else "")
+        self.stats.count('validations', len(accepted))
+        if self.stats.enabled: # Recorre el resultado: solo si se mide
+             accepted_count = int(accepted.sum())
+             self.stats.count('dfa_accepted', accepted_count)
+             self.stats.count('dfa_rejected', len(accepted) - accepted_count)
+        return np.packbits(accepted, bitorder='little'), len(accepted)
+
+
+    def validate_string_cyk(self, input_string):
+        """ Valida la cadena con CYK vectorizado (NumPy) sobre la gramática en FNC """
+        if not self.cfg:
+             raise ValueError("La gramática no ha sido definida o parseada correctamente.")
+
+        if self.cyk is None:
+             from CYKEngine import CYKRecognizer # NumPy solo se necesita para este motor
+             productions = [(p.lhs(), p.rhs()) for p in self.cfg.productions()]
+             self.cyk = CYKRecognizer(self.start_symbol, productions)
+
+        return self.cyk.recognize(list(input_string))
+
+
+    def cross_check_string(self, input_string):
+        """ Compara el resultado del parser Earley con el de CYK. Devuelve (earley, cyk) """
+        belongs, _ = self.validate_string(input_string, with_trees=False)
+        return belongs, self.validate_string_cyk(input_string)
 
 
     def get_derivation_tree_string(self, parse_tree):
@@ -251,8 +931,8 @@ class GrammarLogicNLTK:
         return str(parse_tree)
 
 
-    def generate_random_strings(self, n=10, max_depth=7):
-        """ Genera cadenas aleatorias usando NLTK """
+    def generate_random_strings(self, n=MAX_GENERATED_STRINGS, max_depth=7):
+        """ Genera cadenas aleatorias usando NLTK (RuntimeError si la generación de NLTK falla) """
         if not self.cfg:
              raise ValueError("La gramática no ha sido definida.")
 
@@ -261,18 +941,174 @@ class GrammarLogicNLTK:
             # generate() puede ser infinito, necesitamos limitar
             # Nota: n=numero de strings, depth=profundidad máxima de derivación
             count = 0
-            for sent_tokens in generate(self.cfg, start=self.start_symbol, depth=max_depth, n=MAX_GENERATED_STRINGS * 5):
-                 if count >= MAX_GENERATED_STRINGS * 5 : # Limite de intentos
+            for sent_tokens in generate(self.cfg, start=self.start_symbol, depth=max_depth, n=n * 5):
+                 if count >= n * 5 : # Limite de intentos
                       break
                  string = "".join(sent_tokens)
                  generated_strings.add(string)
                  count +=1
-                 if len(generated_strings) >= MAX_GENERATED_STRINGS:
+                 if len(generated_strings) >= n:
                      break
 
-            return list(generated_strings)[:MAX_GENERATED_STRINGS]
+            return list(generated_strings)[:n]
 
         except Exception as e:
-            print(f"Error durante generación NLTK: {e}")
-            return []
+            raise RuntimeError(f"Error durante generación NLTK: {e}") from e
+
+
+    def sample_strings(self, n=MAX_GENERATED_STRINGS, min_length=0, max_length=10, seed=None, unique=False):
+        """ Cadenas elegidas uniformemente entre las derivaciones con longitud (en terminales)
+            dentro de [min_length, max_length]. El terminal ε cuenta como cadena vacía.
+            seed hace la muestra reproducible; unique descarta repetidas (hasta n*5 intentos).
+        """
+        if min_length < 0 or max_length < min_length:
+             raise ValueError("Rango de longitudes inválido.")
+
+        sampler = self._get_sampler()
+        rng = random.Random(seed)
+        strings = []
+        seen = set()
+        attempts = n * 5 if unique else n
+        with self.stats.phase('generation'):
+            for _ in range(attempts):
+                tokens = sampler.sample_range(min_length, max_length, rng)
+                if tokens is None:
+                    break # El lenguaje no tiene cadenas en ese rango
+                string = "".join(tokens)
+                if unique:
+                    if string in seen:
+                        self.stats.count('strings_deduplicated')
+                        continue
+                    seen.add(string)
+                strings.append(string)
+                if len(strings) >= n:
+                    break
+        self.stats.count('strings_produced', len(strings))
+        return strings
+
+
+    def stream_strings(self, n=None, min_length=0, max_length=10, seed=None, unique=True,
+                       fp_rate=0.001, capacity=None, patience=10000):
+        """ Generador de cadenas muestreadas (ver sample_strings) con memoria constante.
+            n=None genera sin fin. Con unique, las repetidas se descartan con un filtro Bloom
+            dimensionado para capacity cadenas (por defecto n; obligatorio si n es None):
+            algunas cadenas nuevas pueden descartarse como falsos positivos (tasa fp_rate,
+            que crece rápido pasadas capacity cadenas). Termina tras patience descartes
+            seguidos (el lenguaje en ese rango se agotó o casi, o el filtro se saturó) y lo
+            avisa con un RuntimeWarning. Los argumentos se validan al llamar, no al iterar.
+        """
+        if min_length < 0 or max_length < min_length:
+             raise ValueError("Rango de longitudes inválido.")
+        if n is not None and n < 0:
+             raise ValueError("La cantidad de cadenas no puede ser negativa.")
+        if unique and capacity is None:
+             if n is None:
+                  raise ValueError("Error: Sin límite de cadenas, unique requiere capacity (cadenas que admite el filtro Bloom).")
+             capacity = n
+        if unique and capacity < 1:
+             capacity = 1
+        return self._stream_strings(n, min_length, max_length, seed, unique, fp_rate, capacity, patience)
+
+    def _stream_strings(self, n, min_length, max_length, seed, unique, fp_rate, capacity, patience):
+        sampler = self._get_sampler()
+        rng = random.Random(seed)
+        seen = None
+        if unique:
+             from StringGenerator import BloomFilter
+             seen = BloomFilter(capacity, fp_rate)
+
+        stats = self.stats
+        produced = 0
+        misses = 0
+        while n is None or produced < n:
+            tokens = sampler.sample_range(min_length, max_length, rng)
+            if tokens is None:
+                return # El lenguaje no tiene cadenas en ese rango
+            string = "".join(tokens)
+            if seen is not None and seen.add(string):
+                stats.count('strings_deduplicated')
+                misses += 1
+                if misses >= patience:
+                    warnings.warn(f"Generación detenida tras {patience} cadenas repetidas seguidas ({produced} producidas): "
+                                  f"el lenguaje en ese rango se agotó o el filtro Bloom (capacity={capacity}) se saturó.",
+                                  RuntimeWarning, stacklevel=2)
+                    return
+                continue
+            misses = 0
+            produced += 1
+            if seen is not None and produced == capacity + 1:
+                warnings.warn(f"Se superó capacity={capacity}: la tasa de falsos positivos del filtro Bloom ya es mayor que {fp_rate}.",
+                              RuntimeWarning, stacklevel=2)
+            stats.count('strings_produced')
+            yield string
+
+
+    def enumerate_strings(self, n=None, max_length=7, min_length=0):
+        """ Primeras n cadenas del lenguaje (todas si n=None) con longitud en
+            [min_length, max_length], en orden de longitud creciente.
+            El terminal ε cuenta como cadena vacía.
+        """
+        if min_length < 0 or max_length < min_length:
+             raise ValueError("Rango de longitudes inválido.")
+        with self.stats.phase('generation'):
+            strings = list(itertools.islice(self.iter_strings(max_length, min_length), n))
+        self.stats.count('strings_produced', len(strings))
+        return strings
+
+
+    def iter_strings(self, max_length=7, min_length=0, cancel=None):
+        """ Generador perezoso de enumerate_strings; cancel (threading.Event) lo detiene
+            con OperationCancelled, incluso mientras calcula una longitud
+        """
+        if min_length < 0 or max_length < min_length:
+             raise ValueError("Rango de longitudes inválido.")
+        enumerator = self.enumerator # Local: drop_generation_tables puede soltarlo desde otro hilo
+        if enumerator is None:
+             from StringGenerator import LengthEnumerator
+             with self.stats.phase('generator_build'):
+                  enumerator = self.enumerator = LengthEnumerator(self.start_symbol, self._generation_productions())
+        return enumerator.enumerate(max_length, min_length, cancel)
+
+
+    def _get_sampler(self):
+        """ Muestreador uniforme sobre la FNC (el terminal ε cuenta como cadena vacía) """
+        sampler = self.sampler
+        if sampler is None:
+             from StringGenerator import UniformSampler
+             with self.stats.phase('generator_build'):
+                  sampler = self.sampler = UniformSampler(self.start_symbol, self._generation_productions())
+        return sampler
+
+    def generation_bytes(self):
+        """ Memoria estimada de las tablas de generación (crecen con cada muestreo o enumeración) """
+        return sum(tables.bytes for tables in (self.sampler, self.enumerator) if tables is not None)
+
+    def drop_generation_tables(self):
+        """ Suelta las tablas de generación; se reconstruyen al volver a generar.
+            Quien esté generando conserva las suyas hasta terminar.
+        """
+        self.sampler = None
+        self.enumerator = None
+
+    def _generation_productions(self):
+        """ Producciones como pares (lhs, rhs) sin el terminal ε (que representa la cadena vacía) """
+        if not self._productions:
+             raise ValueError("La gramática no ha sido definida.")
+        return [(p.lhs(), tuple(sym for sym in p.rhs() if sym != EPSILON)) for p in self._productions]
+
+
+# --- Workers de validate_many (nivel de módulo para poder usarse en otros procesos) ---
+
+_worker_logic = None # Gramática compilada una vez por proceso worker
+
+def _init_validation_worker(grammar, simplify=False, lalr=None):
+    """ Inicializador del pool: compila la gramática (ParsedGrammar, ya tokenizada) en el worker """
+    global _worker_logic
+    _worker_logic = GrammarLogicNLTK(simplify=simplify)
+    _worker_logic.load_parsed_grammar(grammar)
+    if lalr is not None:
+        _worker_logic.lalr = lalr
 
+def _validate_chunk(chunk, results):
+    """ Valida un bloque de cadenas en el worker """
+    return [_worker_logic._validate_quiet(input_string, results) for input_string in chunk]
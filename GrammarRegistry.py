@@ -0,0 +1,210 @@
+# GrammarRegistry.py
+# Registro en memoria de gramáticas compiladas, compartido por los hilos del servidor (server.py).
+# Cada gramática se identifica por su huella (grammar_fingerprint, sobre las producciones ya
+# tokenizadas): clientes distintos que envían la misma gramática reutilizan el mismo GrammarLogicNLTK ya compilado, con sus parsers y su
+# caché de resultados. El total se acota con un presupuesto de memoria estimada y se expulsan
+# primero las gramáticas usadas hace más tiempo. Tras cada petición se vuelve a medir: la
+# caché de resultados y las tablas de generación crecen con el uso, y si la gramática en uso
+# sigue sin caber después de expulsar las demás, se sueltan sus tablas de generación.
+# Las peticiones comparten el GrammarLogicNLTK compilado sin serializarse: tras compilar solo
+# cambian la caché de resultados (con su propio lock), las tablas de generación (que crecen
+# bajo un lock) y los motores perezosos (construirlos dos veces da el mismo resultado). El lock
+# de cada entrada se toma únicamente mientras se compila.
+
+import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from GrammarIO import read_grammar_stream
+from GrammarLogic import GrammarLogicNLTK
+
+# Memoria de los objetos Python / tamaño del pickle del estado compilado (medido con tracemalloc)
+MEMORY_FACTOR = 6
+
+
+class GrammarCompileError(ValueError):
+    """ La gramática tiene errores fatales; messages es la lista de set_grammar """
+
+    def __init__(self, messages):
+        super().__init__("\n".join(messages))
+        self.messages = messages
+
+
+class UnknownGrammarError(KeyError):
+    """ La huella no corresponde a ninguna gramática registrada """
+
+
+class _Entry:
+    __slots__ = ('lock', 'logic', 'messages', 'bytes', 'error')
+
+    def __init__(self):
+        self.lock = threading.Lock() # Tomado mientras se compila (quien llega entonces espera)
+        self.logic = None            # GrammarLogicNLTK (None mientras se compila)
+        self.messages = []           # Advertencias de la compilación
+        self.bytes = 0               # Memoria estimada de la gramática compilada
+        self.error = None            # GrammarCompileError si la compilación falló
+
+
+class GrammarRegistry:
+    """ Gramáticas compiladas por huella, con expulsión LRU bajo max_bytes estimados.
+        cache (CompiledGrammarCache opcional) evita recompilar las que ya pasaron por disco.
+    """
+
+    def __init__(self, max_bytes, cache=None, simplify=False, stats=None, **logic_options):
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.simplify = simplify
+        self.stats = stats
+        self.logic_options = logic_options # Límites de la caché de resultados de cada gramática
+        self._entries = OrderedDict()      # huella -> _Entry (la más reciente al final)
+        self._lock = threading.Lock()
+        self.hits = 0        # Peticiones servidas con la gramática ya compilada
+        self.misses = 0      # Compilaciones
+        self.evictions = 0
+        self.generation_drops = 0 # Tablas de generación soltadas por falta de presupuesto
+
+    @contextmanager
+    def using(self, ref):
+        """ Contexto con (huella, logic, advertencias) de la gramática ref, ya compilada.
+            Varias peticiones pueden usar la misma gramática a la vez (ver el encabezado).
+            ref: huella de una gramática registrada, {"text": contenido .cfg} o
+            {"start", "terminals", "non_terminals", "productions": [[lhs, rhs], ...]}.
+            Lanza UnknownGrammarError si la huella no está registrada y GrammarCompileError si no compila.
+        """
+        fingerprint, entry = self._resolve(ref)
+        try:
+            yield fingerprint, entry.logic, entry.messages
+        finally:
+            self._evict(keep=fingerprint) # La caché de resultados o las tablas de generación pudieron crecer
+
+    def remove(self, fingerprint):
+        """ Quita una gramática del registro. False si no estaba """
+        with self._lock:
+            return self._entries.pop(fingerprint, None) is not None
+
+    def _resolve(self, ref):
+        if isinstance(ref, str):
+            with self._lock:
+                entry = self._entries.get(ref)
+                if entry is None:
+                    raise UnknownGrammarError(ref)
+                self._entries.move_to_end(ref)
+                self.hits += 1
+            return ref, self._wait(ref, entry)
+
+        if not isinstance(ref, dict):
+            raise ValueError("Error: 'grammar' debe ser una huella o un objeto con la gramática.")
+        messages = []
+        if "text" in ref:
+            parsed = read_grammar_stream(str(ref["text"]).splitlines())
+        else:
+            try:
+                spec = (ref["start"], ref["terminals"], ref["non_terminals"],
+                        [(lhs, rhs) for lhs, rhs in ref["productions"]])
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Error: Gramática incompleta o mal formada ({e}).") from e
+            # Las filas se segmentan aquí (barato) para que la huella vea los símbolos, no el texto
+            parsed, messages = GrammarLogicNLTK().parse_rows(*spec)
+            if parsed is None:
+                raise GrammarCompileError(messages)
+        load = lambda logic: messages + logic.load_parsed_grammar(parsed)
+        fingerprint = parsed.fingerprint()
+
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            created = entry is None
+            if created:
+                entry = self._entries[fingerprint] = _Entry()
+                entry.lock.acquire() # Antes de publicarla: nadie la ve a medio compilar
+                self.misses += 1
+            else:
+                self._entries.move_to_end(fingerprint)
+                self.hits += 1
+
+        if not created:
+            return fingerprint, self._wait(fingerprint, entry)
+        try:
+            self._compile(fingerprint, entry, load)
+        except BaseException:
+            self._discard(fingerprint, entry)
+            raise
+        finally:
+            entry.lock.release()
+        if entry.error is not None:
+            raise entry.error
+        return fingerprint, entry
+
+    def _wait(self, fingerprint, entry):
+        """ Espera a que termine la compilación de entry (si está en curso) """
+        with entry.lock:
+            pass
+        if entry.error is not None:
+            raise entry.error
+        if entry.logic is None: # La compilación falló con un error inesperado
+            raise UnknownGrammarError(fingerprint)
+        return entry
+
+    def _discard(self, fingerprint, entry):
+        with self._lock:
+            if self._entries.get(fingerprint) is entry:
+                del self._entries[fingerprint]
+
+    def _compile(self, fingerprint, entry, load):
+        logic = GrammarLogicNLTK(cache=self.cache, simplify=self.simplify, stats=self.stats,
+                                 **self.logic_options)
+        messages = load(logic)
+        if any("Error" in m for m in messages) or not logic.has_grammar():
+            entry.error = GrammarCompileError(messages or ["Error: Gramática inválida."])
+            self._discard(fingerprint, entry)
+            return
+
+        # Dejar listos los motores que usan las peticiones (parser de árboles y AFD)
+        lalr = None
+        if not logic.is_ll1():
+            logic.is_lalr1()
+            lalr = logic.lalr
+        logic.dfa
+        size = len(pickle.dumps((logic.compiled_state(), lalr), protocol=pickle.HIGHEST_PROTOCOL))
+        entry.bytes = size * MEMORY_FACTOR
+        entry.messages = messages
+        entry.logic = logic
+
+    def _evict(self, keep):
+        """ Expulsa las gramáticas menos usadas hasta entrar en max_bytes (nunca keep);
+            si aún no cabe, suelta las tablas de generación de keep
+        """
+        with self._lock:
+            total = self._total_bytes()
+            for fingerprint in list(self._entries):
+                if total <= self.max_bytes:
+                    break
+                entry = self._entries[fingerprint]
+                if fingerprint == keep or entry.logic is None: # Se está compilando
+                    continue
+                del self._entries[fingerprint] # Quien la esté usando la conserva hasta terminar
+                total -= self._entry_bytes(entry)
+                self.evictions += 1
+            entry = self._entries.get(keep)
+            if total > self.max_bytes and entry is not None and entry.logic is not None \
+                    and entry.logic.generation_bytes():
+                entry.logic.drop_generation_tables()
+                self.generation_drops += 1
+
+    @staticmethod
+    def _entry_bytes(entry):
+        return entry.bytes + entry.logic.result_cache.bytes + entry.logic.generation_bytes()
+
+    def _total_bytes(self):
+        return sum(self._entry_bytes(entry) for entry in self._entries.values() if entry.logic is not None)
+
+    def snapshot(self):
+        """ Estado del registro como dict serializable """
+        with self._lock:
+            grammars = [{"grammar": fingerprint, "type": entry.logic.grammar_type, "bytes": entry.bytes,
+                         "generation_bytes": entry.logic.generation_bytes(),
+                         "result_cache": entry.logic.result_cache.snapshot()}
+                        for fingerprint, entry in self._entries.items() if entry.logic is not None]
+            return {"entries": len(grammars), "bytes": self._total_bytes(), "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "generation_drops": self.generation_drops, "grammars": grammars}
@@ -0,0 +1,184 @@
+# GrammarSimplifier.py
+# Normalización opcional antes de construir el parser:
+#   1. Eliminar producciones ε (se conserva solo la del inicial si el lenguaje contiene ε)
+#   2. Colapsar cadenas de producciones unitarias (A -> B)
+#   3. Eliminar símbolos no productivos y luego los inalcanzables
+# Cada producción simplificada guarda una "plantilla": el fragmento de árbol de la
+# gramática original que representa, para volver a mostrar las derivaciones originales.
+# Las producciones son pares (lhs, rhs) con la convención de NLTK (terminales = str).
+
+from nltk import Nonterminal, Tree
+
+from GrammarAnalysis import nullable_symbols, productive_symbols
+
+
+class SimplifiedGrammar:
+    """ Resultado de simplify(): gramática reducida, plantillas y reporte """
+
+    def __init__(self, start, productions, templates, report):
+        self.start = start              # Puede ser un inicial nuevo (S') si S es anulable y recursivo
+        self.productions = productions  # [(lhs, rhs)] sin ε (salvo el inicial), unitarias ni inútiles
+        self._templates = templates     # (etiqueta, hijos) -> plantilla en la gramática original
+        self.report = report            # Contadores de lo eliminado
+
+    def expand_tree(self, tree):
+        """ Convierte un árbol de la gramática simplificada en uno de la original """
+        result = [None]
+        stack = [(tree, result, 0)]
+        while stack:
+            node, container, index = stack.pop()
+            if not isinstance(node, Tree):
+                container[index] = node # Terminal
+                continue
+            template = self._templates[_tree_key(node)]
+            if isinstance(template, int): # S' -> S: el nodo es directamente su hijo
+                stack.append((node[template], container, index))
+                continue
+            copy, slots = _instantiate(template)
+            container[index] = copy
+            for slot, slot_container, slot_index in slots:
+                stack.append((node[slot], slot_container, slot_index))
+        return result[0]
+
+
+def _tree_key(node):
+    """ Clave de la producción usada en un nodo: (etiqueta, hijos) """
+    return (node.label(), tuple(('NT', child.label()) if isinstance(child, Tree) else child for child in node))
+
+
+def _production_key(lhs, rhs):
+    return (str(lhs), tuple(sym if isinstance(sym, str) else ('NT', str(sym)) for sym in rhs))
+
+
+def _instantiate(template):
+    """ Copia la plantilla; devuelve (copia, [(hueco, lista, posición)]) con los huecos a rellenar """
+    slots = []
+    root = Tree(template.label(), [])
+    stack = [(template, root)]
+    while stack:
+        source, target = stack.pop()
+        for child in source:
+            if isinstance(child, int):
+                slots.append((child, target, len(target)))
+                target.append(None)
+            elif isinstance(child, Tree):
+                sub = Tree(child.label(), [])
+                target.append(sub)
+                stack.append((child, sub))
+            else:
+                target.append(child)
+    return root, slots
+
+
+def _substitute(template, slot_template):
+    """ Plantilla de una unitaria (un solo hueco, el 0) con el hueco reemplazado """
+    if isinstance(template, int):
+        return slot_template
+    return Tree(template.label(), [_substitute(child, slot_template) if isinstance(child, (int, Tree)) else child
+                                   for child in template])
+
+
+def _epsilon_trees(productions, nullable):
+    """ Para cada anulable, un árbol (original) que deriva ε sin ciclos """
+    trees = {}
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in productions:
+            if lhs in nullable and lhs not in trees and all(sym in trees for sym in rhs):
+                trees[lhs] = Tree(str(lhs), [trees[sym] for sym in rhs])
+                changed = True
+    return trees
+
+
+def simplify(start_symbol, productions):
+    """ Devuelve un SimplifiedGrammar equivalente (mismo lenguaje) a la gramática dada """
+    productions = [(lhs, tuple(rhs)) for lhs, rhs in productions]
+    original_nts = {lhs for lhs, _ in productions} | {start_symbol}
+    report = {'productions_before': len(productions), 'nonterminals_before': len(original_nts)}
+
+    # 1. Producciones ε: cada producción se expande en las variantes que omiten anulables
+    nullable = nullable_symbols(productions)
+    epsilon_trees = _epsilon_trees(productions, nullable)
+    step = []
+    for lhs, rhs in productions:
+        variants = [((), ())] # (símbolos conservados, hijos de la plantilla)
+        for sym in rhs:
+            next_variants = []
+            for kept, children in variants:
+                next_variants.append((kept + (sym,), children + (len(kept),)))
+                if sym in nullable:
+                    next_variants.append((kept, children + (epsilon_trees[sym],)))
+            variants = next_variants
+        for kept, children in variants:
+            if kept:
+                step.append((lhs, kept, Tree(str(lhs), list(children))))
+    report['epsilon_rules_removed'] = sum(1 for _, rhs in productions if not rhs)
+
+    # 2. Unitarias: A -> B1 -> ... -> B -> α se reemplaza por A -> α (plantilla compuesta)
+    units = {}
+    non_unit = {}
+    for lhs, rhs, template in step:
+        if len(rhs) == 1 and not isinstance(rhs[0], str):
+            units.setdefault(lhs, []).append((rhs[0], template))
+        else:
+            non_unit.setdefault(lhs, []).append((rhs, template))
+    report['unit_rules_removed'] = sum(len(v) for v in units.values())
+
+    simplified = {} # clave -> (lhs, rhs, plantilla); se conserva la primera de cada producción
+    for lhs in {lhs for lhs, _, _ in step}:
+        chain = {lhs: 0} # no terminal alcanzado por unitarias -> plantilla con un hueco
+        queue = [lhs]
+        while queue:
+            current = queue.pop(0)
+            for target, template in units.get(current, ()):
+                if target not in chain:
+                    chain[target] = _substitute(chain[current], template)
+                    queue.append(target)
+        for reached, prefix in chain.items():
+            for rhs, template in non_unit.get(reached, ()):
+                key = _production_key(lhs, rhs)
+                if key not in simplified:
+                    simplified[key] = (lhs, rhs, _substitute(prefix, template))
+
+    # 3. Símbolos inútiles: primero no productivos, luego inalcanzables
+    pairs = [(lhs, rhs) for lhs, rhs, _ in simplified.values()]
+    productive = productive_symbols(pairs)
+    kept = [(lhs, rhs, t) for lhs, rhs, t in simplified.values()
+            if lhs in productive and all(isinstance(sym, str) or sym in productive for sym in rhs)]
+    reachable = {start_symbol}
+    queue = [start_symbol]
+    by_lhs = {}
+    for lhs, rhs, t in kept:
+        by_lhs.setdefault(lhs, []).append(rhs)
+    while queue:
+        for rhs in by_lhs.get(queue.pop(), ()):
+            for sym in rhs:
+                if not isinstance(sym, str) and sym not in reachable:
+                    reachable.add(sym)
+                    queue.append(sym)
+    kept = [(lhs, rhs, t) for lhs, rhs, t in kept if lhs in reachable]
+
+    # 4. ε en el lenguaje: S -> ε (con un inicial nuevo S' -> S | ε si S aparece a la derecha)
+    start = start_symbol
+    if start_symbol in nullable:
+        if any(start_symbol in rhs for _, rhs, _ in kept):
+            existing = {str(nt) for nt in original_nts}
+            name = str(start_symbol) + "'"
+            while name in existing:
+                name += "'"
+            start = Nonterminal(name)
+            if start_symbol in reachable and start_symbol in productive:
+                kept.append((start, (start_symbol,), 0))
+        kept.append((start, (), epsilon_trees[start_symbol]))
+
+    templates = {_production_key(lhs, rhs): t for lhs, rhs, t in kept}
+    result = [(lhs, rhs) for lhs, rhs, _ in kept]
+    final_nts = {lhs for lhs, _ in result} | {start}
+    report['productions_after'] = len(result)
+    report['nonterminals_after'] = len(final_nts)
+    report['nonproductive_removed'] = sorted(str(nt) for nt in original_nts - productive - nullable)
+    report['unreachable_removed'] = sorted(str(nt) for nt in (original_nts & (productive | nullable)) - reachable - {start_symbol})
+    report['productions_removed'] = report['productions_before'] - report['productions_after']
+    report['nonterminals_removed'] = max(0, report['nonterminals_before'] - report['nonterminals_after'])
+    return SimplifiedGrammar(start, result, templates, report)
@@ -0,0 +1,88 @@
+# Instrumentation.py
+# Temporizadores por fase y contadores para las rutas calientes (reemplaza las trazas DEBUG).
+# Desactivado no mide nada: phase() devuelve un contexto vacío compartido y count() retorna
+# en la primera comprobación. Los datos se exportan como dict (snapshot) o JSON.
+# Activado es seguro entre hilos (server.py comparte una instancia): un lock protege las
+# actualizaciones y la copia de snapshot.
+
+import json
+import threading
+import time
+
+
+class _NullPhase:
+    """ Contexto que no hace nada (se reutiliza la misma instancia) """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """ Temporizadores (llamadas, total, máximo) y contadores con nombre """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}    # nombre -> [llamadas, segundos totales, máximo]
+            self.counters = {}  # nombre -> entero
+
+    def phase(self, name):
+        """ Contexto que mide la duración de una fase: with stats.phase('parse'): ... """
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """ Copia de las métricas como dict serializable """
+        with self._lock:
+            return {
+                'timers': {name: {'calls': calls, 'total_s': total, 'mean_s': total / calls, 'max_s': peak}
+                           for name, (calls, total, peak) in sorted(self.timers.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def to_json(self, indent=None):
+        return json.dumps(self.snapshot(), indent=indent)
@@ -0,0 +1,248 @@
+# LALRParser.py
+# Tablas LALR(1) (acción/goto) y parser desplazamiento-reducción lineal.
+#  - Colección canónica LR(0) (estados = conjuntos de ítems núcleo)
+#  - Lookaheads LALR por generación espontánea y propagación (algoritmo del libro del dragón:
+#    cierre LR(1) de cada ítem núcleo con el lookahead ficticio '#')
+#  - Tabla de acciones con conflictos registrados (estado, lookahead, acciones e ítems)
+# Todo el estado son listas, dicts, str y Nonterminal: se serializa con pickle (la caché
+# en disco de GrammarCache guarda las tablas ya construidas).
+# Como LL1Parser, el parseo devuelve la única derivación como ParseForest.
+
+from nltk import Nonterminal
+
+from Cancellation import check_cancelled
+from GrammarAnalysis import END_MARKER, first_of_sequence, first_sets, nullable_symbols
+from ParseForest import ParseForest
+
+_PROPAGATE = object() # Lookahead ficticio '#' durante la construcción (no queda en las tablas)
+ACCEPT = -1           # Código de acción de S' -> S . con fin de entrada (reducir la producción 0)
+
+
+class LALR1Parser:
+    """ Tablas LALR(1) de una gramática (pares (lhs, rhs) con la convención de NLTK).
+
+        action[estado][terminal o END_MARKER]: j >= 0 desplaza al estado j, -p-1 reduce
+        por la producción p (ACCEPT = reducir la producción aumentada). goto[estado][A].
+    """
+
+    def __init__(self, start_symbol, productions):
+        names = {str(lhs) for lhs, _ in productions} | {str(start_symbol)}
+        name = str(start_symbol) + "'"
+        while name in names:
+            name += "'"
+        self.start = start_symbol
+        augmented = Nonterminal(name)
+        self.productions = [(augmented, (start_symbol,))] + [(lhs, tuple(rhs)) for lhs, rhs in productions]
+        self._by_lhs = {}
+        for index, (lhs, _) in enumerate(self.productions):
+            self._by_lhs.setdefault(lhs, []).append(index)
+        self._nullable = nullable_symbols(self.productions)
+        self._first = first_sets(self.productions, self._nullable)
+
+        self.kernels, self.goto = self._lr0_states()
+        lookaheads = self._lookaheads()
+        self.action, self.conflicts = self._build_actions(lookaheads)
+        self.goto = [{sym: j for sym, j in row.items() if not isinstance(sym, str)} for row in self.goto]
+        del self._by_lhs, self._nullable, self._first # Solo se necesitan para construir
+
+    @property
+    def state_count(self):
+        return len(self.action)
+
+    @property
+    def is_lalr1(self):
+        return not self.conflicts
+
+    # --- Construcción ---
+
+    def _lr0_closure(self, kernel):
+        items = list(kernel)
+        seen = set(items)
+        for p, d in items: # La lista crece mientras se recorre
+            rhs = self.productions[p][1]
+            if d < len(rhs) and not isinstance(rhs[d], str):
+                for q in self._by_lhs.get(rhs[d], ()):
+                    if (q, 0) not in seen:
+                        seen.add((q, 0))
+                        items.append((q, 0))
+        return items
+
+    def _lr0_states(self):
+        """ Estados LR(0) como tuplas ordenadas de ítems núcleo (producción, punto) y sus transiciones """
+        kernels = [((0, 0),)]
+        index = {kernels[0]: 0}
+        goto = []
+        for kernel in kernels: # La lista crece mientras se recorre
+            moves = {}
+            for p, d in self._lr0_closure(kernel):
+                rhs = self.productions[p][1]
+                if d < len(rhs):
+                    moves.setdefault(rhs[d], []).append((p, d + 1))
+            row = {}
+            for sym, items in moves.items():
+                target = tuple(sorted(set(items)))
+                if target not in index:
+                    index[target] = len(kernels)
+                    kernels.append(target)
+                row[sym] = index[target]
+            goto.append(row)
+        return kernels, goto
+
+    def _lr1_closure(self, kernel):
+        """ Cierre LR(1) con lookaheads como conjuntos: {(producción, punto): {lookaheads}} """
+        items = {item: set(las) for item, las in kernel.items()}
+        work = list(items)
+        while work:
+            p, d = item = work.pop()
+            rhs = self.productions[p][1]
+            if d >= len(rhs) or isinstance(rhs[d], str):
+                continue
+            las, rest_nullable = first_of_sequence(rhs[d + 1:], self._first, self._nullable)
+            if rest_nullable:
+                las = las | items[item]
+            for q in self._by_lhs.get(rhs[d], ()):
+                current = items.get((q, 0))
+                if current is None:
+                    items[(q, 0)] = set(las)
+                    work.append((q, 0))
+                elif not las <= current:
+                    current |= las
+                    work.append((q, 0))
+        return items
+
+    def _lookaheads(self):
+        """ Lookaheads de cada ítem núcleo: generación espontánea + propagación hasta punto fijo """
+        lookaheads = [{item: set() for item in kernel} for kernel in self.kernels]
+        lookaheads[0][(0, 0)].add(END_MARKER)
+        propagates = {} # (estado, ítem) -> [(estado, ítem)]
+        for state, kernel in enumerate(self.kernels):
+            for k in kernel:
+                for (p, d), las in self._lr1_closure({k: {_PROPAGATE}}).items():
+                    rhs = self.productions[p][1]
+                    if d >= len(rhs):
+                        continue
+                    target = (self.goto[state][rhs[d]], (p, d + 1))
+                    for la in las:
+                        if la is _PROPAGATE:
+                            propagates.setdefault((state, k), []).append(target)
+                        else:
+                            lookaheads[target[0]][target[1]].add(la)
+
+        work = [(state, item) for state, kernel in enumerate(lookaheads) for item in kernel if kernel[item]]
+        while work:
+            state, item = work.pop()
+            source = lookaheads[state][item]
+            for target_state, target_item in propagates.get((state, item), ()):
+                target = lookaheads[target_state][target_item]
+                if not source <= target:
+                    target |= source
+                    work.append((target_state, target_item))
+        return lookaheads
+
+    def _build_actions(self, lookaheads):
+        action = []
+        conflicts = []
+        for state, kernel_las in enumerate(lookaheads):
+            candidates = {} # lookahead -> [códigos]
+            for (p, d), las in self._lr1_closure(kernel_las).items():
+                rhs = self.productions[p][1]
+                if d < len(rhs):
+                    if isinstance(rhs[d], str):
+                        candidates.setdefault(rhs[d], set()).add(self.goto[state][rhs[d]])
+                else:
+                    for la in las:
+                        candidates.setdefault(la, set()).add(-p - 1)
+            row = {}
+            for la, codes in candidates.items():
+                if len(codes) > 1:
+                    conflicts.append((state, la, sorted(codes, reverse=True)))
+                row[la] = max(codes) # Con conflicto: desplazar, o la primera producción
+            action.append(row)
+        conflicts.sort(key=lambda c: (c[0], '' if c[1] is END_MARKER else c[1]))
+        return action, conflicts
+
+    # --- Reportes ---
+
+    def conflict_messages(self, limit=None):
+        """ Descripción de cada conflicto: estado, lookahead, acciones en disputa e ítems núcleo """
+        messages = []
+        for state, lookahead, codes in self.conflicts[:limit]:
+            shown = "fin de entrada" if lookahead is END_MARKER else f"'{lookahead}'"
+            kind = "desplazamiento/reducción" if codes[0] >= 0 else "reducción/reducción"
+            actions = " | ".join(f"desplazar a {code}" if code >= 0 else
+                                 f"reducir {self._item_text(-code - 1, None)}" for code in codes)
+            items = "; ".join(self._item_text(p, d) for p, d in self.kernels[state])
+            messages.append(f"Conflicto {kind} en estado {state} con {shown}: {actions} [{items}]")
+        return messages
+
+    def _item_text(self, p, dot):
+        lhs, rhs = self.productions[p]
+        symbols = [f"'{sym}'" if isinstance(sym, str) else str(sym) for sym in rhs]
+        if dot is not None:
+            symbols.insert(dot, "•")
+        return f"{lhs} -> " + (" ".join(symbols) or "ε")
+
+    # --- Parseo ---
+
+    def recognize(self, tokens, cancel=None, stats=None):
+        """ True si la cadena pertenece al lenguaje """
+        return self._run(tokens, cancel, stats, build=False) is not None
+
+    def parse(self, tokens, cancel=None, stats=None):
+        """ ParseForest con la única derivación (vacío si la cadena no pertenece) """
+        result = self._run(tokens, cancel, stats, build=True)
+        if result is None:
+            return ParseForest(None, None)
+        root, families = result
+        forest = ParseForest(root, lambda node: (families[node],))
+        forest.size_hint = 650 * len(families) # Por nodo, con los memos del conteo (medido con tracemalloc)
+        return forest
+
+    def _run(self, tokens, cancel, stats, build):
+        """ Desplazamiento-reducción. Cada entrada de la pila guarda (estado, valor, inicio):
+            el valor es el terminal desplazado o el nodo (A, inicio, fin) reducido.
+        """
+        if not self.is_lalr1:
+            raise ValueError("Error: La gramática no es LALR(1).")
+        action, goto, productions = self.action, self.goto, self.productions
+        n = len(tokens)
+        families = {}
+        states = [0]
+        values = []
+        starts = []
+        pos = 0
+        steps = 0
+        try:
+            while True:
+                steps += 1
+                if not steps & 0xFFF: # Cada 4096 pasos
+                    check_cancelled(cancel)
+                code = action[states[-1]].get(tokens[pos] if pos < n else END_MARKER)
+                if code is None:
+                    return None
+                if code >= 0: # Desplazar
+                    states.append(code)
+                    values.append(tokens[pos])
+                    starts.append(pos)
+                    pos += 1
+                    continue
+                if code == ACCEPT:
+                    return (values[0], families) if build else True
+                lhs, rhs = productions[-code - 1]
+                k = len(rhs)
+                if k:
+                    start = starts[-k]
+                    children = tuple(values[-k:])
+                    del states[-k:], values[-k:], starts[-k:]
+                else:
+                    start = pos
+                    children = ()
+                node = (lhs, start, pos)
+                if build:
+                    families[node] = children
+                states.append(goto[states[-1]][lhs])
+                values.append(node)
+                starts.append(start)
+        finally:
+            if stats is not None and stats.enabled:
+                stats.count('lalr_steps', steps)
@@ -0,0 +1,126 @@
+# LLParser.py
+# Parser predictivo dirigido por tabla para gramáticas LL(1).
+# La tabla M[A, a] indica qué producción de A usar con el terminal a por delante
+# (END_MARKER = fin de la entrada). Si alguna celda tiene más de una producción la
+# gramática no es LL(1) y la lista de conflictos lo explica.
+# El parseo es lineal y construye una sola derivación, devuelta como ParseForest
+# (una familia por nodo) para que el resto de la aplicación la trate igual que el
+# bosque del parser Earley.
+
+from Cancellation import check_cancelled
+from GrammarAnalysis import END_MARKER, first_of_sequence, first_sets, follow_sets, nullable_symbols
+from ParseForest import ParseForest
+
+_END_FRAME = object() # Marca en la pila: la producción del marco actual terminó
+
+
+class LL1Parser:
+    """ Tabla LL(1) de una gramática (pares (lhs, rhs) con la convención de NLTK) """
+
+    def __init__(self, start_symbol, productions):
+        self.start = start_symbol
+        self.productions = [(lhs, tuple(rhs)) for lhs, rhs in productions]
+        self.nullable = nullable_symbols(self.productions)
+        self.first = first_sets(self.productions, self.nullable)
+        self.follow = follow_sets(start_symbol, self.productions, self.first, self.nullable)
+
+        table = {} # (A, terminal o END_MARKER) -> [índices de producción]
+        for index, (lhs, rhs) in enumerate(self.productions):
+            lookaheads, rhs_nullable = first_of_sequence(rhs, self.first, self.nullable)
+            if rhs_nullable:
+                lookaheads = lookaheads | self.follow.get(lhs, set())
+            for lookahead in lookaheads:
+                cell = table.setdefault((lhs, lookahead), [])
+                if index not in cell:
+                    cell.append(index)
+
+        # Conflictos: (A, lookahead, [producciones]) ordenados para un reporte estable
+        self.conflicts = sorted(((lhs, la, cell) for (lhs, la), cell in table.items() if len(cell) > 1),
+                                key=lambda c: (str(c[0]), '' if c[1] is END_MARKER else c[1]))
+        self.table = {key: cell[0] for key, cell in table.items()}
+
+    @property
+    def is_ll1(self):
+        return not self.conflicts
+
+    def conflict_messages(self, limit=None):
+        """ Descripción legible de los conflictos (como mucho limit) """
+        messages = []
+        for lhs, lookahead, cell in self.conflicts[:limit]:
+            shown = "fin de entrada" if lookahead is END_MARKER else f"'{lookahead}'"
+            options = " | ".join(self._production_text(i) for i in cell)
+            messages.append(f"{lhs} con {shown}: {options}")
+        return messages
+
+    def _production_text(self, index):
+        lhs, rhs = self.productions[index]
+        return f"{lhs} -> " + (" ".join(f"'{sym}'" if isinstance(sym, str) else str(sym) for sym in rhs) or "ε")
+
+    # --- Parseo ---
+
+    def recognize(self, tokens, cancel=None, stats=None):
+        """ True si la cadena pertenece al lenguaje """
+        return self._run(tokens, cancel, stats, build=False) is not None
+
+    def parse(self, tokens, cancel=None, stats=None):
+        """ ParseForest con la única derivación (vacío si la cadena no pertenece) """
+        result = self._run(tokens, cancel, stats, build=True)
+        if result is None:
+            return ParseForest(None, None)
+        root, families = result
+        forest = ParseForest(root, lambda node: (families[node],))
+        forest.size_hint = 650 * len(families) # Por nodo, con los memos del conteo (medido con tracemalloc)
+        return forest
+
+    def _run(self, tokens, cancel, stats, build):
+        """ Análisis predictivo con pila explícita. Devuelve (raíz, familias) si build,
+            True si no, o None si la cadena no pertenece.
+            Cada marco guarda [no terminal, inicio, hijos]; al cerrarlo se registra el nodo
+            (A, inicio, fin) con su única familia.
+        """
+        if not self.is_ll1:
+            raise ValueError("Error: La gramática no es LL(1).")
+        table, productions = self.table, self.productions
+        n = len(tokens)
+        families = {}
+        root_frame = [None, 0, []]
+        frames = [root_frame]
+        stack = [self.start]
+        pos = 0
+        steps = 0
+        try:
+            while stack:
+                steps += 1
+                if not steps & 0xFFF: # Cada 4096 pasos
+                    check_cancelled(cancel)
+                sym = stack.pop()
+                if sym is _END_FRAME:
+                    lhs, start, children = frames.pop()
+                    if build:
+                        node = (lhs, start, pos)
+                        families[node] = tuple(children)
+                        frames[-1][2].append(node)
+                    continue
+                lookahead = tokens[pos] if pos < n else END_MARKER
+                if isinstance(sym, str):
+                    if sym != lookahead:
+                        return None
+                    if build:
+                        frames[-1][2].append(sym)
+                    pos += 1
+                    continue
+                index = table.get((sym, lookahead))
+                if index is None:
+                    return None
+                frames.append([sym, pos, []])
+                stack.append(_END_FRAME)
+                stack.extend(reversed(productions[index][1]))
+        finally:
+            if stats is not None and stats.enabled:
+                stats.count('ll1_steps', steps)
+
+        if pos != n:
+            return None
+        if not build:
+            return True
+        return root_frame[2][0], families
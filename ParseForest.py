@@ -0,0 +1,267 @@
+# ParseForest.py
+# Bosque de parseo compartido y empaquetado (SPPF).
+# Un nodo es una tupla (no_terminal, inicio, fin); cada nodo tiene una lista de
+# "familias" (alternativas empaquetadas), y cada familia es una tupla de hijos:
+# nodos (tuplas) o terminales (str).
+
+from nltk import Tree
+
+from Cancellation import check_cancelled
+
+
+class ParseForest:
+    """ Resultado de un parseo: cuenta exacta de derivaciones por programación dinámica
+        y árboles construidos de forma perezosa, uno a uno, bajo demanda.
+    """
+
+    def __init__(self, root, families):
+        self.root = root            # Nodo raíz (S, 0, n) o None si no hay parseo
+        self._families = families   # Función nodo -> lista de familias (se memoiza)
+        self._family_cache = {}
+        self._counts = None         # clave -> número de derivaciones (tras podar ciclos)
+        self._kept = None           # clave -> [(familia, cuenta, cuentas_hijos, claves_hijos)]
+        self._root_key = None       # Clave de la raíz en _counts
+        self.transform = None       # Función árbol -> árbol que aplica tree() (ej. volver a la gramática original)
+        self.size_hint = 0          # Bytes aproximados que retiene (chart + memos tras contar); lo fija el parser
+
+    def _get_families(self, node):
+        fams = self._family_cache.get(node)
+        if fams is None:
+            fams = self._family_cache[node] = list(self._families(node))
+        return fams
+
+    def __bool__(self):
+        return self.root is not None
+
+    def __iter__(self):
+        return self.trees()
+
+    # --- Conteo ---
+
+    def count(self, cancel=None):
+        """ Número exacto de derivaciones distintas (se descartan las cíclicas: ningún nodo
+            se repite en un camino de la raíz a una hoja). cancel (threading.Event) detiene
+            el conteo con OperationCancelled; es de cada llamada, porque el bosque puede estar
+            compartido (caché de resultados) por trabajos con cancelaciones distintas.
+        """
+        if self.root is None:
+            return 0
+        if self._counts is None:
+            self._prune_and_count(cancel)
+        return self._counts[self._root_key]
+
+    def _children(self, node):
+        for fam in self._get_families(node):
+            for child in fam:
+                if isinstance(child, tuple):
+                    yield child
+
+    def _cyclic_components(self, cancel=None):
+        """ Tarjan iterativo sobre el grafo nodo -> hijos. Devuelve nodo -> frozenset de su
+            componente fuertemente conexa, solo para los nodos que están en un ciclo
+        """
+        index = {self.root: 0}
+        low = {self.root: 0}
+        scc_stack = [self.root]
+        on_stack = {self.root}
+        self_loops = set()
+        cyclic = {}
+        work = [(self.root, self._children(self.root))]
+        steps = 0
+        while work:
+            steps += 1
+            if not steps & 0xFFF: # Cada 4096 pasos
+                check_cancelled(cancel)
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    scc_stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, self._children(child)))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+                    if child == node:
+                        self_loops.add(node)
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self_loops:
+                        component = frozenset(component)
+                        for member in component:
+                            cyclic[member] = component
+        return cyclic
+
+    def _prune_and_count(self, cancel=None):
+        """ Cuenta en post-orden sobre la condensación en componentes fuertemente conexas.
+            Fuera de los ciclos la cuenta de un nodo no depende del camino y se memoiza por
+            nodo. Dentro de un ciclo depende de qué nodos de su componente ya están en el
+            camino (solo a ellos puede volver): la clave es (nodo, ancestros de la componente)
+            y se descartan las familias que repetirían un nodo del camino.
+        """
+        cyclic = self._cyclic_components(cancel)
+        empty = frozenset()
+
+        def key_of(node, path, component):
+            node_component = cyclic.get(node)
+            if node_component is None:
+                return node
+            return (node, path if node_component is component else empty)
+
+        self._root_key = key_of(self.root, empty, None)
+        counts = {}
+        kept = {}   # clave -> [(familia, cuenta, cuentas_hijos, claves_hijos o None)]
+        pending = {} # clave -> [(familia, claves_hijos)] entre la primera y la segunda visita
+        stack = [self._root_key]
+        steps = 0
+
+        while stack:
+            steps += 1
+            if not steps & 0xFFF: # Cada 4096 pasos
+                check_cancelled(cancel)
+            key = stack[-1]
+            if key in counts:
+                stack.pop()
+                continue
+            families = pending.pop(key, None)
+            if families is None: # Primera visita: calcular antes los hijos
+                families = pending[key] = self._key_families(key, cyclic, key_of)
+                stack.extend(child for _, child_keys in families for child in child_keys
+                             if isinstance(child, tuple) and child not in counts)
+                continue
+
+            total = 0
+            useful = []
+            for fam, child_keys in families:
+                child_counts = tuple(counts[ch] if isinstance(ch, tuple) else 1 for ch in child_keys)
+                fam_count = 1
+                for c in child_counts:
+                    fam_count *= c
+                if fam_count:
+                    useful.append((fam, fam_count, child_counts, None if child_keys is fam or child_keys == fam else child_keys))
+                    total += fam_count
+            counts[key] = total
+            kept[key] = useful
+            stack.pop()
+
+        self._kept = kept # Antes que _counts: count() publica el resultado (bosques compartidos entre hilos)
+        self._counts = counts
+
+    def _key_families(self, key, cyclic, key_of):
+        """ Familias de la clave con las claves de sus hijos, sin las que cierran un ciclo """
+        if not cyclic: # Bosque sin ciclos: la clave es el nodo
+            return [(fam, fam) for fam in self._get_families(key)]
+        if type(key[1]) is frozenset: # Nodo dentro de un ciclo
+            node, ancestors = key
+            component = cyclic[node]
+            path = ancestors | {node}
+        else:
+            node, component, path = key, None, frozenset()
+        families = []
+        for fam in self._get_families(node):
+            if path and any(child in path for child in fam if isinstance(child, tuple)):
+                continue # Repetiría un nodo del camino: derivación cíclica
+            families.append((fam, tuple(key_of(child, path, component) if isinstance(child, tuple) else child
+                                        for child in fam)))
+        return families
+
+    # --- Árboles ---
+
+    def tree(self, index=0):
+        """ Construye (iterativamente) el árbol número index en el orden del bosque """
+        self._check_index(index)
+        root_tree = Tree(str(self.root[0]), [])
+        stack = [(self._root_key, index, root_tree)]
+        while stack:
+            key, k, tree = stack.pop()
+            for child, child_key, child_index in self._select(key, k):
+                if isinstance(child, tuple):
+                    subtree = Tree(str(child[0]), [])
+                    tree.append(subtree)
+                    stack.append((child_key, child_index, subtree))
+                else:
+                    tree.append(child)
+        return self.transform(root_tree) if self.transform else root_tree
+
+    def lazy_tree(self, index=0):
+        """ Raíz del árbol número index como ForestNode: cada nodo decodifica sus hijos al
+            recorrerlos, así que mostrar la raíz no construye el resto del árbol.
+            Con transform se devuelve tree(index) (la transformación necesita el árbol entero).
+        """
+        self._check_index(index)
+        if self.transform:
+            return self.tree(index)
+        return ForestNode(self, self.root, self._root_key, index)
+
+    def _check_index(self, index):
+        total = self.count()
+        if not 0 <= index < total:
+            raise IndexError(f"Árbol {index} fuera de rango (hay {total}).")
+
+    def _select(self, key, k):
+        """ Hijos de la derivación número k de la clave: [(hijo, clave_hijo, índice_hijo)] """
+        for fam, fam_count, child_counts, child_keys in self._kept[key]:
+            if k < fam_count:
+                break
+            k -= fam_count
+        # Decodificar k en base mixta: un índice por hijo
+        children = []
+        for child, child_key, c in zip(fam, child_keys or fam, child_counts):
+            k, child_index = divmod(k, c)
+            children.append((child, child_key, child_index))
+        return children
+
+    def first_tree(self):
+        """ Primer árbol de derivación o None si la cadena no pertenece """
+        return self.tree(0) if self.count() else None
+
+    def trees(self, start=0):
+        """ Generador perezoso de árboles a partir del índice start """
+        index = start
+        while index < self.count():
+            yield self.tree(index)
+            index += 1
+
+
+class ForestNode:
+    """ Nodo de un árbol de derivación del bosque que decodifica sus hijos al pedirlos.
+        Imita lo que se lee de nltk.Tree: label(), len(), iteración e índices; los hijos
+        son ForestNode o terminales (str).
+    """
+    __slots__ = ('_forest', '_node', '_key', '_index', '_children')
+
+    def __init__(self, forest, node, key, index):
+        self._forest = forest
+        self._node = node       # (no_terminal, inicio, fin)
+        self._key = key         # Clave en los conteos del bosque
+        self._index = index     # Número de derivación del nodo
+        self._children = None
+
+    def label(self):
+        return str(self._node[0])
+
+    def _get_children(self):
+        if self._children is None:
+            self._children = [ForestNode(self._forest, child, child_key, child_index) if isinstance(child, tuple)
+                              else child for child, child_key, child_index in self._forest._select(self._key, self._index)]
+        return self._children
+
+    def __len__(self):
+        return len(self._get_children())
+
+    def __iter__(self):
+        return iter(self._get_children())
+
+    def __getitem__(self, i):
+        return self._get_children()[i]
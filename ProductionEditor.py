@@ -0,0 +1,139 @@
+# ProductionEditor.py
+# Editor de producciones virtualizado: el modelo es una lista de [lhs, rhs] y solo
+# existen widgets para las filas visibles. Al desplazarse, las mismas filas se
+# reasignan a otras posiciones del modelo (cargar miles de producciones es inmediato).
+
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 26 # Alto aproximado de una fila en píxeles (para calcular cuántas caben)
+
+
+class ProductionEditor(ttk.Frame):
+    """ Lista editable de producciones (LHS -> RHS) con un conjunto fijo de filas visibles """
+
+    def __init__(self, master, height=150, **kwargs):
+        super().__init__(master, height=height, **kwargs)
+        self.rows = []      # Modelo: [[lhs, rhs], ...]
+        self.top = 0        # Índice del modelo mostrado en la primera fila visible
+        self._pool = []     # Filas de widgets: {'frame', 'lhs_var', 'rhs_var', 'lhs', 'rhs', 'remove'}
+        self._binding = False # True mientras se cargan valores en las filas (no escribir al modelo)
+
+        self.grid_propagate(False)
+        self.body = ttk.Frame(self)
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.bind("<Configure>", self._on_configure)
+        for widget in (self, self.body):
+            widget.bind("<MouseWheel>", self._on_mousewheel)     # Windows / macOS
+            widget.bind("<Button-4>", lambda e: self.scroll(-1)) # Linux
+            widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    # --- Modelo ---
+
+    def get_rows(self):
+        """ Producciones como lista de tuplas (lhs, rhs) """
+        return [(lhs, rhs) for lhs, rhs in self.rows]
+
+    def set_rows(self, rows):
+        """ Reemplaza todo el modelo de una vez y redibuja una sola vez """
+        self.rows = [[lhs, rhs] for lhs, rhs in rows]
+        self.top = 0
+        self.render()
+
+    def add_row(self, lhs="", rhs=""):
+        """ Añade una fila al final y la hace visible """
+        self.rows.append([lhs, rhs])
+        self.top = max(0, len(self.rows) - len(self._pool))
+        self.render()
+
+    def remove_row(self, index):
+        if 0 <= index < len(self.rows):
+            del self.rows[index]
+            self.render()
+
+    def clear(self):
+        self.rows = []
+        self.top = 0
+        self.render()
+
+    # --- Vista ---
+
+    def _on_configure(self, event):
+        self._resize_pool(max(1, event.height // ROW_HEIGHT))
+        self.render()
+
+    def _resize_pool(self, count):
+        """ Crea o destruye filas de widgets para que haya exactamente count """
+        while len(self._pool) < count:
+            slot = len(self._pool)
+            frame = ttk.Frame(self.body)
+            lhs_var, rhs_var = tk.StringVar(), tk.StringVar()
+            lhs = ttk.Entry(frame, width=10, textvariable=lhs_var, font=('Helvetica', 10)) # LHS editable
+            lhs.pack(side=tk.LEFT)
+            arrow = ttk.Label(frame, text=" ->")
+            arrow.pack(side=tk.LEFT, padx=(0, 5))
+            rhs = ttk.Entry(frame, textvariable=rhs_var, font=('Helvetica', 10))
+            rhs.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+            remove = ttk.Button(frame, text="X", width=2, style="Toolbutton",
+                                command=lambda s=slot: self.remove_row(self.top + s))
+            remove.pack(side=tk.RIGHT)
+            lhs_var.trace_add("write", lambda *_, s=slot: self._on_edit(s, 0))
+            rhs_var.trace_add("write", lambda *_, s=slot: self._on_edit(s, 1))
+            for widget in (frame, lhs, arrow, rhs, remove):
+                widget.bind("<MouseWheel>", self._on_mousewheel)
+                widget.bind("<Button-4>", lambda e: self.scroll(-1))
+                widget.bind("<Button-5>", lambda e: self.scroll(1))
+            self._pool.append({'frame': frame, 'lhs_var': lhs_var, 'rhs_var': rhs_var,
+                               'lhs': lhs, 'rhs': rhs, 'remove': remove})
+        while len(self._pool) > count:
+            self._pool.pop()['frame'].destroy()
+
+    def render(self):
+        """ Asigna las filas visibles a la ventana [top, top + filas) del modelo """
+        visible = len(self._pool)
+        self.top = max(0, min(self.top, len(self.rows) - visible))
+        self._binding = True
+        try:
+            for slot, row in enumerate(self._pool):
+                index = self.top + slot
+                if index < len(self.rows):
+                    row['lhs_var'].set(self.rows[index][0])
+                    row['rhs_var'].set(self.rows[index][1])
+                    row['frame'].pack(fill=tk.X, pady=1)
+                else:
+                    row['frame'].pack_forget()
+        finally:
+            self._binding = False
+
+        total = max(len(self.rows), 1)
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + visible) / total))
+
+    def _on_edit(self, slot, column):
+        if self._binding:
+            return
+        index = self.top + slot
+        if index < len(self.rows):
+            var = self._pool[slot]['lhs_var' if column == 0 else 'rhs_var']
+            self.rows[index][column] = var.get()
+
+    # --- Desplazamiento ---
+
+    def scroll(self, units):
+        self.top += units
+        self.render()
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * len(self.rows))
+        elif action == "scroll":
+            step = len(self._pool) if unit == "pages" else 1
+            self.top += int(amount) * step
+        self.render()
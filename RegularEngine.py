@@ -0,0 +1,182 @@
+# RegularEngine.py
+# Motor compilado para gramáticas regulares (Tipo 3):
+# producciones lineales por la derecha -> AFN -> AFD (subconjuntos) -> AFD mínimo.
+
+from collections import defaultdict, deque
+
+FINAL_STATE = object() # Estado final artificial del AFN (para producciones A -> a)
+
+
+class RegularAutomaton:
+    """ AFD mínimo equivalente a una gramática lineal por la derecha.
+
+        Las producciones se reciben como pares (lhs, rhs) con la convención de NLTK:
+        los terminales son str y los no terminales cualquier otro objeto (Nonterminal).
+        Formas admitidas: A -> ε, A -> a, A -> a B.
+    """
+
+    def __init__(self, start_symbol, productions):
+        nfa, alphabet = self._build_nfa(productions)
+
+        # Alfabeto: terminal -> índice de columna en la tabla de transiciones
+        self.symbols = {sym: i for i, sym in enumerate(sorted(alphabet))}
+
+        dfa_table, dfa_accepting = self._determinize(start_symbol, nfa)
+        self.transitions, self.accepting, self.start = self._minimize(dfa_table, dfa_accepting)
+
+    @property
+    def state_count(self):
+        return len(self.transitions)
+
+    # --- Construcción ---
+
+    @staticmethod
+    def _build_nfa(productions):
+        """ Traduce las producciones a un AFN: {estado: {terminal: set(destinos)}} + aceptación """
+        moves = defaultdict(lambda: defaultdict(set))
+        accepting = {FINAL_STATE}
+        alphabet = set()
+
+        for lhs, rhs in productions:
+            if len(rhs) == 0:
+                accepting.add(lhs) # A -> ε : A es de aceptación
+            elif len(rhs) == 1:
+                moves[lhs][rhs[0]].add(FINAL_STATE) # A -> a
+                alphabet.add(rhs[0])
+            elif len(rhs) == 2:
+                moves[lhs][rhs[0]].add(rhs[1]) # A -> a B
+                alphabet.add(rhs[0])
+            else:
+                raise ValueError(f"Producción no lineal por la derecha: {lhs} -> {rhs}")
+
+        return (moves, accepting), alphabet
+
+    def _determinize(self, start_symbol, nfa):
+        """ Construcción por subconjuntos. Devuelve tabla (lista de filas) y lista de aceptación """
+        moves, nfa_accepting = nfa
+        n_symbols = len(self.symbols)
+
+        start_set = frozenset([start_symbol])
+        state_ids = {start_set: 0}
+        pending = deque([start_set])
+        table = []
+        accepting = []
+
+        while pending:
+            current = pending.popleft()
+            row = [-1] * n_symbols
+            targets = defaultdict(set)
+            for nfa_state in current:
+                for sym, dests in moves.get(nfa_state, {}).items():
+                    targets[sym].update(dests)
+
+            for sym, dests in targets.items():
+                dest_set = frozenset(dests)
+                if dest_set not in state_ids:
+                    state_ids[dest_set] = len(state_ids)
+                    pending.append(dest_set)
+                row[self.symbols[sym]] = state_ids[dest_set]
+
+            table.append(row)
+            accepting.append(not nfa_accepting.isdisjoint(current))
+
+        return table, accepting
+
+    def _minimize(self, table, accepting):
+        """ Minimización de Hopcroft sobre el AFD completado con un estado sumidero """
+        n_states = len(table)
+        n_symbols = len(self.symbols)
+        dead = n_states # Estado sumidero explícito (las transiciones -1 van aquí)
+
+        # Transiciones inversas: inverse[sym][q] = estados que van a q con sym
+        inverse = [defaultdict(list) for _ in range(n_symbols)]
+        for q, row in enumerate(table):
+            for a, dest in enumerate(row):
+                inverse[a][dest if dest != -1 else dead].append(q)
+        for a in range(n_symbols):
+            inverse[a][dead].append(dead)
+
+        finals = {q for q in range(n_states) if accepting[q]}
+        non_finals = set(range(n_states + 1)) - finals
+        partition = [block for block in (finals, non_finals) if block]
+        block_of = {}
+        for b, block in enumerate(partition):
+            for q in block:
+                block_of[q] = b
+
+        work = deque((b, a) for b in range(len(partition)) for a in range(n_symbols))
+        queued = set(work)
+        while work:
+            splitter_id, a = work.popleft()
+            queued.discard((splitter_id, a))
+            predecessors = set()
+            for q in partition[splitter_id]:
+                predecessors.update(inverse[a].get(q, ()))
+            if not predecessors:
+                continue
+
+            # Agrupar predecesores por bloque y dividir los bloques afectados
+            touched = defaultdict(set)
+            for q in predecessors:
+                touched[block_of[q]].add(q)
+            for b, inside in touched.items():
+                block = partition[b]
+                if len(inside) == len(block):
+                    continue
+                outside = block - inside
+                partition[b] = inside
+                new_id = len(partition)
+                partition.append(outside)
+                for q in outside:
+                    block_of[q] = new_id
+                small = new_id if len(outside) <= len(inside) else b
+                for sym in range(n_symbols):
+                    # Si el bloque original ya estaba pendiente, ambas mitades deben procesarse
+                    target = new_id if (b, sym) in queued else small
+                    if (target, sym) not in queued:
+                        queued.add((target, sym))
+                        work.append((target, sym))
+
+        # Reconstruir el AFD mínimo sin el bloque sumidero (se representa con -1)
+        dead_block = block_of[dead]
+        ids = {}
+        for q in range(n_states): # Numeración en orden de descubrimiento (el inicial es 0)
+            b = block_of[q]
+            if b != dead_block and b not in ids:
+                ids[b] = len(ids)
+
+        if block_of[0] == dead_block: # Lenguaje vacío
+            return [[-1] * n_symbols], [False], 0
+
+        transitions = [None] * len(ids)
+        final_flags = [False] * len(ids)
+        for q in range(n_states):
+            b = block_of[q]
+            if b == dead_block or transitions[ids[b]] is not None:
+                continue
+            row = []
+            for dest in table[q]:
+                if dest == -1 or block_of[dest] == dead_block:
+                    row.append(-1)
+                else:
+                    row.append(ids[block_of[dest]])
+            transitions[ids[b]] = row
+            final_flags[ids[b]] = accepting[q]
+
+        return transitions, final_flags, ids[block_of[0]]
+
+    # --- Reconocimiento ---
+
+    def accepts(self, tokens):
+        """ Pertenencia en O(n): recorre el AFD token a token """
+        symbols = self.symbols
+        transitions = self.transitions
+        state = self.start
+        for tok in tokens:
+            col = symbols.get(tok)
+            if col is None:
+                return False
+            state = transitions[state][col]
+            if state == -1:
+                return False
+        return self.accepting[state]
@@ -0,0 +1,246 @@
+# StringGenerator.py
+# Generación de cadenas del lenguaje por programación dinámica sobre la FNC, por longitud
+# (número de terminales):
+#  - UniformSampler: count[n][A] = número de derivaciones de A con exactamente n terminales.
+#    Con esa tabla se elige cada regla (y cada punto de corte) con probabilidad
+#    proporcional a las derivaciones que completa, lo que da muestras uniformes.
+#  - LengthEnumerator: strings[n][A] = conjunto de cadenas que A deriva con n terminales,
+#    para enumerar todo el lenguaje en orden de longitud creciente.
+# Las tablas crecen al usarse; un lock serializa solo ese crecimiento (server.py comparte
+# el muestreador entre hilos). Las filas ya calculadas no cambian y se leen sin lock.
+# Cada objeto lleva en bytes una estimación de lo que ocupan sus tablas (GrammarRegistry la
+# suma a su presupuesto de memoria).
+
+import bisect
+import itertools
+import math
+import random
+import threading
+
+from Cancellation import check_cancelled
+from CYKEngine import to_cnf
+
+SLOT_BYTES = 8       # Referencia en una lista, tupla o conjunto
+INT_BYTES = 28       # Entero de Python sin contar sus dígitos (los conteos crecen sin límite)
+TUPLE_BYTES = 72     # Tupla (B, k, C, n-k) de _splits
+STRING_BYTES = 50    # str de Python sin contar sus caracteres
+CONTAINER_BYTES = 64 # Lista o conjunto vacío
+
+
+def _int_bytes(value):
+    return SLOT_BYTES + INT_BYTES + value.bit_length() // 8
+
+
+class _CNFTables:
+    """ FNC de la gramática con los no terminales internados a enteros """
+
+    def __init__(self, start_symbol, productions):
+        start, cnf, self.accepts_empty = to_cnf(start_symbol, productions)
+
+        nt_ids = {}
+        for lhs, rhs in cnf:
+            nt_ids.setdefault(lhs, len(nt_ids))
+        self.start = nt_ids.get(start)
+        self.n_nt = len(nt_ids)
+
+        self.terminal_rules = [[] for _ in range(self.n_nt)] # A -> [a, ...]
+        self.binary_rules = [[] for _ in range(self.n_nt)]   # A -> [(B, C), ...]
+        for lhs, rhs in cnf:
+            if len(rhs) == 1:
+                self.terminal_rules[nt_ids[lhs]].append(rhs[0])
+            elif all(sym in nt_ids for sym in rhs): # B o C sin producciones: no deriva nada
+                self.binary_rules[nt_ids[lhs]].append((nt_ids[rhs[0]], nt_ids[rhs[1]]))
+        self._extend_lock = threading.Lock() # Toma quien añade filas a la tabla por longitud
+        self.bytes = 0 # Memoria estimada de lo que las tablas han crecido al usarse
+
+
+class UniformSampler(_CNFTables):
+    """ Muestreo uniforme de derivaciones de una longitud dada.
+
+        Las producciones se reciben como pares (lhs, rhs) con la convención de NLTK
+        (terminales = str). La uniformidad es sobre derivaciones de la FNC: si la
+        gramática no es ambigua equivale a muestrear cadenas uniformemente.
+    """
+
+    def __init__(self, start_symbol, productions):
+        super().__init__(start_symbol, productions)
+
+        # counts[n][A]; counts[0] no se usa (la FNC no tiene reglas vacías salvo el inicial)
+        self.counts = [[0] * self.n_nt]
+        self._splits = {}        # (A, n) -> (pesos acumulados, [(B, k, C, n-k)]) para elegir con bisect
+        self._length_weights = {} # (min, max) -> pesos acumulados por longitud
+
+    def _extend_counts(self, length):
+        """ Completa la tabla de conteos hasta la longitud dada (programación dinámica) """
+        counts = self.counts
+        if len(counts) > length:
+            return
+        with self._extend_lock:
+            while len(counts) <= length:
+                n = len(counts)
+                row = [0] * self.n_nt
+                for a in range(self.n_nt):
+                    if n == 1:
+                        row[a] = len(self.terminal_rules[a])
+                        continue
+                    total = 0
+                    for b, c in self.binary_rules[a]:
+                        for k in range(1, n):
+                            left = counts[k][b]
+                            if left:
+                                total += left * counts[n - k][c]
+                    row[a] = total
+                counts.append(row)
+                self.bytes += CONTAINER_BYTES + sum(_int_bytes(value) for value in row)
+
+    def count(self, length):
+        """ Número de derivaciones del símbolo inicial con exactamente length terminales """
+        if length == 0:
+            return 1 if self.accepts_empty else 0
+        if self.start is None:
+            return 0
+        self._extend_counts(length)
+        return self.counts[length][self.start]
+
+    def sample(self, length, rng=random):
+        """ Tupla de terminales elegida uniformemente entre las derivaciones de esa longitud,
+            o None si el lenguaje no tiene cadenas de esa longitud.
+        """
+        if not self.count(length):
+            return None
+        if length == 0:
+            return ()
+
+        output = []
+        stack = [(self.start, length)] # Pila de (no terminal, longitud): expansión por la izquierda
+        while stack:
+            a, n = stack.pop()
+            if n == 1:
+                terminals = self.terminal_rules[a]
+                output.append(terminals[0] if len(terminals) == 1 else rng.choice(terminals))
+                continue
+            split = self._splits.get((a, n))
+            if split is None:
+                split = self._build_split(a, n)
+            cumulative, choices = split
+            b, k, c, rest = choices[bisect.bisect_right(cumulative, rng.randrange(cumulative[-1]))]
+            stack.append((c, rest))
+            stack.append((b, k))
+        return tuple(output)
+
+    def _build_split(self, a, n):
+        """ Reglas A -> B C y cortes k con derivaciones de longitud n, con sus pesos acumulados """
+        counts = self.counts
+        weights = []
+        choices = []
+        for b, c in self.binary_rules[a]:
+            for k in range(1, n):
+                weight = counts[k][b] * counts[n - k][c]
+                if weight:
+                    weights.append(weight)
+                    choices.append((b, k, c, n - k))
+        split = (list(itertools.accumulate(weights)), choices)
+        size = 2 * CONTAINER_BYTES + len(choices) * (SLOT_BYTES + TUPLE_BYTES) + sum(_int_bytes(w) for w in split[0])
+        with self._extend_lock: # Dos hilos pueden calcular el mismo corte: se cuenta una vez
+            if self._splits.setdefault((a, n), split) is split:
+                self.bytes += size
+        return split
+
+    def sample_range(self, min_length, max_length, rng=random):
+        """ Muestra uniforme entre todas las derivaciones con longitud en [min_length, max_length] """
+        cumulative = self._length_weights.get((min_length, max_length))
+        if cumulative is None:
+            cumulative = list(itertools.accumulate(self.count(length) for length in range(min_length, max_length + 1)))
+            with self._extend_lock:
+                if self._length_weights.setdefault((min_length, max_length), cumulative) is cumulative:
+                    self.bytes += CONTAINER_BYTES + sum(_int_bytes(w) for w in cumulative)
+        if not cumulative[-1]:
+            return None
+        offset = bisect.bisect_right(cumulative, rng.randrange(cumulative[-1]))
+        return self.sample(min_length + offset, rng)
+
+
+class LengthEnumerator(_CNFTables):
+    """ Todas las cadenas del lenguaje en orden de longitud creciente (y alfabético dentro
+        de cada longitud). strings[n][A] se calcula una sola vez a partir de las longitudes
+        menores, así que enumerar hasta k cuesta lo mismo que calcular la longitud k.
+    """
+
+    def __init__(self, start_symbol, productions):
+        super().__init__(start_symbol, productions)
+        self.strings = [[frozenset()] * self.n_nt] # strings[0] no se usa (ver UniformSampler)
+
+    def _extend_strings(self, length, cancel=None):
+        """ Completa strings[n][A] hasta la longitud dada """
+        table = self.strings
+        if len(table) > length:
+            return
+        with self._extend_lock:
+            while len(table) <= length:
+                n = len(table)
+                row = []
+                for a in range(self.n_nt):
+                    check_cancelled(cancel)
+                    if n == 1:
+                        row.append(frozenset(self.terminal_rules[a]))
+                        continue
+                    derived = set()
+                    for b, c in self.binary_rules[a]:
+                        for k in range(1, n):
+                            left, right = table[k][b], table[n - k][c]
+                            if left and right:
+                                derived.update(x + y for x in left for y in right)
+                    row.append(frozenset(derived))
+                table.append(row)
+                self.bytes += CONTAINER_BYTES * (1 + len(row)) + sum(SLOT_BYTES + STRING_BYTES + len(x)
+                                                                     for strings in row for x in strings)
+
+    def strings_of_length(self, length, cancel=None):
+        """ Cadenas del lenguaje con exactamente length terminales, ordenadas """
+        if length == 0:
+            return [""] if self.accepts_empty else []
+        if self.start is None:
+            return []
+        self._extend_strings(length, cancel)
+        return sorted(self.strings[length][self.start])
+
+    def enumerate(self, max_length, min_length=0, cancel=None):
+        """ Generador de las cadenas con longitud en [min_length, max_length], de menor a mayor """
+        for length in range(min_length, max_length + 1):
+            yield from self.strings_of_length(length, cancel)
+
+
+class BloomFilter:
+    """ Conjunto aproximado de memoria fija para deduplicar flujos de cadenas.
+
+        Dimensionado para capacity elementos con tasa de falsos positivos fp_rate;
+        por encima de esa capacidad la tasa crece, pero la memoria no.
+        Usa doble hashing (h1 + i*h2) sobre hash() de Python, estable dentro del proceso.
+    """
+
+    def __init__(self, capacity, fp_rate=0.001):
+        if capacity <= 0 or not 0 < fp_rate < 1:
+            raise ValueError("Error: Capacidad o tasa de falsos positivos del filtro Bloom inválida.")
+        self.size = max(8, int(-capacity * math.log(fp_rate) / math.log(2) ** 2)) # bits
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item):
+        """ Añade item; devuelve True si (probablemente) ya estaba """
+        h1 = hash(item)
+        h2 = hash((item, 1)) | 1
+        size, bits = self.size, self.bits
+        present = True
+        for i in range(self.hash_count):
+            bit = (h1 + i * h2) % size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, item):
+        h1 = hash(item)
+        h2 = hash((item, 1)) | 1
+        return all(self.bits[bit >> 3] & (1 << (bit & 7))
+                   for bit in ((h1 + i * h2) % self.size for i in range(self.hash_count)))
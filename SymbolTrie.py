@@ -0,0 +1,70 @@
+# SymbolTrie.py
+# Segmentación del lado derecho escrito en la UI (ej. "aBc") en símbolos definidos.
+# El trie se construye una vez por gramática y cada RHS se segmenta con una
+# programación dinámica sobre posiciones: O(len(rhs) × longitud del símbolo más largo).
+
+_END = None # Clave del nodo que marca el fin de un símbolo
+
+
+class SymbolTrie:
+    """ Trie de símbolos (terminales y no terminales) como diccionarios anidados """
+
+    def __init__(self, symbols):
+        self.root = {}
+        for sym in symbols:
+            if not sym:
+                continue
+            node = self.root
+            for ch in sym:
+                node = node.setdefault(ch, {})
+            node[_END] = sym
+
+    def matches(self, text, start):
+        """ Longitudes (crecientes) de los símbolos que empiezan en text[start] """
+        node = self.root
+        lengths = []
+        for pos in range(start, len(text)):
+            node = node.get(text[pos])
+            if node is None:
+                break
+            if _END in node:
+                lengths.append(pos + 1 - start)
+        return lengths
+
+    def segment(self, text):
+        """ Divide text en símbolos del trie.
+            Devuelve (símbolos, ambigua) o (None, posición) si no hay segmentación posible:
+            la posición es hasta dónde se pudo leer desde el inicio (para el mensaje de error).
+            Si hay varias segmentaciones se elige la que toma el símbolo más largo en cada
+            paso (la regla greedy original) entre las que llegan al final, y ambigua=True.
+        """
+        n = len(text)
+        # ways[i]: número de segmentaciones de text[i:] (saturado en 2); choice[i]: longitud elegida
+        ways = [0] * (n + 1)
+        choice = [0] * (n + 1)
+        ways[n] = 1
+        for i in range(n - 1, -1, -1):
+            total = 0
+            for length in self.matches(text, i):
+                if ways[i + length]:
+                    total += ways[i + length]
+                    choice[i] = length # Crecientes: queda la más larga válida
+            ways[i] = min(total, 2)
+
+        if not ways[0]:
+            return None, self._reachable_end(text)
+
+        symbols = []
+        i = 0
+        while i < n:
+            symbols.append(text[i:i + choice[i]])
+            i += choice[i]
+        return symbols, ways[0] > 1
+
+    def _reachable_end(self, text):
+        """ Posición más lejana alcanzable desde 0 encadenando símbolos """
+        reachable = {0}
+        for i in range(len(text)):
+            if i in reachable:
+                reachable.update(i + length for length in self.matches(text, i))
+        return max(reachable)
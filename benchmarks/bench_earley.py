@@ -0,0 +1,67 @@
+# bench_earley.py
+# Comparación lado a lado: EarleyEngine (propio) vs EarleyChartParser de NLTK.
+# Uso (desde la raíz del repositorio): python benchmarks/bench_earley.py [--max-len N]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nltk import CFG
+from nltk.parse import EarleyChartParser
+
+from EarleyEngine import EarleyEngine
+
+# (nombre, gramática NLTK, generador de entrada de longitud ~n)
+CASES = [
+    ("expr ambigua", """
+        E -> E '+' E | E '*' E | '(' E ')' | 'a'
+     """, lambda n: "a" + "+a" * (n // 2)),
+    ("a^n b^n", """
+        S -> 'a' S 'b' | 
+     """, lambda n: "a" * (n // 2) + "b" * (n // 2)),
+    ("lineal derecha", """
+        S -> 'a' A | 'b' S |
+        A -> 'a' S | 'b' A
+     """, lambda n: "ab" * (n // 2)),
+]
+
+
+def measure(fn):
+    """ Ejecuta fn() y devuelve (segundos, pico de memoria en KiB) """
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark EarleyEngine vs EarleyChartParser de NLTK")
+    arg_parser.add_argument("--max-len", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    lengths = [n for n in (25, 50, 100, 200, 400, 800, 1600) if n <= args.max_len]
+    print(f"{'caso':<16}{'n':>6}{'NLTK s':>10}{'NLTK KiB':>10}"
+          f"{'rec. s':>10}{'rec. KiB':>10}{'bosque s':>10}{'bosque KiB':>12}{'x rec.':>8}")
+    for name, grammar_text, make_input in CASES:
+        cfg = CFG.fromstring(grammar_text)
+        nltk_parser = EarleyChartParser(cfg)
+        engine = EarleyEngine(cfg.start(), [(p.lhs(), p.rhs()) for p in cfg.productions()])
+        for n in lengths:
+            tokens = list(make_input(n))
+            # NLTK: chart completo. Propio: solo reconocimiento, y bosque + cuenta de derivaciones
+            t_nltk, m_nltk = measure(lambda: nltk_parser.chart_parse(tokens))
+            t_rec, m_rec = measure(lambda: engine.recognize(tokens))
+            t_forest, m_forest = measure(lambda: engine.parse(tokens).count())
+            print(f"{name:<16}{len(tokens):>6}{t_nltk:>10.3f}{m_nltk:>10.0f}"
+                  f"{t_rec:>10.3f}{m_rec:>10.0f}{t_forest:>10.3f}{m_forest:>12.0f}{t_nltk / t_rec:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
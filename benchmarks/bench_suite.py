@@ -0,0 +1,301 @@
+# bench_suite.py
+# Suite reproducible de rendimiento de GrammarLogicNLTK sobre familias de gramáticas
+# parametrizadas y varias longitudes de entrada. Mide set_grammar, validate_string
+# (solo pertenencia y con bosque de derivaciones) y generación; para cada caso guarda
+# throughput, percentiles de latencia y pico de memoria (tracemalloc, en una corrida aparte
+# para no distorsionar los tiempos). Los resultados se escriben en JSON y se pueden
+# comparar con una corrida anterior para detectar regresiones.
+# Uso (desde la raíz del repositorio):
+#   python benchmarks/bench_suite.py -o base.json
+#   python benchmarks/bench_suite.py --quick --compare base.json --threshold 0.15
+#   python benchmarks/bench_suite.py --family dyck --family epsilon
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from GrammarLogic import GrammarLogicNLTK
+
+FORMAT_VERSION = 1 # Cambiar si cambia la estructura del JSON (las comparaciones lo verifican)
+
+
+# --- Familias de gramáticas ---
+# Cada familia recibe un parámetro de tamaño y devuelve (spec, make_input): spec es la
+# entrada de set_grammar (S, T, NT, [(lhs, rhs)] con el RHS escrito como en la UI) y
+# make_input(n) construye una cadena del lenguaje de longitud aproximada n.
+
+def family_anbn(_size):
+    spec = ("S", "a,b", "S", [("S", "aSb"), ("S", "")])
+    return spec, lambda n: "a" * (n // 2) + "b" * (n // 2)
+
+
+def family_dyck(pairs):
+    """ Dyck con pairs tipos de paréntesis (no ambigua: S -> ( S ) S | ε) """
+    brackets = ["()", "[]", "{}", "<>"][:pairs]
+    productions = [("S", f"{o}S{c}S") for o, c in brackets] + [("S", "")]
+    spec = ("S", ",".join(ch for pair in brackets for ch in pair), "S", productions)
+
+    def make_input(n):
+        # Grupos anidados de profundidad 1..4 concatenados, rotando los tipos de paréntesis
+        out = []
+        length = 0
+        i = 0
+        while True:
+            depth = i % 4 + 1
+            group = "".join(brackets[(i + d) % len(brackets)][0] for d in range(depth))
+            group += "".join(brackets[(i + d) % len(brackets)][1] for d in reversed(range(depth)))
+            if length + len(group) > n:
+                return "".join(out)
+            out.append(group)
+            length += len(group)
+            i += 1
+    return spec, make_input
+
+
+def family_expr(_size):
+    """ Expresiones altamente ambiguas: el número de derivaciones crece como Catalan """
+    spec = ("E", "a,+,*,(,)", "E", [("E", "E+E"), ("E", "E*E"), ("E", "(E)"), ("E", "a")])
+    return spec, lambda n: "a" + "+a*a" * max(0, (n - 1) // 4)
+
+
+def family_right_linear(states):
+    """ Lineal por la derecha con states no terminales (autómata de residuos módulo states) """
+    names = [f"Q{i}" for i in range(states)]
+    productions = []
+    for i, name in enumerate(names):
+        productions.append((name, f"a{names[(2 * i) % states]}"))
+        productions.append((name, f"b{names[(2 * i + 1) % states]}"))
+        if i % 3 == 0:
+            productions.append((name, ""))
+    spec = ("Q0", "a,b", ",".join(names), productions)
+    return spec, lambda n: "a" * n # Q0 -a-> Q0: siempre acepta
+
+
+def family_epsilon(nullables):
+    """ Muchos anulables: S -> N1 ... Nk c S | ε, Ni -> a | ε """
+    names = [f"N{i}" for i in range(1, nullables + 1)]
+    productions = [("S", "".join(names) + "cS"), ("S", "")]
+    for name in names:
+        productions += [(name, "a"), (name, "")]
+    spec = ("S", "a,c", "S," + ",".join(names), productions)
+    return spec, lambda n: "ac" * (n // 2)
+
+
+FAMILIES = {
+    # nombre: (constructor, parámetros de tamaño)
+    "anbn": (family_anbn, [1]),
+    "dyck": (family_dyck, [1, 4]),
+    "expr": (family_expr, [1]),
+    "right_linear": (family_right_linear, [100, 2000]),
+    "epsilon": (family_epsilon, [4, 16]),
+}
+
+LENGTHS = [16, 64, 256]
+QUICK_LENGTHS = [16, 64]
+TREE_MAX_LENGTH = 64 # validate_forest solo hasta esta longitud (contar derivaciones de 'expr' crece rápido)
+
+
+# --- Medición ---
+
+def run_timed(fn, repeat, min_time):
+    """ Ejecuta fn() al menos repeat veces (y al menos min_time segundos); devuelve latencias """
+    fn() # Calentamiento (cachés perezosas, predicción, etc.)
+    gc.collect()
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < repeat or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def peak_memory(fn):
+    """ Pico de memoria asignada (bytes) durante una ejecución de fn() """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(sorted_values, q):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+
+def summarize(latencies, units_per_call):
+    values = sorted(latencies)
+    mean = statistics.fmean(values)
+    return {
+        "runs": len(values),
+        "mean_s": mean,
+        "p50_s": percentile(values, 0.50),
+        "p90_s": percentile(values, 0.90),
+        "p99_s": percentile(values, 0.99),
+        "max_s": values[-1],
+        "throughput": units_per_call / mean if mean else None,
+    }
+
+
+def benchmark_case(family, size, lengths, repeat, min_time, gen_count):
+    """ Resultados de una gramática (familia, tamaño) para todas las longitudes """
+    spec, make_input = FAMILIES[family][0](size)
+    results = []
+
+    def record(name, fn, units, unit, **params):
+        entry = {"benchmark": name, "family": family, "size": size, "unit": unit, **params}
+        entry.update(summarize(run_timed(fn, repeat, min_time), units))
+        entry["peak_bytes"] = peak_memory(fn)
+        results.append(entry)
+        return entry
+
+    def compile_grammar():
+        logic = GrammarLogicNLTK(result_cache_entries=0) # Sin cachés: se mide la compilación y cada parseo completos
+        errors = logic.set_grammar(*spec)
+        if any("Error" in e for e in errors):
+            raise ValueError(f"Error: La familia {family}({size}) no compila: {errors}")
+        return logic
+
+    record("set_grammar", compile_grammar, 1, "grammars/s",
+           productions=len(spec[3]))
+
+    logic = compile_grammar()
+    for n in lengths:
+        input_string = make_input(n)
+        length = len(input_string)
+        belongs, _ = logic.validate_string(input_string, with_trees=False)
+        if not belongs:
+            raise ValueError(f"Error: La entrada de {family}({size}) con n={n} no pertenece al lenguaje.")
+        record("validate_recognize", lambda: logic.validate_string(input_string, with_trees=False),
+               max(length, 1), "tokens/s", length=length)
+        if length <= TREE_MAX_LENGTH:
+            record("validate_forest", lambda: logic.validate_string(input_string)[1].count(),
+                   max(length, 1), "tokens/s", length=length)
+
+    max_gen = min(lengths[-1], 24) # Longitudes de generación acotadas (el enumerador es exhaustivo)
+    record("sample", lambda: logic.sample_strings(n=gen_count, min_length=0, max_length=max_gen, seed=0),
+                   gen_count, "strings/s", max_length=max_gen, count=gen_count)
+    enum_length = 8
+
+    def enumerate_cold():
+        logic.enumerator = None # Las tablas por longitud se memoizan: medir también su construcción
+        return logic.enumerate_strings(n=gen_count, max_length=enum_length)
+    produced = len(enumerate_cold())
+    record("enumerate", enumerate_cold, max(produced, 1), "strings/s", max_length=enum_length, count=produced)
+    return results
+
+
+# --- Salida y comparación ---
+
+def case_key(entry):
+    """ Identifica un caso de forma estable entre corridas """
+    params = {k: entry[k] for k in ("length", "max_length", "count") if k in entry}
+    return (entry["benchmark"], entry["family"], entry["size"], json.dumps(params, sort_keys=True))
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """ Imprime la variación de p50 y memoria por caso; devuelve la lista de regresiones """
+    if baseline.get("format_version") != FORMAT_VERSION:
+        raise ValueError("Error: El archivo de referencia tiene otro formato de resultados.")
+    previous = {case_key(e): e for e in baseline["results"]}
+    regressions = []
+    print(f"\n{'caso':<44}{'p50 ref.':>11}{'p50':>11}{'Δ tiempo':>10}{'Δ memoria':>11}")
+    for entry in current["results"]:
+        key = case_key(entry)
+        old = previous.get(key)
+        if old is None:
+            continue
+        time_ratio = entry["p50_s"] / old["p50_s"] - 1 if old["p50_s"] else 0.0
+        mem_ratio = entry["peak_bytes"] / old["peak_bytes"] - 1 if old["peak_bytes"] else 0.0
+        flag = ""
+        if time_ratio > threshold or mem_ratio > threshold:
+            flag = "  <-- regresión"
+            regressions.append(key)
+        print(f"{label(entry):<44}{old['p50_s'] * 1e3:>9.3f}ms{entry['p50_s'] * 1e3:>9.3f}ms"
+              f"{time_ratio:>+10.1%}{mem_ratio:>+11.1%}{flag}")
+    missing = set(previous) - {case_key(e) for e in current["results"]}
+    if missing:
+        print(f"({len(missing)} casos de la referencia no se ejecutaron en esta corrida)")
+    return regressions
+
+
+def label(entry):
+    extra = entry.get("length", entry.get("max_length", ""))
+    return f"{entry['benchmark']} {entry['family']}({entry['size']}) {extra}"
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Suite de rendimiento de GrammarLogicNLTK")
+    arg_parser.add_argument("-o", "--output", help="Archivo JSON de resultados")
+    arg_parser.add_argument("--compare", metavar="REFERENCIA", help="JSON de una corrida anterior")
+    arg_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="Aumento relativo de p50 o memoria que cuenta como regresión")
+    arg_parser.add_argument("--family", action="append", choices=sorted(FAMILIES),
+                            help="Limitar a estas familias (se puede repetir)")
+    arg_parser.add_argument("--quick", action="store_true", help="Menos longitudes y repeticiones")
+    arg_parser.add_argument("--repeat", type=int, help="Ejecuciones mínimas por caso")
+    arg_parser.add_argument("--min-time", type=float, help="Segundos mínimos por caso")
+    args = arg_parser.parse_args(argv)
+
+    lengths = QUICK_LENGTHS if args.quick else LENGTHS
+    repeat = args.repeat or (5 if args.quick else 20)
+    min_time = args.min_time if args.min_time is not None else (0.05 if args.quick else 0.5)
+    gen_count = 100
+
+    results = []
+    for family in args.family or FAMILIES:
+        for size in FAMILIES[family][1]:
+            for entry in benchmark_case(family, size, lengths, repeat, min_time, gen_count):
+                results.append(entry)
+                print(f"{label(entry):<44}{entry['p50_s'] * 1e3:>9.3f}ms p50 {entry['p99_s'] * 1e3:>9.3f}ms p99"
+                      f"{entry['throughput']:>12.1f} {entry['unit']:<11}{entry['peak_bytes'] / 1024:>9.0f} KiB")
+
+    report = {
+        "format_version": FORMAT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"lengths": lengths, "repeat": repeat, "min_time": min_time, "gen_count": gen_count},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones por encima de {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
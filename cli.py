@@ -0,0 +1,229 @@
+# cli.py
+# Punto de entrada sin interfaz gráfica (no importa tkinter).
+# Ejemplos:
+#   python cli.py classify gramatica.cfg
+#   python cli.py validate gramatica.cfg cadenas.txt --results count --workers 4
+#   python cli.py validate gramatica_regular.cfg corpus.txt --bitmap aceptadas.bin
+#   cat cadenas.txt | python cli.py validate gramatica.cfg
+#   python cli.py generate gramatica.cfg -n 20 --depth 8
+#   python cli.py enumerate gramatica.cfg --max-length 6
+#   python cli.py sample gramatica.cfg -n 1000 --min-length 5 --max-length 12 --seed 7
+#   python cli.py sample gramatica.cfg -n 20000000 --unique --plain -o corpus.txt
+#   python cli.py sample gramatica.cfg -n 0 --unique --capacity 50000000 --plain -o corpus.txt
+#   python cli.py --stats --stats-output metricas.json validate gramatica.cfg cadenas.txt
+# La salida es JSONL (un objeto JSON por línea) en stdout; los mensajes van a stderr.
+# --stats activa los temporizadores por fase y contadores (Instrumentation) y los
+# escribe como JSON al terminar (en stderr si no se indica archivo).
+
+import argparse
+import itertools
+import json
+import sys
+
+from Constants import EPSILON, MAX_GENERATED_STRINGS, GRAMMAR_CACHE_DIR, GRAMMAR_CACHE_MAX_BYTES
+from GrammarCache import CompiledGrammarCache
+from GrammarIO import load_grammar_file
+from GrammarLogic import GrammarLogicNLTK
+from Instrumentation import Instrumentation
+
+
+def load_logic(args):
+    """ Lee el archivo y compila la gramática (o la carga de la caché).
+        Sale con código 1 si hay errores fatales.
+    """
+    grammar_path = args.grammar
+    parsed = load_grammar_file(grammar_path)
+    cache = None if args.no_cache else CompiledGrammarCache(args.cache_dir, args.cache_size)
+    logic = GrammarLogicNLTK(cache=cache, simplify=args.simplify, stats=args.instrumentation)
+    args.cache = cache
+    with args.instrumentation.phase('load'):
+        errors = logic.load_parsed_grammar(parsed)
+    fatal = [e for e in errors if "Error" in e]
+    if fatal or not logic.parser:
+        emit({"grammar": grammar_path, "errors": errors or ["Error: Gramática inválida."]}, sys.stderr)
+        sys.exit(1)
+    return logic, errors
+
+
+def emit(obj, stream=None):
+    (stream or sys.stdout).write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+
+def read_lines(paths):
+    """ Cadenas línea a línea desde archivos o stdin ('-' o sin archivos) """
+    for path in paths or ['-']:
+        stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+        try:
+            for line in stream:
+                yield line.rstrip('\r\n')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def cmd_classify(args):
+    logic, warnings = load_logic(args)
+    result = {"grammar": args.grammar, "type": logic.grammar_type, "warnings": warnings}
+    result.update(logic.analysis_report())
+    emit(result)
+
+
+def cmd_validate(args):
+    logic, _ = load_logic(args)
+    if args.bitmap:
+        validate_bitmap(logic, args)
+        return
+    # tee: stdin solo se lee una vez (el desfase entre ambas copias está acotado por validate_many)
+    originals, inputs = itertools.tee(read_lines(args.inputs))
+    if args.append_epsilon: # Igual que GrammarApp: se añade ε al final de la cadena
+        inputs = (s + EPSILON for s in inputs)
+    key = "belongs" if args.results == "bool" else "derivations"
+    for input_string, result in zip(originals, logic.validate_many(inputs, workers=args.workers,
+                                                                    chunk_size=args.chunk_size,
+                                                                    results=args.results)):
+        emit({"input": input_string, key: result})
+
+
+def validate_bitmap(logic, args):
+    """ Corpus completo con el AFD vectorizado: escribe el bitmap empaquetado y emite un resumen """
+    if len(args.inputs) != 1 or args.inputs[0] == '-':
+        raise ValueError("Error: --bitmap requiere exactamente un archivo de cadenas (no stdin).")
+    bitmap, n = logic.validate_corpus(args.inputs[0], append_epsilon=args.append_epsilon)
+    with open(args.bitmap, 'wb') as f:
+        bitmap.tofile(f)
+    accepted = int.from_bytes(bitmap.tobytes(), 'little').bit_count() # Los bits de relleno son 0
+    emit({"inputs": n, "accepted": accepted, "bitmap": args.bitmap})
+
+
+def cmd_generate(args):
+    logic, _ = load_logic(args)
+    try:
+        generated = logic.generate_random_strings(n=args.n, max_depth=args.depth)
+    except RuntimeError as e:
+        emit({"error": str(e)}, sys.stderr)
+        return 1
+    for string in generated:
+        emit({"string": string})
+
+
+def cmd_enumerate(args):
+    logic, _ = load_logic(args)
+    for string in logic.enumerate_strings(n=args.n or None, max_length=args.max_length,
+                                          min_length=args.min_length):
+        emit({"string": string})
+
+
+def cmd_sample(args):
+    logic, _ = load_logic(args)
+    min_length = args.length if args.length is not None else args.min_length
+    max_length = args.length if args.length is not None else args.max_length
+    strings = logic.stream_strings(n=args.n or None, min_length=min_length, max_length=max_length,
+                                   seed=args.seed, unique=args.unique, fp_rate=args.fp_rate,
+                                   capacity=args.capacity)
+    stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for string in strings: # Se escriben a medida que se generan (memoria constante)
+            if args.plain:
+                stream.write(string + "\n")
+            else:
+                emit({"string": string}, stream)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Generador de Gramáticas (modo línea de comandos)")
+    parser.add_argument("--cache-dir", default=GRAMMAR_CACHE_DIR,
+                        help="Directorio de la caché de gramáticas compiladas")
+    parser.add_argument("--cache-size", type=int, default=GRAMMAR_CACHE_MAX_BYTES,
+                        help="Tamaño máximo de la caché en bytes")
+    parser.add_argument("--no-cache", action="store_true", help="No leer ni escribir la caché")
+    parser.add_argument("--simplify", action="store_true",
+                        help="Eliminar símbolos inútiles, unitarias y reglas ε antes de parsear")
+    parser.add_argument("--stats", action="store_true",
+                        help="Medir tiempos por fase y contadores y escribirlos como JSON al terminar "
+                             "(con --workers solo cuenta el proceso principal)")
+    parser.add_argument("--stats-output", metavar="ARCHIVO",
+                        help="Archivo para el JSON de --stats (por defecto stderr)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("classify", help="Determina el tipo de la gramática")
+    p.add_argument("grammar", help="Archivo .cfg (formato de Guardar en la aplicación)")
+    p.set_defaults(func=cmd_classify)
+
+    p = sub.add_parser("validate", help="Valida cadenas (una por línea)")
+    p.add_argument("grammar")
+    p.add_argument("inputs", nargs="*", help="Archivos de cadenas ('-' o nada = stdin)")
+    p.add_argument("--results", choices=["bool", "count"], default="bool")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--chunk-size", type=int, default=256)
+    p.add_argument("--append-epsilon", action="store_true",
+                   help=f"Añadir '{EPSILON}' al final de cada cadena, como hace la interfaz")
+    p.add_argument("--bitmap", metavar="ARCHIVO",
+                   help="Solo Tipo 3: validar el archivo en lote con el AFD y escribir un bit por línea "
+                        "(bit i = línea i, orden little-endian dentro de cada byte)")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("generate", help="Genera cadenas del lenguaje")
+    p.add_argument("grammar")
+    p.add_argument("-n", type=int, default=MAX_GENERATED_STRINGS)
+    p.add_argument("--depth", type=int, default=7)
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("enumerate", help="Todas las cadenas hasta una longitud, de menor a mayor")
+    p.add_argument("grammar")
+    p.add_argument("-n", type=int, default=0, help="Cantidad máxima de cadenas (0 = todas)")
+    p.add_argument("--min-length", type=int, default=0)
+    p.add_argument("--max-length", type=int, default=7)
+    p.set_defaults(func=cmd_enumerate)
+
+    p = sub.add_parser("sample", help="Muestrea cadenas uniformemente por longitud")
+    p.add_argument("grammar")
+    p.add_argument("-n", type=int, default=MAX_GENERATED_STRINGS, help="Cantidad de cadenas (0 = sin límite)")
+    p.add_argument("--length", type=int, help="Longitud exacta (en terminales)")
+    p.add_argument("--min-length", type=int, default=0)
+    p.add_argument("--max-length", type=int, default=10)
+    p.add_argument("--seed", type=int, help="Semilla para una muestra reproducible")
+    p.add_argument("--unique", action="store_true", help="Descartar cadenas repetidas (filtro Bloom)")
+    p.add_argument("--fp-rate", type=float, default=0.001,
+                   help="Tasa de falsos positivos del filtro Bloom de --unique")
+    p.add_argument("--capacity", type=int,
+                   help="Cadenas para las que se dimensiona el filtro de --unique (por defecto -n; "
+                        "obligatorio con -n 0)")
+    p.add_argument("-o", "--output", help="Archivo de salida (por defecto stdout)")
+    p.add_argument("--plain", action="store_true", help="Una cadena por línea en lugar de JSONL")
+    p.set_defaults(func=cmd_sample)
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    args.instrumentation = Instrumentation(enabled=args.stats)
+    args.cache = None
+    try:
+        status = args.func(args)
+    except (OSError, ValueError) as e:
+        emit({"error": str(e)}, sys.stderr)
+        return 1
+    finally:
+        if args.stats:
+            write_stats(args)
+    return status or 0
+
+
+def write_stats(args):
+    """ Vuelca el snapshot de Instrumentation (más los contadores de la caché en disco) """
+    snapshot = args.instrumentation.snapshot()
+    if args.cache is not None:
+        snapshot['cache'] = {"hits": args.cache.hits, "misses": args.cache.misses,
+                             "discarded": args.cache.discarded, "write_errors": args.cache.write_errors}
+    if args.stats_output is None:
+        emit(snapshot, sys.stderr)
+    else:
+        with open(args.stats_output, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
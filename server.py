@@ -0,0 +1,267 @@
+# server.py
+# Servidor local de validación: mantiene las gramáticas compiladas en memoria (GrammarRegistry)
+# para que los clientes no paguen la importación de NLTK ni set_grammar en cada proceso.
+# Escucha HTTP en localhost o en un socket Unix (sin red). Cada petición se atiende en su hilo.
+# Ejemplos:
+#   python server.py --port 8765
+#   python server.py --unix /tmp/gramaticas.sock --memory-budget 268435456
+#   curl -s localhost:8765/grammars -d '{"grammar": {"text": "S -> '"'"'a'"'"' S '"'"'b'"'"'\nS -> '"'"'ε'"'"'"}}'
+#   curl -s --unix-socket /tmp/gramaticas.sock http://localhost/validate \
+#        -d '{"grammar": "<huella>", "inputs": ["ab", "aabb"], "append_epsilon": true}'
+# Rutas (cuerpo y respuesta en JSON):
+#   GET  /health, /stats, /grammars
+#   POST /grammars  {"grammar": ...}                                 -> huella, tipo y advertencias
+#   POST /validate  {"grammar": ..., "inputs": [...], "results": "bool"|"count", "append_epsilon": bool}
+#   POST /classify  {"grammar": ...}
+#   POST /generate  {"grammar": ..., "method": "sample"|"enumerate"|"random", "n", "min_length",
+#                    "max_length", "seed", "unique", "depth"}
+#                   (n se recorta a SERVER_MAX_GENERATED_STRINGS; en enumerate, n = 0 pide ese máximo;
+#                    max_length y depth por encima de sus límites en Constants responden 400)
+#   DELETE /grammars/<huella>
+# "grammar" es la huella devuelta al registrarla, {"text": contenido .cfg} o
+# {"start", "terminals", "non_terminals", "productions": [[lhs, rhs], ...]} (como set_grammar);
+# en los dos últimos casos la gramática se registra si no estaba.
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import signal
+import socketserver
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Constants import (EPSILON, MAX_GENERATED_STRINGS, GRAMMAR_CACHE_DIR, GRAMMAR_CACHE_MAX_BYTES,
+                       VALIDATION_CACHE_MAX_ENTRIES, VALIDATION_CACHE_MAX_BYTES, SERVER_HOST, SERVER_PORT,
+                       SERVER_MEMORY_BUDGET, SERVER_MAX_REQUEST_BYTES, SERVER_MAX_INPUTS,
+                       SERVER_MAX_GENERATED_STRINGS, SERVER_MAX_GENERATION_LENGTH,
+                       SERVER_MAX_ENUMERATION_LENGTH, SERVER_MAX_DEPTH)
+from GrammarCache import CompiledGrammarCache
+from GrammarRegistry import GrammarRegistry, GrammarCompileError, UnknownGrammarError
+from Instrumentation import Instrumentation
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """ Traduce las rutas HTTP a operaciones sobre el registro del servidor """
+
+    protocol_version = "HTTP/1.1" # Conexiones persistentes: un cliente puede reutilizar el socket
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    # --- Rutas ---
+
+    def do_GET(self):
+        registry = self.server.registry
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/stats":
+            result = {"registry": registry.snapshot()}
+            if self.server.instrumentation.enabled:
+                result.update(self.server.instrumentation.snapshot())
+            self._reply(200, result)
+        elif self.path == "/grammars":
+            self._reply(200, {"grammars": registry.snapshot()["grammars"]})
+        else:
+            self._reply(404, {"error": f"Error: Ruta desconocida '{self.path}'."})
+
+    def do_DELETE(self):
+        prefix = "/grammars/"
+        if not self.path.startswith(prefix):
+            self._reply(404, {"error": f"Error: Ruta desconocida '{self.path}'."})
+        elif self.server.registry.remove(self.path[len(prefix):]):
+            self._reply(200, {"removed": self.path[len(prefix):]})
+        else:
+            self._reply(404, {"error": "Error: Gramática no registrada."})
+
+    def do_POST(self):
+        body = self._read_body() # Siempre se consume: la conexión puede seguir abierta
+        if body is None:
+            return
+        handler = {"/grammars": self._register, "/validate": self._validate,
+                   "/classify": self._classify, "/generate": self._generate}.get(self.path)
+        if handler is None:
+            self._reply(404, {"error": f"Error: Ruta desconocida '{self.path}'."})
+            return
+        try:
+            with self.server.registry.using(body.get("grammar")) as (fingerprint, logic, warnings):
+                result = handler(body, logic)
+            self._reply(200, {"grammar": fingerprint, "warnings": warnings, **result})
+        except UnknownGrammarError:
+            self._reply(404, {"error": "Error: Gramática no registrada (envíe su contenido para registrarla)."})
+        except GrammarCompileError as e:
+            self._reply(400, {"errors": e.messages})
+        except (ValueError, TypeError) as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            self._reply(500, {"error": f"Error inesperado: {e}"})
+
+    # --- Operaciones (la gramática compilada se comparte con otras peticiones en curso) ---
+
+    def _register(self, body, logic):
+        return {"type": logic.grammar_type}
+
+    def _classify(self, body, logic):
+        return {"type": logic.grammar_type, **logic.analysis_report()}
+
+    def _validate(self, body, logic):
+        inputs = body.get("inputs")
+        if inputs is None:
+            inputs = [body.get("input", "")]
+        if not isinstance(inputs, list):
+            raise ValueError("Error: 'inputs' debe ser una lista de cadenas.")
+        if len(inputs) > SERVER_MAX_INPUTS:
+            raise ValueError(f"Error: Como máximo {SERVER_MAX_INPUTS} cadenas por petición (se recibieron {len(inputs)}).")
+        results = body.get("results", "bool")
+        if results not in ("bool", "count"):
+            raise ValueError("Error: 'results' debe ser 'bool' o 'count'.")
+        suffix = EPSILON if body.get("append_epsilon") else "" # Igual que GrammarApp
+        output = []
+        for input_string in inputs:
+            belongs, forest = logic.validate_string(str(input_string) + suffix, with_trees=results == "count")
+            output.append(belongs if results == "bool" else (forest.count() if forest else 0))
+        return {"results": output}
+
+    def _generate(self, body, logic):
+        method = body.get("method", "sample")
+        if method not in ("sample", "enumerate", "random"):
+            raise ValueError("Error: 'method' debe ser 'sample', 'enumerate' o 'random'.")
+        n = int(body.get("n", MAX_GENERATED_STRINGS))
+        if n < 0:
+            raise ValueError("Error: 'n' no puede ser negativo.")
+        if method == "enumerate" and n == 0: # Todas las cadenas: como mucho el límite
+            n = SERVER_MAX_GENERATED_STRINGS
+        n = min(n, SERVER_MAX_GENERATED_STRINGS)
+        min_length = int(body.get("min_length", 0))
+        max_length = int(body.get("max_length", 10 if method == "sample" else 7))
+        if method == "random":
+            depth = int(body.get("depth", 7))
+            if not 0 <= depth <= SERVER_MAX_DEPTH:
+                raise ValueError(f"Error: 'depth' debe estar entre 0 y {SERVER_MAX_DEPTH}.")
+        else: # El coste de sample es polinómico en max_length; el de enumerate, exponencial
+            limit = SERVER_MAX_GENERATION_LENGTH if method == "sample" else SERVER_MAX_ENUMERATION_LENGTH
+            if not 0 <= min_length <= max_length <= limit:
+                raise ValueError(f"Error: Se requiere 0 <= min_length <= max_length <= {limit} con '{method}'.")
+        if method == "sample":
+            strings = list(itertools.islice(logic.stream_strings(n=n, min_length=min_length, max_length=max_length,
+                                                                 seed=body.get("seed"),
+                                                                 unique=bool(body.get("unique", False))), n))
+        elif method == "enumerate":
+            strings = logic.enumerate_strings(n=n, max_length=max_length, min_length=min_length)
+        else:
+            strings = logic.generate_random_strings(n=n, max_depth=depth)
+        return {"strings": list(strings)}
+
+    # --- E/S ---
+
+    def _read_body(self):
+        """ Cuerpo JSON de la petición (dict) o None si ya se respondió con un error """
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > SERVER_MAX_REQUEST_BYTES:
+            self.close_connection = True # El cuerpo no se lee
+            self._reply(413, {"error": "Error: Cuerpo de la petición inválido o demasiado grande."})
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._reply(400, {"error": f"Error: JSON inválido ({e})."})
+            return None
+        if not isinstance(body, dict):
+            self._reply(400, {"error": "Error: El cuerpo debe ser un objeto JSON."})
+            return None
+        return body
+
+    def _reply(self, status, obj):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def build_server(args):
+    """ Servidor HTTP (TCP o socket Unix) con el registro y las métricas como atributos """
+    if args.unix:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(args.unix) # Socket de una ejecución anterior
+        server = ThreadingUnixHTTPServer(args.unix, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), RequestHandler)
+        server.daemon_threads = True
+    cache = None if args.no_cache else CompiledGrammarCache(args.cache_dir, args.cache_size)
+    server.instrumentation = Instrumentation(enabled=args.stats)
+    server.registry = GrammarRegistry(args.memory_budget, cache=cache, simplify=args.simplify,
+                                      stats=server.instrumentation,
+                                      result_cache_entries=args.result_cache_entries,
+                                      result_cache_bytes=args.result_cache_bytes)
+    server.quiet = args.quiet
+    return server
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Servidor local de validación con gramáticas precompiladas")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", metavar="RUTA", help="Escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--memory-budget", type=int, default=SERVER_MEMORY_BUDGET,
+                        help="Bytes estimados para las gramáticas en memoria (se expulsan las menos usadas)")
+    parser.add_argument("--result-cache-entries", type=int, default=VALIDATION_CACHE_MAX_ENTRIES,
+                        help="Resultados de validación guardados por gramática (0 = sin caché)")
+    parser.add_argument("--result-cache-bytes", type=int, default=VALIDATION_CACHE_MAX_BYTES)
+    parser.add_argument("--cache-dir", default=GRAMMAR_CACHE_DIR,
+                        help="Directorio de la caché de gramáticas compiladas")
+    parser.add_argument("--cache-size", type=int, default=GRAMMAR_CACHE_MAX_BYTES,
+                        help="Tamaño máximo de la caché en bytes")
+    parser.add_argument("--no-cache", action="store_true", help="No leer ni escribir la caché en disco")
+    parser.add_argument("--simplify", action="store_true",
+                        help="Eliminar símbolos inútiles, unitarias y reglas ε antes de parsear")
+    parser.add_argument("--preload", nargs="*", default=[], metavar="GRAMATICA",
+                        help="Archivos .cfg a compilar al arrancar")
+    parser.add_argument("--stats", action="store_true",
+                        help="Medir tiempos por fase y contadores (se consultan en GET /stats)")
+    parser.add_argument("--quiet", action="store_true", help="No registrar cada petición en stderr")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    server = build_server(args)
+    for path in args.preload:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            with server.registry.using({"text": text}) as (fingerprint, _, _):
+                print(f"Gramática {path}: {fingerprint}", file=sys.stderr)
+        except (OSError, ValueError) as e:
+            print(f"Error al precargar {path}: {e}", file=sys.stderr)
+            return 1
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0)) # Cerrar limpio (y borrar el socket Unix)
+    where = args.unix or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Escuchando en {where}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(args.unix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# baseline.py
+# Referencia para las pruebas de los motores: el EarleyChartParser de NLTK sobre el CFG de la
+# gramática (lo que usaba la aplicación antes de los motores propios) y gramáticas de prueba.
+
+import itertools
+
+from nltk.parse import EarleyChartParser
+
+from Constants import EPSILON
+from GrammarLogic import GrammarLogicNLTK
+
+# (S, T, NT, filas) como en set_grammar. ε es un terminal más: la interfaz lo añade al final
+# de cada cadena y las gramáticas lo usan para aceptar ese final (S -> ε).
+REGULAR = {
+    "ab_star": ("S", "a,b", "S", [("S", "aS"), ("S", "bS"), ("S", "")]),
+    "even_a": ("S", "a,b", "S,A", [("S", "aA"), ("S", "bS"), ("S", ""), ("A", "aS"), ("A", "bA")]),
+    "ends_in_epsilon": ("S", f"a,b,{EPSILON}", "S,A", [("S", "aA"), ("A", "bS"), ("A", EPSILON)]),
+    "redundant_states": ("S", "a,b", "S,A,B,C", [("S", "aA"), ("S", "aB"), ("A", "b"), ("B", "b"),
+                                                  ("B", "bC"), ("C", "aC")]),
+    "empty_language": ("S", "a", "S,A", [("S", "aA"), ("A", "aA")]),
+}
+CONTEXT_FREE = {
+    "anbn": ("S", "a,b", "S", [("S", "aSb"), ("S", "")]),
+    "anbn_epsilon": ("S", f"a,b,{EPSILON}", "S,A", [("S", "A" + EPSILON), ("A", "aAb"), ("A", "")]),
+    "dyck": ("S", "(,)", "S", [("S", "SS"), ("S", "(S)"), ("S", "")]),
+    "ambiguous_sum": ("E", "a,+", "E", [("E", "E+E"), ("E", "a")]),
+    "nullable_chain": ("S", "a,b", "S,A,B", [("S", "AB"), ("A", "aA"), ("A", ""), ("B", "bB"), ("B", "A")]),
+    "unit_cycle": ("S", "a,b", "S,A", [("S", "A"), ("A", "S"), ("A", "a"), ("S", "Sb")]),
+    "useless_symbols": ("S", "a,b", "S,A,B", [("S", "aSb"), ("S", "ab"), ("S", "B"), ("A", "a"), ("B", "aB")]),
+}
+# Deterministas (LL(1) y/o LALR(1))
+DETERMINISTIC = {
+    "anbn": CONTEXT_FREE["anbn"],
+    "expressions": ("E", "a,+,*,(,)", "E,T,F", [("E", "E+T"), ("E", "T"), ("T", "T*F"), ("T", "F"),
+                                                 ("F", "(E)"), ("F", "a")]),
+    "expressions_ll": ("E", "a,+,*,(,)", "E,X,T,Y,F", [("E", "TX"), ("X", "+TX"), ("X", ""), ("T", "FY"),
+                                                      ("Y", "*FY"), ("Y", ""), ("F", "(E)"), ("F", "a")]),
+    "anbn_epsilon": CONTEXT_FREE["anbn_epsilon"],
+}
+
+
+def compile_grammar(spec, **options):
+    """ GrammarLogicNLTK con la gramática cargada (sin caché de resultados) """
+    logic = GrammarLogicNLTK(result_cache_entries=0, **options)
+    messages = logic.set_grammar(*spec)
+    assert not any("Error" in m for m in messages), messages
+    return logic
+
+
+def nltk_accepts(logic, word):
+    """ Pertenencia según el EarleyChartParser de NLTK (arista completa de S sobre toda la cadena) """
+    tokens = list(word)
+    try:
+        chart = EarleyChartParser(logic.cfg).chart_parse(tokens)
+    except ValueError: # Token fuera de la gramática
+        return False
+    return any(True for _ in chart.select(start=0, end=len(tokens), is_complete=True, lhs=logic.start_symbol))
+
+
+def words(logic, max_length, extra="\n"):
+    """ Todas las cadenas hasta max_length sobre los terminales de un carácter, ε y extra """
+    alphabet = sorted({t for t in logic.terminals if len(t) == 1} | {EPSILON} | set(extra))
+    for length in range(max_length + 1):
+        yield from map("".join, itertools.product(alphabet, repeat=length))
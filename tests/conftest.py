@@ -0,0 +1,7 @@
+# conftest.py
+# Las pruebas importan los módulos de la raíz del repositorio (como benchmarks/).
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
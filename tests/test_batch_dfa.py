@@ -0,0 +1,40 @@
+# test_batch_dfa.py
+# Pertenencia en lote con el AFD vectorizado (BatchDFARunner) frente a validate_string y al
+# Earley de NLTK: saltos de línea '\n', '\r\n' y '\r', líneas vacías y el sufijo ε.
+
+import numpy as np
+import pytest
+
+from baseline import CONTEXT_FREE, REGULAR, compile_grammar, nltk_accepts, words
+from Constants import EPSILON
+
+ACCENTED = ("S", "a,ñ,b", "S,A", [("S", "ñA"), ("S", "aS"), ("A", "b"), ("A", "")]) # Terminal de 2 bytes
+
+
+@pytest.mark.parametrize("spec", [REGULAR[name] for name in sorted(REGULAR)] + [ACCENTED])
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_batch_matches_nltk(spec, newline):
+    logic = compile_grammar(spec)
+    lines = list(words(logic, 4, extra=""))
+    data = newline.join(lines).encode("utf-8") # Última línea sin salto
+    for suffix in ("", EPSILON):
+        accepted = logic.batch_dfa.run_bytes(data, suffix)
+        assert len(accepted) == len(lines)
+        assert list(accepted) == [nltk_accepts(logic, line + suffix) for line in lines]
+
+
+def test_validate_corpus_matches_validate_string(tmp_path):
+    logic = compile_grammar(REGULAR["ends_in_epsilon"])
+    lines = ["ab", "", "abab", "ba", "ab" * 40, "a"] * 7 # Más cadenas activas que SCALAR_TAIL
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_bytes(("\n".join(lines) + "\n").encode("utf-8"))
+    bitmap, n = logic.validate_corpus(str(corpus), append_epsilon=True)
+    assert n == len(lines)
+    accepted = np.unpackbits(bitmap, count=n, bitorder='little').astype(bool)
+    assert list(accepted) == [logic.validate_string(line + EPSILON, with_trees=False)[0] for line in lines]
+
+
+def test_context_free_grammars_are_rejected():
+    logic = compile_grammar(CONTEXT_FREE["anbn"])
+    with pytest.raises(ValueError):
+        logic.validate_corpus("no-se-lee.txt")
@@ -0,0 +1,36 @@
+# test_cli.py
+# Punto de entrada sin interfaz: los errores van a stderr como {"error": ...} con código 1.
+
+import json
+
+import cli
+import GrammarLogic
+
+GRAMMAR = ("# Start Symbol: S\n# Terminals: a,b\n# NonTerminals: S\n# --- Productions ---\n"
+           "S -> 'a' S 'b'\nS ->\n")
+
+
+def test_generate_reports_nltk_failures(tmp_path, capsys, monkeypatch):
+    grammar = tmp_path / "g.cfg"
+    grammar.write_text(GRAMMAR, encoding="utf-8")
+
+    def failing_generate(*args, **kwargs):
+        raise RecursionError("maximum recursion depth exceeded")
+        yield
+
+    monkeypatch.setattr(GrammarLogic, "generate", failing_generate)
+    assert cli.main(["--no-cache", "generate", str(grammar)]) == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "generación NLTK" in json.loads(err)["error"]
+
+
+def test_validate_rejects_bad_arguments_before_any_output(tmp_path, capsys):
+    grammar = tmp_path / "g.cfg"
+    grammar.write_text(GRAMMAR, encoding="utf-8")
+    inputs = tmp_path / "inputs.txt"
+    inputs.write_text("ab\naabb\n", encoding="utf-8")
+    for flags in (["--workers", "0"], ["--chunk-size", "0"]):
+        assert cli.main(["--no-cache", "validate", str(grammar), str(inputs), *flags]) == 1
+        out, err = capsys.readouterr()
+        assert out == "" and "error" in json.loads(err)
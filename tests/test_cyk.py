@@ -0,0 +1,15 @@
+# test_cyk.py
+# Reconocedor CYK vectorizado (NumPy) sobre la FNC frente al Earley de NLTK.
+
+import pytest
+
+from baseline import CONTEXT_FREE, REGULAR, compile_grammar, nltk_accepts, words
+
+
+@pytest.mark.parametrize("name", sorted(CONTEXT_FREE) + ["ends_in_epsilon", "empty_language"])
+def test_cyk_matches_nltk(name):
+    logic = compile_grammar(CONTEXT_FREE.get(name) or REGULAR[name])
+    for word in words(logic, 5):
+        expected = nltk_accepts(logic, word)
+        assert logic.validate_string_cyk(word) == expected, repr(word)
+        assert logic.cross_check_string(word) == (expected, expected), repr(word)
@@ -0,0 +1,91 @@
+# test_deltas.py
+# Cambios por producción (add/remove/replace_production) frente a recompilar con set_grammar,
+# y la sincronización de filas de GrammarApp (sin ventana: métodos sobre un objeto mínimo).
+
+import itertools
+import random
+
+import pytest
+
+from baseline import words
+from GrammarAnalysis import nullable_symbols, productive_symbols
+from GrammarApp import GrammarApp
+from GrammarLogic import GrammarLogicNLTK
+
+HEADER = ("S", "a,b", "S,A,B")
+POOL = [("S", "aSb"), ("S", ""), ("S", "SS"), ("S", "bA"), ("A", "aA"), ("A", ""), ("A", "a"),
+        ("A", "BA"), ("B", "bB"), ("B", "A"), ("B", "b"), ("B", "")]
+
+
+class AppStub:
+    """ Lo que usan _compiled_cleanly y _sync_production_deltas de GrammarApp """
+    _compiled_cleanly = GrammarApp._compiled_cleanly
+    _sync_production_deltas = GrammarApp._sync_production_deltas
+
+    def __init__(self):
+        self.logic = GrammarLogicNLTK()
+        self._synced_grammar = None
+
+
+def test_fatal_error_is_not_a_sync_point():
+    app = AppStub()
+    errors = app.logic.set_grammar("S", "a", "S,A", [("A", "a")]) # S sin producciones
+    assert app.logic.has_grammar() and any("Error:" in e for e in errors)
+    assert not app._compiled_cleanly(errors)
+
+
+def test_sync_applies_only_the_changed_rows(monkeypatch):
+    app = AppStub()
+    header = ("S", "a,b", "S")
+    rows = [("S", "aSb"), ("S", "")]
+    errors = app.logic.set_grammar(*header, rows)
+    assert app._compiled_cleanly(errors)
+    app._synced_grammar = (header, rows)
+
+    calls = []
+    for name in ("add_production", "remove_production", "set_grammar"):
+        method = getattr(app.logic, name)
+        def spy(*args, _name=name, _method=method):
+            calls.append((_name, *args))
+            return _method(*args)
+        monkeypatch.setattr(app.logic, name, spy)
+
+    assert app._sync_production_deltas(header, [("S", "aSb"), ("S", "ab")])
+    assert calls == [("remove_production", "S", ""), ("add_production", "S", "ab")]
+    assert app.logic.validate_string("aabb")[0]
+    assert not app.logic.validate_string("")[0]
+    assert not app._sync_production_deltas(("S", "a,b,c", "S"), rows) # Cambió T: recompilar
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_deltas_match_a_full_recompile(seed):
+    rng = random.Random(seed)
+    rows = [("S", "AB")] + POOL # S -> AB no se quita nunca: S siempre tiene producciones
+    logic = GrammarLogicNLTK(result_cache_entries=0)
+    logic.set_grammar(*HEADER, rows)
+    logic.stats.enabled = True
+    set_changes = 0 # Deltas que cambian el conjunto de producciones (no solo las repeticiones)
+    for _ in range(40):
+        row = rng.choice(POOL)
+        before = set(logic._productions)
+        if row in rows and rng.random() < 0.6:
+            rows.remove(row)
+            assert logic.remove_production(*row) == []
+        else:
+            rows.append(row) # Puede repetirse: solo cambia la huella
+            assert logic.add_production(*row) == []
+        set_changes += set(logic._productions) != before
+
+        fresh = GrammarLogicNLTK(result_cache_entries=0)
+        fresh.set_grammar(*HEADER, rng.sample(rows, len(rows)))
+        assert logic.fingerprint == fresh.fingerprint
+        assert logic.grammar_type == fresh.grammar_type
+        pairs = [(p.lhs(), p.rhs()) for p in logic._productions]
+        assert logic._delta_index.nullable == nullable_symbols(pairs)
+        assert logic._delta_index.productive == productive_symbols(pairs)
+        for word in words(logic, 5, extra=""):
+            tokens = list(word)
+            assert logic.parser.recognize(tokens) == fresh.parser.recognize(tokens), (rows, word)
+    # El parser se actualiza en sitio salvo al compactar las reglas muertas
+    assert set_changes - 2 <= logic.stats.counters.get('parser_updates', 0) <= set_changes
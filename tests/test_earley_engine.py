@@ -0,0 +1,41 @@
+# test_earley_engine.py
+# Parser Earley sobre enteros (EarleyEngine) frente al EarleyChartParser de NLTK.
+
+import pytest
+from nltk.parse import EarleyChartParser
+
+from baseline import CONTEXT_FREE, REGULAR, compile_grammar, nltk_accepts, words
+
+
+@pytest.mark.parametrize("name", sorted(CONTEXT_FREE) + ["ends_in_epsilon", "empty_language"])
+def test_earley_matches_nltk(name):
+    logic = compile_grammar(CONTEXT_FREE.get(name) or REGULAR[name])
+    engine = logic.parser
+    for word in words(logic, 5):
+        expected = nltk_accepts(logic, word)
+        tokens = list(word)
+        assert engine.recognize(tokens) == expected, repr(word)
+        forest = engine.parse(tokens)
+        assert bool(forest) == expected, repr(word)
+        if expected:
+            assert "".join(forest.first_tree().leaves()) == word
+
+
+@pytest.mark.parametrize("name, word", [("ambiguous_sum", "a+a+a+a"), ("nullable_chain", "aaba"),
+                                        ("anbn_epsilon", "aabbε")])
+def test_tree_counts_match_nltk(name, word):
+    """ Gramáticas sin ciclos: el bosque tiene exactamente los árboles que enumera NLTK """
+    logic = compile_grammar(CONTEXT_FREE[name])
+    forest = logic.parser.parse(list(word))
+    expected = {str(tree) for tree in EarleyChartParser(logic.cfg).parse(list(word))}
+    assert forest.count() == len(expected)
+    assert {str(tree) for tree in forest.trees()} == expected
+
+
+def test_session_matches_full_parse():
+    """ La sesión por prefijos acepta lo mismo que el parseo completo, con retrocesos """
+    logic = compile_grammar(CONTEXT_FREE["dyck"])
+    session = logic.prefix_session()
+    for word in words(logic, 4, extra=""):
+        session.sync(list(word))
+        assert session.accepts == nltk_accepts(logic, word), repr(word)
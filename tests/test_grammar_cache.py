@@ -0,0 +1,44 @@
+# test_grammar_cache.py
+# Caché en disco de gramáticas compiladas: carga en caliente desde set_grammar sin
+# tokenizar las filas, y huellas distintas para segmentaciones distintas.
+
+import pytest
+
+from GrammarCache import CompiledGrammarCache
+from GrammarIO import read_grammar_stream
+from GrammarLogic import GrammarLogicNLTK
+
+HEADER = ("S", "a,b", "S,A,B,AB")
+ROWS = [("S", "aSb"), ("S", "AB"), ("A", "a"), ("B", "b"), ("AB", "ab")]
+
+
+def cached_logic(tmp_path):
+    return GrammarLogicNLTK(cache=CompiledGrammarCache(str(tmp_path), 1 << 20))
+
+
+def test_warm_set_grammar_skips_tokenizing(tmp_path, monkeypatch):
+    cold = cached_logic(tmp_path)
+    messages = cold.set_grammar(*HEADER, ROWS)
+
+    warm = cached_logic(tmp_path)
+    monkeypatch.setattr(warm, "_parse_rows", lambda rows: pytest.fail("tokenizó las filas"))
+    assert warm.set_grammar(" S ", "b, a", "AB,B,A,S", [("S ", " aSb"), ("", "")] + ROWS[1:]) == messages
+    assert warm.fingerprint == cold.fingerprint
+    assert warm.validate_string("aabb")[0] and not warm.validate_string("abb")[0]
+
+
+def test_segmentations_do_not_share_a_fingerprint(tmp_path):
+    """ 'S -> A B' leída de un archivo y la fila 'AB' de la UI (que se segmenta como AB) """
+    spaced = read_grammar_stream(["# Start Symbol: S", "# Terminals: a,b", "# NonTerminals: S,A,B,AB",
+                                  "# --- Productions ---", "S -> A B", "A -> 'a'", "B -> 'b'", "AB -> 'a'"])
+    from_file = cached_logic(tmp_path)
+    assert not from_file.load_parsed_grammar(spaced)
+    from_rows = cached_logic(tmp_path)
+    from_rows.set_grammar(*spaced.spec()) # Las filas concatenan los símbolos: 'AB'
+    assert from_file.fingerprint != from_rows.fingerprint
+    assert from_file.validate_string("ab")[0] and not from_file.validate_string("a")[0]
+    assert from_rows.validate_string("a")[0] and not from_rows.validate_string("ab")[0]
+
+    again = cached_logic(tmp_path) # Carga en caliente por el alias de las filas
+    again.set_grammar(*spaced.spec())
+    assert again.fingerprint == from_rows.fingerprint
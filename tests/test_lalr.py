@@ -0,0 +1,52 @@
+# test_lalr.py
+# Tablas LALR(1) y parser desplazamiento-reducción (LALR1Parser) frente al Earley de NLTK.
+
+import pickle
+
+import pytest
+
+from baseline import CONTEXT_FREE, DETERMINISTIC, compile_grammar, nltk_accepts, words
+from GrammarCache import CompiledGrammarCache
+
+
+@pytest.mark.parametrize("name", sorted(DETERMINISTIC))
+def test_lalr_parser_matches_nltk(name):
+    logic = compile_grammar(DETERMINISTIC[name])
+    assert logic.is_lalr1()
+    for word in words(logic, 5 if len(logic.terminals) < 4 else 4):
+        expected = nltk_accepts(logic, word)
+        tokens = list(word)
+        assert logic.lalr.recognize(tokens) == expected, repr(word)
+        forest = logic.lalr.parse(tokens)
+        assert forest.count() == (1 if expected else 0), repr(word)
+        if expected:
+            assert str(forest.first_tree()) == str(logic.parser.parse(tokens).first_tree())
+
+
+@pytest.mark.parametrize("name", ["ambiguous_sum", "dyck"])
+def test_ambiguous_grammars_report_conflicts(name):
+    logic = compile_grammar(CONTEXT_FREE[name])
+    assert not logic.is_lalr1() and logic.lalr.conflict_messages()
+
+
+def test_tables_survive_the_disk_cache(tmp_path):
+    spec = DETERMINISTIC["expressions"]
+    cold = compile_grammar(spec, cache=CompiledGrammarCache(str(tmp_path), 1 << 20))
+    tables = pickle.dumps((cold.lalr.action, cold.lalr.goto))
+    warm = compile_grammar(spec, cache=CompiledGrammarCache(str(tmp_path), 1 << 20))
+    warm.stats.enabled = True
+    assert pickle.dumps((warm.lalr.action, warm.lalr.goto)) == tables
+    assert warm.stats.counters.get('lalr_cache_hits') == 1
+
+
+def test_validation_uses_lalr_only_once_built_or_cached(tmp_path):
+    spec = DETERMINISTIC["expressions"]
+    cache = CompiledGrammarCache(str(tmp_path), 1 << 20)
+    logic = compile_grammar(spec, cache=cache)
+    assert not logic.is_ll1()
+    assert logic.validate_string("a+a*a")[0]
+    assert 'lalr' not in logic._derived and logic._tree_parser() is logic.parser
+    assert logic.is_lalr1() and logic._tree_parser() is logic.lalr
+
+    warm = compile_grammar(spec, cache=cache) # Tablas en disco: se usan sin construirlas
+    assert warm._tree_parser().is_lalr1 and 'lalr' not in warm._derived
@@ -0,0 +1,29 @@
+# test_ll1.py
+# Detección LL(1) y parser predictivo (LL1Parser) frente al Earley de NLTK.
+
+import pytest
+
+from baseline import CONTEXT_FREE, DETERMINISTIC, compile_grammar, nltk_accepts, words
+
+
+@pytest.mark.parametrize("name", ["anbn", "anbn_epsilon", "expressions_ll"])
+def test_ll1_parser_matches_nltk(name):
+    logic = compile_grammar(DETERMINISTIC[name])
+    assert logic.is_ll1()
+    for word in words(logic, 5):
+        expected = nltk_accepts(logic, word)
+        tokens = list(word)
+        assert logic.ll1.recognize(tokens) == expected, repr(word)
+        forest = logic.ll1.parse(tokens)
+        assert forest.count() == (1 if expected else 0), repr(word)
+        if expected:
+            assert str(forest.first_tree()) == str(logic.parser.parse(tokens).first_tree())
+
+
+@pytest.mark.parametrize("grammar", [DETERMINISTIC["expressions"], CONTEXT_FREE["ambiguous_sum"],
+                                     CONTEXT_FREE["dyck"]])
+def test_non_ll1_grammars_report_conflicts(grammar):
+    logic = compile_grammar(grammar)
+    assert not logic.is_ll1() and logic.ll1.conflict_messages()
+    with pytest.raises(ValueError):
+        logic.ll1.recognize(["a"])
@@ -0,0 +1,114 @@
+# test_parse_forest.py
+# Conteo de derivaciones y árboles del bosque (ParseForest) con gramáticas con ciclos
+# unitarios y ε, contrastado con una enumeración por fuerza bruta, y entre motores.
+
+import itertools
+
+import pytest
+
+from GrammarLogic import GrammarLogicNLTK
+
+
+def brute_count(forest, node, path=frozenset()):
+    """ Derivaciones sin nodos repetidos en un camino, sin memoización """
+    path = path | {node}
+    total = 0
+    for fam in forest._get_families(node):
+        if any(isinstance(child, tuple) and child in path for child in fam):
+            continue
+        product = 1
+        for child in fam:
+            if isinstance(child, tuple):
+                product *= brute_count(forest, child, path)
+        total += product
+    return total
+
+
+def grammar(non_terminals, rows, terminals="a,b"):
+    logic = GrammarLogicNLTK(result_cache_entries=0)
+    messages = logic.set_grammar("S", terminals, non_terminals, rows)
+    assert not any("Error" in m for m in messages), messages
+    return logic
+
+
+CYCLIC = [
+    ("S,A,C", [("S", "Sb"), ("S", "C"), ("A", "SA"), ("A", "Ca"), ("A", ""), ("C", "A")]),
+    ("S,A", [("S", "A"), ("A", "S"), ("A", "a"), ("S", "Sb")]),
+    ("S,A,B", [("S", "AB"), ("A", "A"), ("A", ""), ("A", "a"), ("B", "S"), ("B", "b")]),
+    ("S", [("S", "SS"), ("S", ""), ("S", "a")]),
+]
+
+
+def test_unit_and_epsilon_cycle_regression():
+    logic = grammar(*CYCLIC[0])
+    belongs, forest = logic.validate_string("aaba", with_trees=True)
+    assert belongs
+    assert forest.count() > 0
+    assert "".join(forest.first_tree().leaves()) == "aaba"
+    assert list(logic.validate_many(["aaba"], workers=1, results="tree"))[0] is not None
+
+
+@pytest.mark.parametrize("non_terminals, rows", CYCLIC)
+def test_cyclic_counts_match_brute_force(non_terminals, rows):
+    logic = grammar(non_terminals, rows)
+    for n in range(5):
+        for word in map("".join, itertools.product("ab", repeat=n)):
+            belongs, forest = logic.validate_string(word, with_trees=True)
+            if not belongs:
+                continue
+            count = forest.count()
+            assert count == brute_count(forest, forest.root) > 0, word
+            trees = [forest.tree(i) for i in range(min(count, 25))]
+            assert len({str(t) for t in trees}) == len(trees)
+            assert all("".join(t.leaves()) == word for t in trees)
+
+
+def test_engines_agree_on_counts():
+    """ El mismo conteo con Earley y con el parser determinista (LL(1) o LALR(1)) """
+    logic = grammar("S,E,T", [("S", "E"), ("E", "E+T"), ("E", "T"), ("T", "a"), ("T", "(E)")],
+                    terminals="a,+,(,)")
+    assert logic.is_lalr1()
+    for word in ["a", "a+a", "(a+a)+a", "((a))"]:
+        tokens = list(word)
+        earley = logic.parser.parse(tokens)
+        deterministic = logic._tree_parser().parse(tokens)
+        assert earley.count() == deterministic.count() == 1
+        assert str(earley.first_tree()) == str(deterministic.first_tree())
+
+
+def test_validate_many_checks_arguments_eagerly():
+    logic = grammar(*CYCLIC[0])
+    for options in ({"workers": 0}, {"chunk_size": 0}, {"results": "trees"}):
+        with pytest.raises(ValueError):
+            logic.validate_many(["a"], **options) # Sin iterar
+    words = ["aaba", "b", "ab", "aab"]
+    assert (list(logic.validate_many(words, workers=2, chunk_size=1, results="count")) ==
+            list(logic.validate_many(words, workers=1, results="count")))
+
+
+def as_text(node):
+    """ ForestNode o nltk.Tree como texto entre paréntesis (recorre todo el árbol) """
+    if isinstance(node, str):
+        return node
+    return "(" + " ".join([node.label()] + [as_text(child) for child in node]) + ")"
+
+
+@pytest.mark.parametrize("non_terminals, rows", CYCLIC)
+def test_lazy_trees_match_built_trees(non_terminals, rows):
+    logic = grammar(non_terminals, rows)
+    for word in ["aab", "aaba", "ab"]:
+        belongs, forest = logic.validate_string(word)
+        for index in range(min(forest.count(), 10) if belongs else 0):
+            assert as_text(forest.lazy_tree(index)) == as_text(forest.tree(index))
+
+
+def test_lazy_tree_decodes_only_what_is_visited(monkeypatch):
+    logic = grammar("S", [("S", "SS"), ("S", "a")], terminals="a")
+    _, forest = logic.validate_string("a" * 12)
+    decoded = []
+    select = forest._select
+    monkeypatch.setattr(forest, "_select", lambda key, k: decoded.append(key) or select(key, k))
+    root = forest.lazy_tree(forest.count() - 1)
+    assert [child.label() for child in root] == ["S", "S"]
+    assert len(decoded) == 1
+    assert as_text(root).count("a") == 12 and len(decoded) == 23 # 2 * 12 - 1 nodos internos
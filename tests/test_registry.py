@@ -0,0 +1,58 @@
+# test_registry.py
+# GrammarRegistry: peticiones concurrentes sobre la misma gramática y expulsión por memoria.
+
+import threading
+
+import pytest
+
+from GrammarRegistry import GrammarRegistry
+
+ANBN = {"start": "S", "terminals": "a,b", "non_terminals": "S", "productions": [["S", "aSb"], ["S", ""]]}
+
+
+def test_same_grammar_is_used_concurrently():
+    registry = GrammarRegistry(max_bytes=1 << 30)
+    both_inside = threading.Barrier(2, timeout=5) # Se rompe si using() serializa las peticiones
+
+    def request():
+        with registry.using(ANBN) as (_, logic, _):
+            both_inside.wait()
+            assert logic.validate_string("aabb")[0]
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not both_inside.broken
+    assert registry.misses == 1 and registry.hits == 1
+
+
+def test_evicts_even_when_the_handler_raises():
+    registry = GrammarRegistry(max_bytes=1 << 30)
+    with registry.using(ANBN) as (fingerprint, _, _):
+        pass
+    registry.max_bytes = 0
+    other = dict(ANBN, productions=[["S", "aS"], ["S", "b"]])
+    with pytest.raises(RuntimeError):
+        with registry.using(other):
+            raise RuntimeError("fallo del manejador")
+    assert fingerprint not in [g["grammar"] for g in registry.snapshot()["grammars"]]
+    assert registry.evictions == 1
+
+
+def test_generation_tables_count_against_the_budget():
+    registry = GrammarRegistry(max_bytes=1 << 30)
+    with registry.using(ANBN) as (fingerprint, logic, _):
+        compiled = registry.snapshot()["bytes"]
+        logic.enumerate_strings(n=None, max_length=12)
+        list(logic.stream_strings(n=5, max_length=30, seed=1, unique=False))
+    grown = registry.snapshot()
+    assert grown["grammars"][0]["generation_bytes"] == logic.generation_bytes() > 0
+    assert grown["bytes"] == compiled + logic.generation_bytes()
+
+    registry.max_bytes = compiled # Sin otras gramáticas que expulsar: se sueltan sus tablas
+    with registry.using(fingerprint) as (_, logic, _):
+        assert logic.enumerate_strings(n=None, max_length=4) == ["", "ab", "aabb"]
+    assert logic.sampler is None and logic.enumerator is None
+    assert registry.generation_drops == 1 and registry.snapshot()["bytes"] == compiled
@@ -0,0 +1,22 @@
+# test_regular_engine.py
+# AFD mínimo de las gramáticas Tipo 3 (RegularAutomaton) frente al Earley de NLTK.
+
+import pytest
+
+from baseline import REGULAR, compile_grammar, nltk_accepts, words
+from GrammarLogic import REGULAR_TYPE
+
+
+@pytest.mark.parametrize("name", sorted(REGULAR))
+def test_dfa_matches_nltk(name):
+    logic = compile_grammar(REGULAR[name])
+    assert logic.grammar_type == REGULAR_TYPE and logic.dfa is not None
+    for word in words(logic, 5):
+        expected = nltk_accepts(logic, word)
+        assert logic.dfa.accepts(list(word)) == expected, repr(word)
+        assert logic.validate_string(word, with_trees=False)[0] == expected, repr(word)
+
+
+def test_dfa_is_minimal():
+    assert compile_grammar(REGULAR["redundant_states"]).dfa.state_count == 3 # S, {A, B}, aceptación
+    assert compile_grammar(REGULAR["empty_language"]).dfa.state_count == 1
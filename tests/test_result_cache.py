@@ -0,0 +1,65 @@
+# test_result_cache.py
+# Caché de resultados de validate_string (ValidationResultCache): bosques compartidos,
+# invalidación al cambiar la gramática y límites de entradas y bytes.
+
+import threading
+
+import pytest
+
+from Cancellation import OperationCancelled
+from GrammarCache import ValidationResultCache
+from GrammarLogic import GrammarLogicNLTK
+
+
+def test_cached_forest_counts_with_each_callers_cancel():
+    logic = GrammarLogicNLTK()
+    logic.set_grammar("S", "a", "S", [("S", "SS"), ("S", "a")])
+    word = "a" * 64 # Bosque con miles de nodos: el conteo consulta cancel
+    cancelled = threading.Event()
+    cancelled.set()
+
+    _, forest = logic.validate_string(word)
+    _, shared = logic.validate_string(word, cancel=cancelled) # Acierto: no parsea ni cuenta
+    assert shared is forest
+    with pytest.raises(OperationCancelled):
+        forest.count(cancelled)
+    assert shared.count() > 0 # La cancelación de otro trabajo no afecta a este conteo
+
+
+def test_changing_the_grammar_invalidates_results():
+    logic = GrammarLogicNLTK()
+    logic.set_grammar("S", "a,b", "S", [("S", "aSb"), ("S", "")])
+    assert logic.validate_string("ab")[0]
+    assert logic.validate_string("ab")[0]
+    assert logic.result_cache.hits == 1 and len(logic.result_cache) == 1
+
+    logic.set_grammar("S", "a,b", "S", [("S", "bSa"), ("S", "")])
+    assert len(logic.result_cache) == 0
+    assert not logic.validate_string("ab")[0]
+
+    logic.add_production("S", "ab")
+    assert len(logic.result_cache) == 0
+    assert logic.validate_string("ab")[0]
+
+    logic.clear()
+    assert len(logic.result_cache) == 0 and logic.result_cache.invalidations == 3
+
+
+def test_entry_and_byte_limits():
+    cache = ValidationResultCache(max_entries=2, max_bytes=1000)
+    for key in "abc":
+        cache.put(key, key.upper(), 10)
+    assert cache.get("a") is None and cache.get("c") == "C" # Se expulsa la menos usada
+    assert len(cache) == 2 and cache.evictions == 1
+
+    cache.get("b") # b pasa a ser la más reciente
+    cache.put("big", "X", 1000 - 2 * (10 + cache.ENTRY_OVERHEAD) - cache.ENTRY_OVERHEAD + 1)
+    assert cache.get("c") is None and cache.get("b") == "B" # Por bytes
+    assert cache.bytes <= cache.max_bytes
+
+    cache.put("huge", "X", 1000) # No cabe ni sola: no se guarda
+    assert cache.get("huge") is None
+
+    disabled = ValidationResultCache(max_entries=0, max_bytes=1000)
+    disabled.put("a", "A", 1)
+    assert disabled.get("a") is None
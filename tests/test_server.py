@@ -0,0 +1,54 @@
+# test_server.py
+# Límites de las operaciones del servidor (sin abrir sockets: métodos del manejador).
+
+import pytest
+
+import server
+from GrammarLogic import GrammarLogicNLTK
+
+
+@pytest.fixture
+def logic():
+    logic = GrammarLogicNLTK()
+    logic.set_grammar("S", "a,b", "S", [("S", "aSb"), ("S", "")])
+    return logic
+
+
+def test_generate_clamps_n(logic, monkeypatch):
+    monkeypatch.setattr(server, "SERVER_MAX_GENERATED_STRINGS", 3)
+    for method in ("sample", "enumerate", "random"):
+        result = server.RequestHandler._generate(None, {"method": method, "n": 10 ** 9}, logic)
+        assert len(result["strings"]) <= 3, method
+    result = server.RequestHandler._generate(None, {"method": "enumerate", "n": 0}, logic)
+    assert len(result["strings"]) == 3
+
+
+def test_generate_rejects_negative_n(logic):
+    with pytest.raises(ValueError):
+        server.RequestHandler._generate(None, {"method": "sample", "n": -1}, logic)
+
+
+def test_validate_limits_inputs(logic, monkeypatch):
+    monkeypatch.setattr(server, "SERVER_MAX_INPUTS", 2)
+    assert server.RequestHandler._validate(None, {"inputs": ["ab", "aab"]}, logic) == {"results": [True, False]}
+    with pytest.raises(ValueError):
+        server.RequestHandler._validate(None, {"inputs": ["ab"] * 3}, logic)
+
+
+@pytest.mark.parametrize("body", [
+    {"method": "sample", "max_length": 10 ** 6},
+    {"method": "enumerate", "max_length": 40},
+    {"method": "enumerate", "min_length": 5, "max_length": 3},
+    {"method": "sample", "min_length": -1},
+    {"method": "random", "depth": 10 ** 4},
+    {"method": "random", "depth": -1},
+])
+def test_generate_rejects_out_of_range_lengths_and_depth(logic, body):
+    with pytest.raises(ValueError):
+        server.RequestHandler._generate(None, dict(body, n=1), logic)
+
+
+def test_generate_accepts_lengths_at_the_limit(logic, monkeypatch):
+    monkeypatch.setattr(server, "SERVER_MAX_ENUMERATION_LENGTH", 4)
+    result = server.RequestHandler._generate(None, {"method": "enumerate", "n": 0, "max_length": 4}, logic)
+    assert result == {"strings": ["", "ab", "aabb"]}
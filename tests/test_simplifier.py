@@ -0,0 +1,33 @@
+# test_simplifier.py
+# Simplificación previa al parser (GrammarSimplifier): mismo lenguaje que el Earley de NLTK y
+# árboles devueltos en términos de la gramática original.
+
+import pytest
+
+from baseline import CONTEXT_FREE, compile_grammar, nltk_accepts, words
+
+
+@pytest.mark.parametrize("name", sorted(CONTEXT_FREE))
+def test_simplified_grammar_matches_nltk(name):
+    logic = compile_grammar(CONTEXT_FREE[name], simplify=True)
+    simplified = logic.simplification
+    for lhs, rhs in simplified.productions:
+        assert rhs or lhs == simplified.start, "ε solo en el inicial"
+        unit = len(rhs) == 1 and not isinstance(rhs[0], str)
+        assert not unit or lhs == simplified.start, "sin unitarias (salvo S' -> S)"
+
+    original = set(logic.cfg.productions())
+    for word in words(logic, 4):
+        belongs, forest = logic.validate_string(word)
+        assert belongs == nltk_accepts(logic, word), repr(word)
+        if belongs:
+            tree = forest.first_tree()
+            assert "".join(tree.leaves()) == word
+            assert tree.label() == str(logic.start_symbol)
+            assert {str(p) for p in tree.productions()} <= {str(p) for p in original}
+
+
+def test_report_names_the_removed_symbols():
+    report = compile_grammar(CONTEXT_FREE["useless_symbols"], simplify=True).simplification.report
+    assert report["nonproductive_removed"] == ["B"]
+    assert report["unreachable_removed"] == ["A"]
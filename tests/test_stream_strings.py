@@ -0,0 +1,36 @@
+# test_stream_strings.py
+# stream_strings: validación de argumentos al llamar y aviso cuando la generación se detiene.
+
+import pytest
+
+from GrammarLogic import GrammarLogicNLTK
+
+
+@pytest.fixture
+def logic():
+    logic = GrammarLogicNLTK()
+    logic.set_grammar("S", "a,b", "S", [("S", "aS"), ("S", "bS"), ("S", "")])
+    return logic
+
+
+def test_unbounded_unique_stream_requires_capacity(logic):
+    with pytest.raises(ValueError):
+        logic.stream_strings(n=None, unique=True) # Antes de iterar
+    strings = logic.stream_strings(n=None, unique=True, capacity=100, seed=1)
+    assert len({next(strings) for _ in range(50)}) == 50
+
+
+def test_exhausted_language_warns(logic):
+    with pytest.warns(RuntimeWarning, match="repetidas"):
+        strings = list(logic.stream_strings(n=100, max_length=2, seed=1, patience=200))
+    assert sorted(strings) == sorted(["", "a", "b", "aa", "ab", "ba", "bb"])
+
+
+def test_cli_sample_requires_capacity(tmp_path, capsys):
+    import cli
+    grammar = tmp_path / "g.cfg"
+    grammar.write_text("# Start Symbol: S\n# Terminals: a\n# NonTerminals: S\n# --- Productions ---\n"
+                       "S -> 'a' S\nS ->\n", encoding="utf-8")
+    output = tmp_path / "out.txt"
+    assert cli.main(["--no-cache", "sample", str(grammar), "-n", "0", "--unique", "-o", str(output)]) == 1
+    assert "capacity" in capsys.readouterr().err and not output.exists()